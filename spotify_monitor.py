@@ -248,9 +248,33 @@ NTFY_SHORT = False
 # Can also be set using the -c flag
 SPOTIFY_CHECK_INTERVAL = 30  # 30 seconds
 
+# Whether to schedule checks around the predicted end of the friend's current track instead of a fixed interval
+# While a song plays, checks are spread out mid-track and packed into a short window around its expected end
+# Falls back to SPOTIFY_CHECK_INTERVAL when no song is playing or the song overran its duration (pauses, ads)
+# Can also be enabled using the --predictive-polling flag
+PREDICTIVE_POLLING = False
+
+# Longest wait between checks while the friend stays inactive, in seconds
+# Past SPOTIFY_INACTIVITY_CHECK the wait doubles after every quiet check up to this ceiling and drops back to
+# SPOTIFY_CHECK_INTERVAL on the first activity, so a friend becoming active is reported at most this late
+# Set to 0 to keep checking inactive friends every SPOTIFY_CHECK_INTERVAL
+# Can also be set using the --idle-backoff flag
+IDLE_BACKOFF_MAX_INTERVAL = 0
+
 # Time to wait before retrying after an error in seconds
 SPOTIFY_ERROR_INTERVAL = 180  # 3 minutes
 
+# Whether to delay the first check by a random part of the interval, so instances started together fall out of step
+# The offset is seeded per target, so each target keeps its phase across restarts
+# Can also be enabled using the --start-jitter flag
+START_JITTER = False
+
+# Fraction of every wait, for regular checks and error retries alike, by which each check moves randomly earlier or later
+# Spreads checks of many instances evenly over the interval; the average interval stays unchanged
+# Set to 0 to disable, at most 0.5
+# Can also be set using the --poll-jitter flag
+POLL_JITTER = 0
+
 # Time after which a user is considered inactive based on last activity in seconds
 # Can also be set using the -o flag
 # Songs longer than this value can cause the user to appear inactive
@@ -444,6 +468,44 @@ ERROR_500_TIME_LIMIT = 240  # 4 minutes
 ERROR_NETWORK_ISSUES_NUMBER_LIMIT = 6
 ERROR_NETWORK_ISSUES_TIME_LIMIT = 240  # 4 minutes
 
+# Optional buddy-list snapshot file shared by monitor processes running on one host with the same account
+# One process started with --buddylist-broker polls Spotify and atomically replaces this file after every fetch
+# Monitors configured with the same path read the snapshot instead of requesting the buddy list themselves
+# Can also be set using the --buddylist-snapshot flag
+# Leave empty to let every monitor poll Spotify directly
+BUDDYLIST_SNAPSHOT_FILE = ""
+
+# Snapshots older than this are ignored and the monitor polls Spotify directly until the broker catches up; in seconds
+BUDDYLIST_SNAPSHOT_MAX_AGE = 90
+
+# Renew the Spotify access, client and web-player tokens in a background thread this many seconds before they expire
+# so the monitoring loop never waits for authentication
+# Set to 0 to disable and refresh tokens only when they have expired
+TOKEN_REFRESH_MARGIN = 300  # 5 minutes
+
+# How long resolved track metadata is reused before it is requested again, in seconds
+# Repeat plays and songs on loop within this window need no metadata requests
+# Set to 0 to disable the track metadata cache
+TRACK_INFO_CACHE_TTL = 21600  # 6 hours
+
+# Maximum number of tracks kept in the metadata cache; the least recently used track is evicted first
+TRACK_INFO_CACHE_SIZE = 512
+
+# Optional SQLite file storing track and playlist metadata across restarts
+# Monitor processes on one host configured with the same path share a single warm cache
+# Leave empty to keep metadata in memory only
+METADATA_STORE_FILE = ""
+
+# How long playlist owners and cover images are reused in memory before they are requested again, in seconds
+# Consecutive songs from the same playlist then need a single playlist lookup
+# Set to 0 to disable the playlist metadata cache
+PLAYLIST_INFO_CACHE_TTL = 21600  # 6 hours
+
+# How long stored track and playlist metadata stays valid, in seconds
+# Track details never change, while playlist owners and cover images occasionally do
+METADATA_STORE_TRACK_TTL = 2592000  # 30 days
+METADATA_STORE_PLAYLIST_TTL = 86400  # 1 day
+
 # ----------------------------
 # Files and Storage
 # ----------------------------
@@ -466,6 +528,21 @@ DOTENV_FILE = ""
 # Can also be set using the -y flag
 FILE_SUFFIX = ""
 
+# File caching the persisted-query hashes discovered in the Spotify web-player bundle across restarts
+# Cached hashes are replaced when Spotify rejects one or ships a new bundle
+# Set to empty to discover them again after every restart
+QUERY_HASH_CACHE_FILE = ".spotify-monitor-query-hashes.json"
+
+# File remembering which metadata backend (legacy Web API or web player) is preferred for tracks and playlists across restarts
+# The other backend is still probed periodically, so a remembered choice is revisited once it stops being the healthier or faster one
+# Set to empty to start every run on the legacy Web API
+BACKEND_STATE_FILE = ".spotify-monitor-backends.json"
+
+# Owner-only file caching the Spotify access, client and web-player tokens with their expiry across restarts
+# Cached tokens are bound to the configured credentials and reused at startup while still valid
+# Set to empty to keep tokens in memory only
+TOKEN_CACHE_FILE = ".spotify-monitor-tokens.json"
+
 # Base name for the log file
 # Can include a directory path such as ~/some_dir/spotify_monitor
 SP_LOGFILE = "spotify_monitor"
@@ -778,7 +855,11 @@ WEBHOOK_SONG_ON_LOOP_NOTIFICATION = False
 WEBHOOK_ERROR_NOTIFICATION = False
 WEBHOOK_SCROBBLE_HEALTH_NOTIFICATION = False
 SPOTIFY_CHECK_INTERVAL = 0
+PREDICTIVE_POLLING = False
+IDLE_BACKOFF_MAX_INTERVAL = 0
 SPOTIFY_ERROR_INTERVAL = 0
+START_JITTER = False
+POLL_JITTER = 0
 SPOTIFY_INACTIVITY_CHECK = 0
 INACTIVE_EMAIL_RECENT_SONGS_COUNT = 0
 PLAYED_FOR_DURATION_TOLERANCE = 0
@@ -817,6 +898,18 @@ ERROR_500_NUMBER_LIMIT = 0
 ERROR_500_TIME_LIMIT = 0
 ERROR_NETWORK_ISSUES_NUMBER_LIMIT = 0
 ERROR_NETWORK_ISSUES_TIME_LIMIT = 0
+BUDDYLIST_SNAPSHOT_FILE = ""
+BUDDYLIST_SNAPSHOT_MAX_AGE = 0
+TOKEN_REFRESH_MARGIN = 0
+TRACK_INFO_CACHE_TTL = 0
+TRACK_INFO_CACHE_SIZE = 0
+METADATA_STORE_FILE = ""
+PLAYLIST_INFO_CACHE_TTL = 0
+METADATA_STORE_TRACK_TTL = 0
+METADATA_STORE_PLAYLIST_TTL = 0
+TOKEN_CACHE_FILE = ""
+QUERY_HASH_CACHE_FILE = ""
+BACKEND_STATE_FILE = ""
 CSV_FILE = ""
 MONITOR_LIST_FILE = ""
 DOTENV_FILE = ""
@@ -870,13 +963,49 @@ SENSITIVE_CONFIG_KEYS = frozenset((*SECRET_KEYS, "WEBHOOK_HEADERS"))
 re_search_str = r'remaster|extended|original mix|remix|original soundtrack|radio( |-)edit|\(feat\.|( \(.*version\))|( - .*version)'
 re_replace_str = r'( - (\d*)( )*remaster$)|( - (\d*)( )*remastered( version)*( \d*)*.*$)|( \((\d*)( )*remaster\)$)|( - (\d+) - remaster$)|( - extended$)|( - extended mix$)|( - (.*); extended mix$)|( - extended version$)|( - (.*) remix$)|( - remix$)|( - remixed by .*$)|( - original mix$)|( - .*original soundtrack$)|( - .*radio( |-)edit$)|( \(feat\. .*\)$)|( \(\d+.*Remaster.*\)$)|( \(.*Version\))|( - .*version)'
 
-# Default value for network-related timeouts in functions; in seconds
+# Default value for network-related timeouts in functions; each function's requests share a budget of this plus 2 seconds
 FUNCTION_TIMEOUT = 15
 
-# Default value for alarm signal handler timeout; in seconds
+# Total time budget shared by all requests and retries of one monitoring check, and the wait before retrying one that ran out; in seconds
 ALARM_TIMEOUT = 15
 ALARM_RETRY = 10
 
+# Half-width of the window around a track's predicted end in which predictive polling checks densely; in seconds
+PREDICTIVE_POLL_WINDOW = 15
+
+# Interval between checks inside that window, capped at SPOTIFY_CHECK_INTERVAL; in seconds
+PREDICTIVE_POLL_DENSE_INTERVAL = 5
+
+# Longest wait predictive polling allows mid-track, never shorter than SPOTIFY_CHECK_INTERVAL; in seconds
+PREDICTIVE_POLL_MAX_INTERVAL = 120
+
+# Factor by which the wait between checks of an inactive friend grows after every quiet check
+IDLE_BACKOFF_FACTOR = 2
+
+# Number of recent check start delays kept per monitored target for tick-lag statistics
+MONITOR_TICK_LAG_WINDOW = 100
+
+# Tick schedulers of the monitored targets, keyed by user URI ID, so debug output can report their lag
+SP_MONITOR_TICK_SCHEDULERS = {}
+
+# Number of checks between connection reuse reports of the shared Spotify transport in debug mode
+TRANSPORT_STATS_DEBUG_CHECKS = 20
+
+# Worker threads used to fetch track and playlist metadata concurrently after a track change
+METADATA_ENRICHMENT_WORKERS = 2
+
+# Shared deadline for the concurrent track and playlist metadata requests; in seconds
+METADATA_ENRICHMENT_TIMEOUT = FUNCTION_TIMEOUT * 3
+
+# Lazily created worker pool for metadata enrichment
+METADATA_ENRICHMENT_EXECUTOR = None
+
+# Maximum number of track IDs the legacy Web API resolves in one /v1/tracks request
+TRACK_INFO_BATCH_SIZE = 50
+
+# Worker threads used for per-item web-player and playlist lookups when many friends are resolved at once
+METADATA_BATCH_WORKERS = 4
+
 # Variables for caching functionality of the Spotify 'cookie' access token and 'client' refresh token to avoid unnecessary refreshing
 SP_CACHED_ACCESS_TOKEN = None
 SP_CACHED_REFRESH_TOKEN = None
@@ -910,6 +1039,19 @@ SP_CACHED_FOLLOW_QUERY_HASHES: dict[str, str] = {}
 # Maps private follow operations to the GraphQL operation types embedded in the web player
 SPOTIFY_FOLLOW_OPERATION_TYPES = {"isFollowingUsers": "query", "followUsers": "mutation"}
 
+# Every web-player operation whose persisted-query hash is extracted from the bundle, mapped to its GraphQL operation type
+SPOTIFY_WEB_QUERY_OPERATION_TYPES = {"fetchPlaylistMetadata": "query", "getTrack": "query", **SPOTIFY_FOLLOW_OPERATION_TYPES}
+
+# Expanded QUERY_HASH_CACHE_FILE path set by main() once discovered hashes should persist across restarts
+SP_WEB_QUERY_HASH_CACHE_PATH = ""
+
+# Bundle URL the hashes restored from SP_WEB_QUERY_HASH_CACHE_PATH came from, kept until the current web player confirms it
+SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL = ""
+
+# The web-player bundle is streamed in chunks of this size, rescanning this many trailing bytes of the previous chunk
+WEB_QUERY_BUNDLE_CHUNK_BYTES = 64 * 1024
+WEB_QUERY_BUNDLE_SCAN_OVERLAP = 512
+
 # Switches each metadata type to the web backend after a restricted legacy response
 SP_WEB_PLAYLIST_BACKEND_PREFERRED = False
 SP_WEB_TRACK_BACKEND_PREFERRED = False
@@ -919,11 +1061,61 @@ SP_WEB_PLAYLIST_API_FAILURES = 0
 SP_WEB_TRACK_API_FAILURES = 0
 
 # Remembers playlist URIs that the legacy Web API hides but the web-player backend can resolve
-SP_WEB_PLAYLIST_URIS = set()
+# Kept in least recently used order and capped at SP_WEB_PLAYLIST_URIS_MAX entries so long sessions stay bounded
+SP_WEB_PLAYLIST_URIS: dict = {}
+SP_WEB_PLAYLIST_URIS_MAX = 256
+
+# LRU cache of resolved track metadata mapping track URI to (monotonic expiry, metadata), with hit and miss counters
+# Dicts keep insertion order, so re-inserting an entry on use keeps the least recently used track first
+SP_TRACK_INFO_CACHE: dict = {}
+SP_TRACK_INFO_CACHE_HITS = 0
+SP_TRACK_INFO_CACHE_MISSES = 0
+
+# LRU cache mapping playlist URI to (monotonic expiry, (owner, image URL)); missing or restricted playlists are stored as ("", "")
+SP_PLAYLIST_INFO_CACHE: dict = {}
+PLAYLIST_INFO_CACHE_SIZE = 256
+
+# How long a playlist that Spotify reports as missing or restricted is remembered before it is looked up again; in seconds
+PLAYLIST_INFO_NEGATIVE_CACHE_TTL = 900  # 15 minutes
+
+# Open connection to METADATA_STORE_FILE, the path it belongs to and whether the store was disabled after an error
+SP_METADATA_STORE_CONNECTION = None
+SP_METADATA_STORE_CONNECTION_PATH = ""
+SP_METADATA_STORE_FAILED = False
 
 # Number of consecutive non-restricted legacy Web API failures tolerated before preferring the web backend
 METADATA_API_FAILURE_LATCH_THRESHOLD = 3
 
+# Calls currently in flight per single-flight key, and per operation how many callers joined a call another caller had started
+SP_SINGLE_FLIGHT_CALLS: dict = {}
+SP_SINGLE_FLIGHT_COALESCED: dict = {}
+
+# Rolling window of (succeeded, latency in seconds) samples per (metadata kind, backend) used to route metadata requests
+SP_METADATA_BACKEND_SAMPLES: dict = {}
+METADATA_BACKEND_SAMPLE_WINDOW = 20
+
+# Samples each backend needs before their health and latency are compared
+METADATA_BACKEND_MIN_SAMPLES = 5
+
+# Backends succeeding less often than this over the window count as unhealthy
+METADATA_BACKEND_MIN_SUCCESS_RATE = 0.8
+
+# Fraction by which a backend's median latency must undercut the other's before it takes over
+METADATA_BACKEND_LATENCY_MARGIN = 0.25
+
+# The backend not currently preferred gets one request this often to see whether it recovered or became faster; in seconds
+METADATA_BACKEND_PROBE_INTERVAL = 600  # 10 mins
+
+# Monotonic time of the next probe per metadata kind
+SP_METADATA_BACKEND_NEXT_PROBE: dict = {}
+
+# A persisted backend choice older than this is ignored at startup; in seconds
+METADATA_BACKEND_STATE_MAX_AGE = 86400  # 1 day
+
+# Expanded BACKEND_STATE_FILE path set by main() and the backend choices last written to it
+SP_METADATA_BACKEND_STATE_PATH = ""
+SP_METADATA_BACKEND_SAVED_STATE: dict = {}
+
 # URL of the Spotify Web Player endpoint to get access token
 TOKEN_URL = "https://open.spotify.com/api/token"
 
@@ -936,12 +1128,39 @@ OAUTH_APP_VALIDATION_TRACK_URI = "spotify:track:7tFiyTwD0nx5a1eklYtX2J"
 # URL of the endpoint to get server time needed to create TOTP object
 SERVER_TIME_URL = "https://open.spotify.com/"
 
+# Learned offset between Spotify's clock and the local clock in seconds, with the monotonic time of its last sample
+SP_SERVER_CLOCK_OFFSET = None
+SP_SERVER_CLOCK_SAMPLED_AT = 0.0
+
+# Age after which the server clock offset is re-measured even without a failed token request; in seconds
+SERVER_CLOCK_OFFSET_MAX_AGE = 6 * 3600
+
+# Memoized TOTP objects keyed by TOTP_VERSION and cipher bytes
+SP_TOTP_CACHE: dict = {}
+
 # Variables for caching functionality of the Spotify client token to avoid unnecessary refreshing
 SP_CACHED_CLIENT_TOKEN = None
 SP_CLIENT_TOKEN_EXPIRES_AT = 0
 
+# Expanded TOKEN_CACHE_FILE path set by main() once tokens should persist across restarts; empty keeps them in memory only
+SP_TOKEN_CACHE_PATH = ""
+
+# Format version of the persisted token cache file
+TOKEN_CACHE_VERSION = 1
+
 LIVENESS_CHECK_COUNTER = LIVENESS_CHECK_INTERVAL / SPOTIFY_CHECK_INTERVAL
 
+# Targets due within this many seconds of each other share one buddy-list poll in multi-target mode
+MULTI_TARGET_TICK_GROUPING = 1.0
+
+# Set while the configured broker snapshot is missing or stale so the fallback is reported once
+BUDDYLIST_SNAPSHOT_STALE = False
+
+# Caches the user-ID index of the most recent buddy-list payload plus each friend's last parse and its change fingerprint
+SP_FRIENDS_INDEX_PAYLOAD = None
+SP_FRIENDS_INDEX: dict[str, dict] = {}
+SP_FRIEND_INFO_CACHE: dict[str, tuple] = {}
+
 stdout_bck = None
 csvfieldnames = ['Date', 'Artist', 'Track', 'Playlist', 'Album', 'Last activity']
 
@@ -1002,9 +1221,11 @@ if sys.version_info < (3, 9):
 import importlib.util
 import time
 import string
+import weakref
 import textwrap
 import json
 import os
+import http.cookiejar
 import configparser
 import sqlite3
 from datetime import datetime, timedelta
@@ -1012,6 +1233,8 @@ from dateutil import relativedelta
 import calendar
 import requests as req
 import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_for_futures
 import smtplib
 import ssl
 from email.header import Header
@@ -1036,6 +1259,7 @@ import tempfile
 import socket
 from io import BytesIO
 from dataclasses import dataclass, field
+from contextlib import contextmanager, nullcontext, redirect_stdout
 from pathlib import Path, PurePosixPath, PureWindowsPath
 import secrets
 import unicodedata
@@ -1049,12 +1273,98 @@ if not VERIFY_SSL:
 SESSION = req.Session()
 WEBHOOK_SESSION = req.Session()
 
+# Every Spotify response carries a Date header, so the shared session keeps the server clock offset current for free
+SESSION.hooks["response"].append(lambda response, *args, **kwargs: record_spotify_server_clock(response))
+
+# Serializes token cache swaps so the monitoring loop never observes a half-updated token from the background refresher
+TOKEN_CACHE_LOCK = threading.Lock()
+
+# Matches one persisted-query declaration such as "getTrack","query","<sha256>" in the raw web-player bundle bytes
+WEB_QUERY_HASH_PATTERN = re.compile(rb'["\']([A-Za-z]+)["\']\s*,\s*["\'](query|mutation)["\']\s*,\s*["\']([0-9a-f]{64})["\']')
+
+# Serializes updates of the in-memory LRU metadata caches, which enrichment workers touch concurrently
+LRU_CACHE_LOCK = threading.Lock()
+
+# Serializes access to the shared SQLite metadata store connection
+METADATA_STORE_LOCK = threading.Lock()
+
+# Serializes updates of the metadata backend samples and probe schedule recorded by concurrent lookups
+METADATA_BACKEND_LOCK = threading.Lock()
+
+# Guards the registry of in-flight single-flight calls
+SINGLE_FLIGHT_LOCK = threading.Lock()
+
+# Per-thread stack of monotonic request deadlines; the innermost entry bounds every Spotify request that thread makes
+SP_REQUEST_DEADLINES = threading.local()
+
+# Per-thread depth of deferred_request_retries() blocks; inside one, HTTP 429 and 5xx answers are raised instead of retried in the adapter
+SP_DEFERRED_RETRIES = threading.local()
+
+# Stops the background token refresher and holds its thread once started
+TOKEN_REFRESHER_STOP = threading.Event()
+TOKEN_REFRESHER_THREAD = None
+
+# Shortest and longest pauses between background token refresher checks; in seconds
+TOKEN_REFRESHER_MIN_WAIT = 15
+TOKEN_REFRESHER_MAX_WAIT = 300
+
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 # Cap server-provided Retry-After to avoid long blocking sleeps on 429 responses
 MAX_RETRY_AFTER_SECONDS = 60
 
+# Token bucket applied to every host the Spotify sessions talk to: sustained requests per second and burst size
+SPOTIFY_RATE_LIMIT_RATE = 2.0
+SPOTIFY_RATE_LIMIT_BURST = 10
+
+# Pause applied to a host that answered HTTP 429 without a Retry-After header; in seconds
+SPOTIFY_RATE_LIMIT_DEFAULT_PAUSE = 5
+
+# Token buckets keyed by host: available tokens, last refill and the monotonic time until which a Retry-After pause holds requests back
+SP_RATE_LIMIT_BUCKETS: dict = {}
+
+# Serializes token bucket updates made by the monitoring loop, the token refresher and metadata workers
+RATE_LIMIT_LOCK = threading.Lock()
+
+# Endpoint families guarded by circuit breakers, matched by URL prefix; requests to other URLs are never blocked
+SPOTIFY_ENDPOINT_FAMILIES = (
+    ("buddylist", "https://guc-spclient.spotify.com/presence-view/"),
+    ("profile", "https://spclient.wg.spotify.com/user-profile-view/"),
+    ("token", "https://open.spotify.com/api/token"),
+    ("token", "https://login5.spotify.com/"),
+    ("token", "https://clienttoken.spotify.com/"),
+    ("token", "https://accounts.spotify.com/api/token"),
+    ("metadata", "https://api.spotify.com/v1/"),
+    ("metadata", "https://api-partner.spotify.com/pathfinder/"),
+)
+
+# Consecutive failed requests (connection errors, timeouts and HTTP 5xx) after which an endpoint family's circuit opens
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+
+# Time an open circuit fails requests fast before one probe may go through, doubling after each failed probe up to the maximum; in seconds
+CIRCUIT_BREAKER_OPEN_SECONDS = 60
+CIRCUIT_BREAKER_MAX_OPEN_SECONDS = 600
+
+# Circuit breaker state keyed by endpoint family: closed, open or half-open, consecutive failures and the current cool-down
+SP_CIRCUIT_BREAKERS: dict = {}
+
+# Serializes circuit breaker transitions made by concurrent requests
+CIRCUIT_BREAKER_LOCK = threading.Lock()
+
+# Connection pools the shared Spotify pool manager has created, read by the connection reuse statistics
+SPOTIFY_CONNECTION_POOLS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+# Serializes pool registration by request threads against the statistics reading the set
+SPOTIFY_CONNECTION_POOLS_LOCK = threading.Lock()
+
+# Consecutive HTTP 429 or 5xx answers to buddy-list and metadata requests the monitor loop retries on its own schedule
+# before it falls back to SPOTIFY_ERROR_INTERVAL
+DEFERRED_RETRY_ATTEMPTS = 5
+
+# Wait before the first deferred retry of an answer without Retry-After, doubling for each further one; in seconds
+DEFERRED_RETRY_BACKOFF = 1
+
 # Limit scrobble health to one immediate HTTP retry before its monitoring loop backs off
 SCROBBLE_HEALTH_HTTP_RETRIES = 1
 
@@ -1205,6 +1515,116 @@ class StartupSummaryRow:
     log: bool = True
 
 
+# Asks the tick scheduler to run the next check after delay seconds counted from now, outside the regular cadence and jitter
+@dataclass(frozen=True)
+class DeferredRetry:
+    delay: float
+    reason: str = ""
+
+
+# Keeps monitoring checks on a fixed cadence using monotonic deadlines and records how late each check starts
+@dataclass
+class MonitorTickScheduler:
+    deadline: Optional[float] = None
+    ticks: int = 0
+    overruns: int = 0
+    lags: list = field(default_factory=list)
+    start_jitter: bool = False
+    jitter: float = 0.0
+    rng: Optional[random.Random] = None
+    planned: Optional[tuple] = None
+    deferrals: int = 0
+
+    # Records the start of one check, measuring its lag behind the scheduled deadline
+    def record_start(self, now: float) -> None:
+        if self.deadline is None:
+            self.deadline = now
+        self.ticks += 1
+        self.lags.append(max(0.0, now - self.deadline))
+        del self.lags[:-MONITOR_TICK_LAG_WINDOW]
+
+    # Returns the random delay before the first check, a part of the interval when the start phase is enabled and 0 otherwise
+    def start_phase(self, interval: float) -> float:
+        if self.rng is None or not self.start_jitter:
+            return 0.0
+        return self.rng.uniform(0, interval)
+
+    # Returns the wait actually used for the next check, moved randomly earlier or later by the per-check jitter
+    # The draw is kept until the next check starts, so peeking and scheduling agree on the same value
+    def planned_interval(self, interval: float) -> float:
+        if self.rng is None or self.jitter <= 0:
+            return interval
+        if self.planned is None or self.planned[0] != (self.ticks, interval):
+            self.planned = ((self.ticks, interval), interval * (1 + self.rng.uniform(-self.jitter, self.jitter)))
+        return self.planned[1]
+
+    # Returns the deadline the next check would get without scheduling it
+    def peek(self, interval: Any, now: float) -> float:
+        if isinstance(interval, DeferredRetry):
+            return now + interval.delay
+        interval = self.planned_interval(interval)
+        if self.deadline is None:
+            return now + interval
+        return max(self.deadline + interval, now)
+
+    # Schedules the next check one interval after the previous deadline, so request and notification time never shift the cadence
+    # A check that ran past its whole interval counts as an overrun and the next one starts at once instead of bunching up to catch up
+    # A deferred retry waits its own delay from now, so a rate-limited request holds back only the check that made it
+    def schedule(self, interval: Any, now: float) -> float:
+        deadline = self.peek(interval, now)
+        if isinstance(interval, DeferredRetry):
+            self.deferrals += 1
+        elif self.deadline is not None and deadline == now:
+            self.overruns += 1
+        self.deadline = deadline
+        return deadline
+
+    # Returns the median, 95th percentile and maximum of the recent check start lags in seconds
+    def lag_stats(self) -> tuple[float, float, float]:
+        if not self.lags:
+            return 0.0, 0.0, 0.0
+        lags = sorted(self.lags)
+        return lags[len(lags) // 2], lags[min(len(lags) - 1, int(len(lags) * 0.95))], lags[-1]
+
+
+# Shares one buddy-list response between every target checked during the same monitoring tick
+# The first response also warms the track metadata of warm_up_targets, so their first checks need no lookup of their own
+@dataclass
+class SharedBuddylistPoll:
+    friends: Optional[dict] = None
+    error: Optional[Exception] = None
+    fetched: bool = False
+    fetch_count: int = 0
+    warm_up_targets: Sequence[str] = ()
+    warmed_up: bool = False
+
+    # Drops the previous response so the first target of a new tick triggers one fresh fetch
+    def start_tick(self) -> None:
+        self.friends = None
+        self.error = None
+        self.fetched = False
+
+    # Returns this tick's buddy list, fetching it only for the first target that asks
+    def get(self, access_token):
+        if not self.fetched:
+            self.fetched = True
+            self.fetch_count += 1
+            try:
+                self.friends = spotify_get_friends_json_via_broker(access_token)
+            except SpotifyUnauthorizedError:
+                # A rejected token is refreshed by the caller, so the retry must reach Spotify again
+                self.fetched = False
+                raise
+            except Exception as e:
+                self.error = e
+            if self.friends is not None and self.warm_up_targets and not self.warmed_up:
+                self.warmed_up = True
+                spotify_warm_up_track_metadata(access_token, self.friends, self.warm_up_targets)
+        if self.error is not None:
+            raise self.error
+        return self.friends
+
+
 # Prints the selected ASCII startup banner with a separately aligned version
 def print_startup_banner() -> None:
     print(STARTUP_BANNER)
@@ -1308,6 +1728,8 @@ def classify_recovery_error(error: Any = None, context: str = "runtime", detail:
     message = raw_message
     status = recovery_http_status(error)
 
+    if isinstance(error, SpotifyCircuitOpenError):
+        return make_recovery_advice(error.failure_code, f"Spotify {error.family} requests are paused after repeated failures", "The monitor probes Spotify again automatically. If failures continue run --doctor --debug", True, safe_detail)
     if isinstance(error, SpotifyQuotaExceededError):
         wait_text = f" Spotify requested a wait of {display_time(error.retry_after)}." if error.retry_after is not None else ""
         fix = f"Wait for the user-owned Spotify app quota to recover and increase --scrobble-check-interval if this repeats.{wait_text} Development Mode quota is shared across apps owned by the same developer account"
@@ -1752,6 +2174,16 @@ def update_dotenv_file(destination, updates):
     return {"path": str(destination_path), "updated_keys": tuple(key for key, _ in update_items)}
 
 
+# Raised when Spotify rejects the current access token with HTTP 401 so callers can refresh it once
+class SpotifyUnauthorizedError(Exception):
+    pass
+
+
+# Raised when Spotify reports a playlist as missing or restricted, which retrying on the next song will not change
+class SpotifyPlaylistUnavailableError(RuntimeError):
+    pass
+
+
 # Raised when a browser cookie cannot be extracted, validated or persisted safely
 class BrowserCookieImportError(Exception):
     pass
@@ -1772,6 +2204,37 @@ class SpotifyScrobbleAuthorizationError(Exception):
     pass
 
 
+# Raised instead of sending a request while its host is paused by a Retry-After for longer than the request budget allows
+class SpotifyRateLimitedError(Exception):
+    pass
+
+
+# Raised instead of sending a request while the circuit of its endpoint family is open after repeated failures
+class SpotifyCircuitOpenError(Exception):
+    # Initializes one fast failure with the endpoint family, the recovery code and description of the failure that opened it
+    def __init__(self, family: str, failure_code: str, last_failure: str, retry_in: float):
+        self.family = family
+        self.failure_code = failure_code
+        self.retry_in = retry_in
+        super().__init__(f"Spotify {family} requests skipped after repeated failures ({last_failure}); next probe in {display_time(max(int(retry_in), 1))}")
+
+
+# Raised instead of sleeping in the HTTP adapter when a request inside deferred_request_retries() is answered with HTTP 429 or 5xx,
+# so the monitor loop can schedule the retry itself; retry_after is the capped Retry-After delay or None
+class SpotifyRetryDeferredError(Exception):
+    # Initializes one deferred answer with its status code, the server's requested delay and, once known, the request URL
+    def __init__(self, status_code: int, retry_after: Optional[float] = None, url: str = ""):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.url = url
+        super().__init__(status_code, retry_after, url)
+
+    # Formats the answer like the HTTPError raise_for_status() would have raised
+    def __str__(self) -> str:
+        reason = "Too Many Requests" if self.status_code == 429 else "Server Error"
+        return f"{self.status_code} {reason} for url: {self.url}" + (f" (Retry-After {display_time(max(int(self.retry_after), 1))})" if self.retry_after is not None else "")
+
+
 # Carries a Spotify application quota delay without exposing OAuth credentials
 class SpotifyQuotaExceededError(Exception):
     # Initializes one quota failure with the server-provided retry delay
@@ -2376,6 +2839,22 @@ def run_set_webhook_url(env_file=None, interactive=None, input_func=None, getpas
     return str(destination)
 
 
+# Registers each pool the shared Spotify pool manager creates, so its request and connection counters can be read later
+class SpotifyConnectionPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with SPOTIFY_CONNECTION_POOLS_LOCK:
+            SPOTIFY_CONNECTION_POOLS.add(self)
+
+
+class SpotifyHTTPConnectionPool(SpotifyConnectionPoolMixin, urllib3.HTTPConnectionPool):
+    pass
+
+
+class SpotifyHTTPSConnectionPool(SpotifyConnectionPoolMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+
 class CappedRetry(Retry):
     def get_retry_after(self, response):
         retry_after = super().get_retry_after(response)
@@ -2383,6 +2862,190 @@ class CappedRetry(Retry):
             return None
         return min(retry_after, MAX_RETRY_AFTER_SECONDS)
 
+    # Pauses every other request to the same host as soon as an attempt is rate limited, before this one waits to retry
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and _pool is not None and response.status in (429, 503):
+            retry_after = self.get_retry_after(response)
+            if response.status == 429 or retry_after is not None:
+                spotify_rate_limit_pause(_pool.host, retry_after)
+        return super().increment(method=method, url=url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace)
+
+    # Gives up instead of waiting past the current thread's request deadline before the next attempt
+    # Inside deferred_request_retries() an HTTP 429 or 5xx answer is handed back to the monitor loop instead of waited for here
+    def sleep(self, response=None):
+        if response is not None and request_retries_deferred():
+            raise SpotifyRetryDeferredError(response.status, self.get_retry_after(response) if self.respect_retry_after_header else None)
+        remaining = request_deadline_remaining()
+        if remaining is not None:
+            retry_after = self.get_retry_after(response) if response is not None and self.respect_retry_after_header else None
+            if (self.get_backoff_time() if retry_after is None else retry_after) >= remaining:
+                raise TimeoutException("Request deadline passed before the next retry")
+        super().sleep(response)
+
+
+# Sends each request through its host's rate limiter and shortens its connect and read timeouts to the time left before the
+# current thread's request deadline; a request the deadline cuts short raises TimeoutException, like the budget running out
+# Requests to an endpoint family whose circuit is open fail fast, and the single half-open probe is sent without retries
+class SpotifyHTTPAdapter(HTTPAdapter):
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        host = urlsplit(request.url).hostname or ""
+        family = spotify_endpoint_family(request.url)
+        probe = spotify_circuit_allow(family)
+        outcome = None
+        try:
+            spotify_rate_limit_acquire(host)
+            remaining = request_deadline_remaining()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise TimeoutException("Request deadline passed before the request started")
+                if isinstance(timeout, tuple):
+                    connect_timeout, read_timeout = timeout
+                    timeout = (remaining if connect_timeout is None else min(connect_timeout, remaining), remaining if read_timeout is None else min(read_timeout, remaining))
+                elif timeout is None or isinstance(timeout, (int, float)):
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+            try:
+                response = HTTPAdapter.send(single_shot_adapter if probe else self, request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            except req.RequestException as e:
+                remaining = request_deadline_remaining()
+                if remaining is not None and remaining <= 0:
+                    # A request cut short by the caller's own budget says nothing about the endpoint's health
+                    raise TimeoutException(f"Request deadline passed during the request: {e}") from e
+                outcome = ("network.timeout" if isinstance(e, req.Timeout) else "network.unavailable", sanitize_error_text(e))
+                raise
+            except SpotifyRetryDeferredError as e:
+                e.url = request.url or ""
+                outcome = ("spotify.unavailable", f"{e.status_code} Server Error") if e.status_code >= 500 else ("", "")
+                raise
+            outcome = ("spotify.unavailable", f"{response.status_code} Server Error") if response.status_code >= 500 else ("", "")
+            if response.status_code == 429 or (response.status_code == 503 and response.headers.get("Retry-After")):
+                spotify_rate_limit_pause(host, spotify_scrobble_retry_after(response))
+            return response
+        finally:
+            spotify_circuit_record(family, probe, outcome)
+
+
+# Returns the circuit breaker family of a Spotify URL, or None for URLs no breaker guards
+def spotify_endpoint_family(url):
+    for family, prefix in SPOTIFY_ENDPOINT_FAMILIES:
+        if url.startswith(prefix):
+            return family
+    return None
+
+
+# Lets a request through the family's circuit breaker, returning True when it is the single probe of a half-open circuit
+# Raises SpotifyCircuitOpenError while the circuit is open or another probe is already in flight
+def spotify_circuit_allow(family):
+    if family is None or CIRCUIT_BREAKER_FAILURE_THRESHOLD <= 0:
+        return False
+    with CIRCUIT_BREAKER_LOCK:
+        breaker = SP_CIRCUIT_BREAKERS.get(family)
+        if breaker is None or breaker["state"] == "closed":
+            return False
+        now = time.monotonic()
+        retry_in = breaker["opened_at"] + breaker["open_seconds"] - now
+        if breaker["state"] == "open" and retry_in <= 0:
+            breaker["state"] = "half-open"
+            breaker["probing"] = True
+            debug_print(f"Circuit for Spotify {family} requests is half-open, sending one probe")
+            return True
+        if breaker["state"] == "half-open" and not breaker["probing"]:
+            breaker["probing"] = True
+            return True
+        raise SpotifyCircuitOpenError(family, breaker["failure_code"], breaker["last_failure"], max(retry_in, 0.0))
+
+
+# Records a request outcome for the family's circuit breaker: (recovery code, description) for a failure, empty strings for a
+# success and None when the request never reached Spotify; failures open the circuit, a successful probe closes it
+def spotify_circuit_record(family, probe, outcome):
+    if family is None or CIRCUIT_BREAKER_FAILURE_THRESHOLD <= 0:
+        return
+    with CIRCUIT_BREAKER_LOCK:
+        breaker = SP_CIRCUIT_BREAKERS.setdefault(family, {"state": "closed", "failures": 0, "opened_at": 0.0, "open_seconds": CIRCUIT_BREAKER_OPEN_SECONDS, "probing": False, "failure_code": "", "last_failure": ""})
+        if probe:
+            breaker["probing"] = False
+        if outcome is None:
+            return
+        failure_code, last_failure = outcome
+        if not failure_code:
+            if breaker["state"] != "closed":
+                debug_print(f"Circuit for Spotify {family} requests closed, the probe succeeded")
+            breaker.update(state="closed", failures=0, open_seconds=CIRCUIT_BREAKER_OPEN_SECONDS)
+            return
+        breaker["failures"] += 1
+        breaker["failure_code"] = failure_code
+        breaker["last_failure"] = last_failure
+        if probe or (breaker["state"] == "closed" and breaker["failures"] >= CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            if probe:
+                breaker["open_seconds"] = min(breaker["open_seconds"] * 2, CIRCUIT_BREAKER_MAX_OPEN_SECONDS)
+            breaker["state"] = "open"
+            breaker["opened_at"] = time.monotonic()
+            debug_print(f"Circuit for Spotify {family} requests opened for {display_time(breaker['open_seconds'])} after {breaker['failures']} failures: {last_failure}")
+
+
+# Formats the state of every endpoint family's circuit breaker for debug output; eg. buddylist open (3 failures), token closed
+def format_spotify_circuit_breakers():
+    with CIRCUIT_BREAKER_LOCK:
+        parts = [f"{family} {breaker['state']}" + (f" ({breaker['failures']} failures)" if breaker["failures"] else "") for family, breaker in sorted(SP_CIRCUIT_BREAKERS.items())]
+    return ", ".join(parts) or "all closed"
+
+
+# Returns the host's token bucket refilled up to now, creating a full one on first use; the caller holds RATE_LIMIT_LOCK
+def _spotify_rate_limit_bucket(host, now):
+    bucket = SP_RATE_LIMIT_BUCKETS.get(host)
+    if bucket is None:
+        bucket = {"tokens": float(SPOTIFY_RATE_LIMIT_BURST), "updated": now, "paused_until": 0.0}
+        SP_RATE_LIMIT_BUCKETS[host] = bucket
+    # Tokens do not build up during a Retry-After pause, so its end does not release a full burst at once
+    refill_from = max(bucket["updated"], min(bucket["paused_until"], now))
+    bucket["tokens"] = min(float(SPOTIFY_RATE_LIMIT_BURST), bucket["tokens"] + (now - refill_from) * SPOTIFY_RATE_LIMIT_RATE)
+    bucket["updated"] = now
+    return bucket
+
+
+# Takes one request token for the host, waiting while its bucket is empty or a Retry-After pause holds the host back
+# Raises SpotifyRateLimitedError when a pause outlasts the current request deadline and TimeoutException when refilling would
+def spotify_rate_limit_acquire(host):
+    if SPOTIFY_RATE_LIMIT_RATE <= 0:
+        return
+    while True:
+        with RATE_LIMIT_LOCK:
+            now = time.monotonic()
+            bucket = _spotify_rate_limit_bucket(host, now)
+            paused_for = bucket["paused_until"] - now
+            if paused_for <= 0 and bucket["tokens"] >= 1:
+                bucket["tokens"] -= 1
+                return
+            wait = paused_for if paused_for > 0 else (1 - bucket["tokens"]) / SPOTIFY_RATE_LIMIT_RATE
+        remaining = request_deadline_remaining()
+        if paused_for > 0 and remaining is not None and wait >= remaining:
+            raise SpotifyRateLimitedError(f"Spotify rate limit on {host}: requests paused for another {display_time(max(int(wait), 1))}")
+        debug_print(f"Waiting {wait:.2f}s for the {host} rate limit ({format_spotify_rate_limits(host)})")
+        sleep_within_request_deadline(wait)
+
+
+# Holds back every request to the host for the Retry-After delay, capped at MAX_RETRY_AFTER_SECONDS, and drains its bucket
+# so that once the pause ends a single request goes first and the rest follow at the sustained rate
+def spotify_rate_limit_pause(host, retry_after=None):
+    delay = min(SPOTIFY_RATE_LIMIT_DEFAULT_PAUSE if retry_after is None else retry_after, MAX_RETRY_AFTER_SECONDS)
+    with RATE_LIMIT_LOCK:
+        now = time.monotonic()
+        bucket = _spotify_rate_limit_bucket(host, now)
+        bucket["paused_until"] = max(bucket["paused_until"], now + delay)
+        bucket["tokens"] = min(bucket["tokens"], 1.0)
+    debug_print(f"Spotify rate limited {host}, pausing its requests for {delay:.1f}s")
+
+
+# Formats the token bucket state of the given host, or of every host, for debug output; eg. api.spotify.com 9.5/10 tokens, paused 12.0s
+def format_spotify_rate_limits(host=None):
+    parts = []
+    with RATE_LIMIT_LOCK:
+        now = time.monotonic()
+        for bucket_host in sorted(SP_RATE_LIMIT_BUCKETS) if host is None else [host]:
+            bucket = _spotify_rate_limit_bucket(bucket_host, now)
+            paused_for = bucket["paused_until"] - now
+            parts.append(f"{bucket_host} {bucket['tokens']:.1f}/{SPOTIFY_RATE_LIMIT_BURST} tokens" + (f", paused {paused_for:.1f}s" if paused_for > 0 else ""))
+    return "; ".join(parts) or "no rate-limited hosts yet"
+
 
 retry = CappedRetry(
     total=5,
@@ -2395,7 +3058,8 @@ retry = CappedRetry(
     respect_retry_after_header=True
 )
 
-adapter = HTTPAdapter(max_retries=retry, pool_connections=100, pool_maxsize=100)
+adapter = SpotifyHTTPAdapter(max_retries=retry, pool_connections=100, pool_maxsize=100)
+adapter.poolmanager.pool_classes_by_scheme = {"http": SpotifyHTTPConnectionPool, "https": SpotifyHTTPSConnectionPool}
 SESSION.mount("https://", adapter)
 SESSION.mount("http://", adapter)
 
@@ -2411,9 +3075,21 @@ web_player_retry = CappedRetry(
     respect_retry_after_header=True
 )
 
-web_player_adapter = HTTPAdapter(max_retries=web_player_retry, pool_connections=100, pool_maxsize=100)
+web_player_adapter = SpotifyHTTPAdapter(max_retries=web_player_retry, pool_connections=100, pool_maxsize=100)
+web_player_adapter.poolmanager = adapter.poolmanager
 SESSION.mount("https://api-partner.spotify.com", web_player_adapter)
 
+# Token checks and refreshes, profile lookups and connectivity checks handle failures themselves, so their adapter never retries
+# Every Spotify adapter shares one pool manager, so all call paths reuse the same keep-alive connections for each host
+single_shot_adapter = SpotifyHTTPAdapter(max_retries=0, pool_connections=100, pool_maxsize=100)
+single_shot_adapter.poolmanager = adapter.poolmanager
+
+# Single-shot requests share one session whose cookie jar accepts nothing, so headers and cookies stay private to each caller
+SINGLE_SHOT_SESSION = req.Session()
+SINGLE_SHOT_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+SINGLE_SHOT_SESSION.mount("https://", single_shot_adapter)
+SINGLE_SHOT_SESSION.mount("http://", single_shot_adapter)
+
 # Scrobble health GET requests retry transient failures once while returning quota responses to its monitoring loop
 scrobble_health_retry = CappedRetry(
     total=SCROBBLE_HEALTH_HTTP_RETRIES,
@@ -2426,12 +3102,38 @@ scrobble_health_retry = CappedRetry(
     respect_retry_after_header=True
 )
 
-scrobble_health_adapter = HTTPAdapter(max_retries=scrobble_health_retry, pool_connections=10, pool_maxsize=10)
+scrobble_health_adapter = SpotifyHTTPAdapter(max_retries=scrobble_health_retry, pool_connections=10, pool_maxsize=10)
 SCROBBLE_HEALTH_SESSION = req.Session()
 SCROBBLE_HEALTH_SESSION.mount("https://", scrobble_health_adapter)
 SCROBBLE_HEALTH_SESSION.mount("http://", scrobble_health_adapter)
 
 
+# Returns the shared session for single-shot Spotify requests, whose connections come from the shared pools
+# The session must not be closed, as that would also drop the keep-alive connections of every other call path
+def spotify_pooled_session() -> req.Session:
+    return SINGLE_SHOT_SESSION
+
+
+# Returns requests sent and connections opened for every host in the shared Spotify connection pools
+def spotify_transport_stats() -> list[tuple[str, int, int]]:
+    with SPOTIFY_CONNECTION_POOLS_LOCK:
+        host_pools = list(SPOTIFY_CONNECTION_POOLS)
+    stats: dict = {}
+    for pool in host_pools:
+        requests_sent, connections = stats.get(pool.host, (0, 0))
+        stats[pool.host] = (requests_sent + pool.num_requests, connections + pool.num_connections)
+    return sorted((host, requests_sent, connections) for host, (requests_sent, connections) in stats.items())
+
+
+# Formats the connection reuse ratio of every Spotify host for debug output; eg. api.spotify.com 40 requests/2 connections (95% reused)
+def format_spotify_transport_stats() -> str:
+    parts = []
+    for host, requests_sent, connections in spotify_transport_stats():
+        reused = (requests_sent - connections) / requests_sent if requests_sent else 0.0
+        parts.append(f"{host} {requests_sent} requests/{connections} connections ({max(reused, 0.0):.0%} reused)")
+    return "; ".join(parts) or "no pooled connections yet"
+
+
 # Truncates each line of a string to a specified number of characters including tab expansion and multi-line support
 def truncate_string_per_line(message, truncate_width, tabsize=8):
     try:
@@ -2488,6 +3190,33 @@ def normalize_log_separators(message):
     return re.sub(r"(?m)^─+$", lambda match: match.group(0).replace("─", "-"), message)
 
 
+# Prefixes the lines one target prints while it is checked, so a log shared by several targets can be attributed
+# Blank and separator lines stay unprefixed to keep the output's layout; other attributes pass through to the wrapped stream
+class TargetPrefixedOutput:
+    def __init__(self, stream, prefix):
+        self.stream = stream
+        self.prefix = prefix
+        self.line_start = True
+
+    # Writes message with the prefix put before every line that carries text
+    def write(self, message):
+        parts = []
+        for line in message.splitlines(keepends=True):
+            if self.line_start and line.strip("─ \t\r\n"):
+                parts.append(self.prefix)
+            parts.append(line)
+            self.line_start = line.endswith("\n")
+        return self.stream.write("".join(parts))
+
+    # Flushes the wrapped stream
+    def flush(self):
+        self.stream.flush()
+
+    # Passes any other attribute, such as the Logger's terminal_only and log_only, through to the wrapped stream
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
 # Logger class to output messages to stdout and log file
 class Logger(object):
     def __init__(self, filename):
@@ -2539,9 +3268,111 @@ class TimeoutException(Exception):
     pass
 
 
-# Signal handler for SIGALRM when the operation times out
-def timeout_handler(sig, frame):
-    raise TimeoutException
+# Bounds every Spotify request made by the current thread inside the block by one total budget in seconds
+# Budgets nest: an inner budget can only shorten the one already running, never extend it
+@contextmanager
+def request_deadline(budget):
+    with request_deadline_scope(time.monotonic() + budget) as deadline:
+        yield deadline
+
+
+# Makes the given monotonic deadline, or an earlier enclosing one, the current thread's request deadline inside the block
+@contextmanager
+def request_deadline_scope(deadline):
+    stack = SP_REQUEST_DEADLINES.__dict__.setdefault("stack", [])
+    if stack:
+        deadline = min(deadline, stack[-1])
+    stack.append(deadline)
+    try:
+        yield deadline
+    finally:
+        stack.pop()
+
+
+# Returns the seconds left before the current thread's request deadline, or None outside any budget
+def request_deadline_remaining():
+    stack = getattr(SP_REQUEST_DEADLINES, "stack", None)
+    if not stack:
+        return None
+    return stack[-1] - time.monotonic()
+
+
+# Sleeps before the next attempt of a retry loop, raising TimeoutException instead when the pause would outlast the request deadline
+def sleep_within_request_deadline(seconds):
+    remaining = request_deadline_remaining()
+    if remaining is not None and seconds >= remaining:
+        raise TimeoutException(f"Request deadline passed before the next attempt in {display_time(seconds)}")
+    time.sleep(seconds)
+
+
+# Hands HTTP 429 and 5xx answers to Spotify requests made by the current thread inside the block back to the caller as
+# SpotifyRetryDeferredError, instead of letting the adapter sleep between retries, so the monitor loop can schedule them itself
+@contextmanager
+def deferred_request_retries():
+    SP_DEFERRED_RETRIES.depth = getattr(SP_DEFERRED_RETRIES, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        SP_DEFERRED_RETRIES.depth -= 1
+
+
+# Returns True inside a deferred_request_retries() block of the current thread
+def request_retries_deferred():
+    return getattr(SP_DEFERRED_RETRIES, "depth", 0) > 0
+
+
+# Wraps function so a worker thread runs it under the calling thread's current request deadline and retry deferral
+def deadline_bound(function):
+    stack = getattr(SP_REQUEST_DEADLINES, "stack", None)
+    deferred = request_retries_deferred()
+    if not stack and not deferred:
+        return function
+    deadline = stack[-1] if stack else None
+
+    # Runs the wrapped function inside the captured deadline and retry deferral
+    def bound(*args, **kwargs):
+        with request_deadline_scope(deadline) if deadline is not None else nullcontext(), deferred_request_retries() if deferred else nullcontext():
+            return function(*args, **kwargs)
+    return bound
+
+
+# Runs function once per key at a time; callers arriving while that call is in flight wait for it and share its result or exception
+# The first element of key names the operation for the coalesced-call counters
+def single_flight(key, function, *args, **kwargs):
+    current_thread_id = threading.get_ident()
+    with SINGLE_FLIGHT_LOCK:
+        call = SP_SINGLE_FLIGHT_CALLS.get(key)
+        reentrant = call is not None and call["owner"] == current_thread_id
+        leader = call is None
+        if leader:
+            call = {"owner": current_thread_id, "done": threading.Event(), "result": None, "error": None}
+            SP_SINGLE_FLIGHT_CALLS[key] = call
+        elif not reentrant:
+            SP_SINGLE_FLIGHT_COALESCED[key[0]] = SP_SINGLE_FLIGHT_COALESCED.get(key[0], 0) + 1
+
+    # A call that re-enters its own key from inside function would otherwise wait on itself forever
+    if reentrant:
+        return function(*args, **kwargs)
+
+    if not leader:
+        debug_print(f"Joining in-flight {key[0]} call (coalesced={SP_SINGLE_FLIGHT_COALESCED[key[0]]})")
+        remaining = request_deadline_remaining()
+        if not call["done"].wait(None if remaining is None else max(remaining, 0)):
+            raise TimeoutException(f"Request deadline passed while waiting for the in-flight {key[0]} call")
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    try:
+        call["result"] = function(*args, **kwargs)
+        return call["result"]
+    except BaseException as error:
+        call["error"] = error
+        raise
+    finally:
+        with SINGLE_FLIGHT_LOCK:
+            SP_SINGLE_FLIGHT_CALLS.pop(key, None)
+        call["done"].set()
 
 
 # Signal handler when user presses Ctrl+C
@@ -2557,7 +3388,7 @@ def signal_handler(sig, frame):
 def check_internet(url=CHECK_INTERNET_URL, timeout=CHECK_INTERNET_TIMEOUT, verify=VERIFY_SSL):
     try:
         debug_print(f"HTTP GET {url} [connectivity check], timeout={timeout}, verify_ssl={verify}")
-        _ = req.get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout, verify=verify)
+        _ = spotify_pooled_session().get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout, verify=verify)
         debug_print(f"HTTP GET {url} -> OK")
         return True
     except req.RequestException as e:
@@ -3312,13 +4143,24 @@ def debug_monitor_check_start(check_number: int, user: str, started_at: Optional
     return check_started_at
 
 
-# Logs one completed poll plus its last and next timing details in debug mode
+# Logs one completed poll plus its last and next timing details in debug mode, with connection reuse every few checks
 def debug_monitor_check_timing(check_number: int, user: str, started_at: datetime, sleep_time: int, completed_at: Optional[datetime] = None) -> None:
     if not DEBUG_MODE:
         return
     check_completed_at = completed_at or datetime.now()
-    next_check = check_completed_at + timedelta(seconds=sleep_time)
-    debug_print(f"Check #{check_number} completed for {user}, last={get_date_from_ts(started_at)}, next={get_date_from_ts(next_check)}, interval={display_time(sleep_time)}")
+    scheduler = SP_MONITOR_TICK_SCHEDULERS.get(user)
+    if scheduler is None:
+        next_check = check_completed_at + timedelta(seconds=sleep_time)
+        debug_print(f"Check #{check_number} completed for {user}, last={get_date_from_ts(started_at)}, next={get_date_from_ts(next_check)}, interval={display_time(sleep_time)}")
+    else:
+        now = time.monotonic()
+        next_check = check_completed_at + timedelta(seconds=scheduler.peek(sleep_time, now) - now)
+        lag_p50, lag_p95, lag_max = scheduler.lag_stats()
+        debug_print(f"Check #{check_number} completed for {user}, last={get_date_from_ts(started_at)}, next={get_date_from_ts(next_check)}, interval={display_time(sleep_time)}, tick lag p50={lag_p50:.2f}s p95={lag_p95:.2f}s max={lag_max:.2f}s, overruns={scheduler.overruns}/{scheduler.ticks}" + (f", deferred retries={scheduler.deferrals}" if scheduler.deferrals else ""))
+    if TRANSPORT_STATS_DEBUG_CHECKS and check_number % TRANSPORT_STATS_DEBUG_CHECKS == 0:
+        debug_print(f"Spotify connection reuse: {format_spotify_transport_stats()}")
+        debug_print(f"Spotify rate limits: {format_spotify_rate_limits()}")
+        debug_print(f"Spotify circuit breakers: {format_spotify_circuit_breakers()}")
 
 
 # Logs the exact time of a scheduled target visibility retry in debug mode
@@ -3570,6 +4412,7 @@ def reload_secrets_signal_handler(sig, frame):
         SP_CACHED_SCROBBLE_ACCESS_TOKEN = None
         SP_SCROBBLE_ACCESS_TOKEN_EXPIRES_AT = 0
         SP_CACHED_SCROBBLE_AUTH_FINGERPRINT = ""
+        save_spotify_token_cache()
         print(f"* Cleared cached Spotify authentication after secret reload{suffix}")
     if webhook_url_changed:
         detected_provider = detect_webhook_provider(WEBHOOK_URL)
@@ -3723,24 +4566,19 @@ def check_token_validity(access_token: str, client_id: Optional[str] = None, use
             "Client-Id": client_id
         })
 
-    if platform.system() != 'Windows':
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(FUNCTION_TIMEOUT + 2)
     try:
         debug_print(
             f"Token validity check mode={check_mode}, url={url}, "
             f"client_id_header={'yes' if 'Client-Id' in headers else 'no'}"
         )
         debug_print(f"HTTP GET {url} [token validity] headers={sanitize_debug_headers(headers)}")
-        response = req.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = spotify_pooled_session().get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
         valid = response.status_code == 200 or bool(oauth_app and response.status_code == 403)
         debug_print(f"HTTP GET {url} -> {response.status_code} [token validity mode={check_mode}] (valid={valid})")
     except Exception:
         valid = False
         debug_print(f"HTTP GET {url} -> failed during token validity check [mode={check_mode}]")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
     return valid
 
 
@@ -3838,26 +4676,59 @@ def fetch_server_time(session: req.Session, ua: str) -> int:
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP HEAD {SERVER_TIME_URL} [server time] timeout={FUNCTION_TIMEOUT}")
-        response = session.head(SERVER_TIME_URL, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = session.head(SERVER_TIME_URL, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
         response.raise_for_status()
         debug_print(f"HTTP HEAD {SERVER_TIME_URL} -> {response.status_code}")
     except TimeoutException as e:
         raise Exception(f"fetch_server_time() head network request timeout after {display_time(FUNCTION_TIMEOUT + 2)}: {e}")
     except Exception as e:
         raise Exception(f"fetch_server_time() head network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     date_hdr = response.headers.get("Date")
     if not date_hdr:
         raise Exception("fetch_server_time() missing 'Date' header")
 
-    return int(parsedate_to_datetime(date_hdr).timestamp())
+    server_time = int(parsedate_to_datetime(date_hdr).timestamp())
+    record_spotify_server_clock(response)
+    return server_time
+
+
+# Learns the offset between Spotify's clock and the local clock from the Date header of any Spotify response
+def record_spotify_server_clock(response):
+    global SP_SERVER_CLOCK_OFFSET, SP_SERVER_CLOCK_SAMPLED_AT
+
+    try:
+        host = urlparse(str(response.url)).hostname or ""
+        date_hdr = response.headers.get("Date")
+    except Exception:
+        return None
+    if not isinstance(date_hdr, str) or not (host == "spotify.com" or host.endswith(".spotify.com")):
+        return None
+    try:
+        server_time = parsedate_to_datetime(date_hdr).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+    # The Date header is truncated to whole seconds, so its midpoint is the unbiased estimate
+    SP_SERVER_CLOCK_OFFSET = server_time + 0.5 - time.time()
+    SP_SERVER_CLOCK_SAMPLED_AT = time.monotonic()
+    return None
+
+
+# Forgets the server clock offset when drift is suspected so the next token refresh measures it again
+def invalidate_spotify_server_clock():
+    global SP_SERVER_CLOCK_OFFSET
+    SP_SERVER_CLOCK_OFFSET = None
+
+
+# Returns Spotify's current time from the learned clock offset, falling back to a HEAD request when it is unknown or stale
+def spotify_server_time(session: req.Session) -> int:
+    offset = SP_SERVER_CLOCK_OFFSET
+    if offset is not None and time.monotonic() - SP_SERVER_CLOCK_SAMPLED_AT < SERVER_CLOCK_OFFSET_MAX_AGE:
+        return int(time.time() + offset)
+    return fetch_server_time(session, USER_AGENT)
 
 
 # Builds a pyotp TOTP object from the configured web-player cipher bytes
@@ -3870,23 +4741,31 @@ def generate_totp():
     if not isinstance(TOTP_VERSION, int) or isinstance(TOTP_VERSION, bool) or TOTP_VERSION <= 0:
         raise ValueError("TOTP_VERSION must be a positive integer; refresh it with debug/spotify_monitor_secret_grabber.py if Spotify rotated the web-player secret")
 
+    cache_key = (TOTP_VERSION, tuple(cipher_bytes))
+    totp_obj = SP_TOTP_CACHE.get(cache_key)
+    if totp_obj is not None:
+        return totp_obj
+
     transformed = [value ^ ((index % 33) + 9) for index, value in enumerate(cipher_bytes)]
     joined = "".join(str(num) for num in transformed)
     hex_str = joined.encode().hex()
     secret = base64.b32encode(bytes.fromhex(hex_str)).decode().rstrip("=")
 
-    return pyotp.TOTP(secret, digits=6, interval=30)
+    totp_obj = pyotp.TOTP(secret, digits=6, interval=30)
+    SP_TOTP_CACHE.clear()
+    SP_TOTP_CACHE[cache_key] = totp_obj
+    return totp_obj
 
 
 # Refreshes the Spotify access token using the sp_dc cookie, tries first with mode "transport" and if needed with "init"
 def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
     transport = True
     init = True
-    session = req.Session()
+    session = spotify_pooled_session()
     data: dict = {}
     token = ""
 
-    server_time = fetch_server_time(session, USER_AGENT)
+    server_time = spotify_server_time(session)
     totp_obj = generate_totp()
     otp_value = totp_obj.at(server_time)
 
@@ -3909,12 +4788,10 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
     last_err = ""
 
     try:
-        if platform.system() != "Windows":
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
-
         debug_print(f"HTTP GET {TOKEN_URL} [sp_dc transport] params={sanitize_debug_params(params)} headers={sanitize_debug_headers(headers)}")
-        response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        record_spotify_server_clock(response)
         response.raise_for_status()
         data = response.json()
         token = data.get("accessToken", "")
@@ -3924,20 +4801,15 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
         transport = False
         last_err = str(e)
         debug_print(f"HTTP GET {TOKEN_URL} [sp_dc transport] failed: {e}")
-    finally:
-        if platform.system() != "Windows":
-            signal.alarm(0)
 
     if not transport or (sp_dc and not check_token_validity(token, data.get("clientId", ""), USER_AGENT)):
         params["reason"] = "init"
 
         try:
-            if platform.system() != "Windows":
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(FUNCTION_TIMEOUT + 2)
-
             debug_print(f"HTTP GET {TOKEN_URL} [sp_dc init] params={sanitize_debug_params(params)} headers={sanitize_debug_headers(headers)}")
-            response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            with request_deadline(FUNCTION_TIMEOUT + 2):
+                response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            record_spotify_server_clock(response)
             response.raise_for_status()
             data = response.json()
             token = data.get("accessToken", "")
@@ -3947,11 +4819,10 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
             init = False
             last_err = str(e)
             debug_print(f"HTTP GET {TOKEN_URL} [sp_dc init] failed: {e}")
-        finally:
-            if platform.system() != "Windows":
-                signal.alarm(0)
 
     if not init or not data or "accessToken" not in data:
+        # A rejected TOTP may come from clock drift, so the next attempt measures the server time again
+        invalidate_spotify_server_clock()
         raise Exception(f"refresh_access_token_from_sp_dc(): Unsuccessful token request{': ' + last_err if last_err else ''}")
 
     expires_at_ms = data.get("accessTokenExpirationTimestampMs")
@@ -3968,13 +4839,21 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
 
 # Fetches Spotify access token based on provided SP_DC value
 def spotify_get_access_token_from_sp_dc(sp_dc: str):
-    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID
-
     now = time.time()
 
-    if SP_CACHED_ACCESS_TOKEN and now < SP_ACCESS_TOKEN_EXPIRES_AT and check_token_validity(SP_CACHED_ACCESS_TOKEN, SP_CACHED_CLIENT_ID, USER_AGENT):
+    # The known expiry is trusted; an HTTP 401 from the real request invalidates the token instead of a validation round trip
+    with TOKEN_CACHE_LOCK:
+        cached_token = SP_CACHED_ACCESS_TOKEN if now < SP_ACCESS_TOKEN_EXPIRES_AT else None
+    if cached_token:
         debug_print("Using cached Spotify access token (sp_dc source)")
-        return SP_CACHED_ACCESS_TOKEN
+        return cached_token
+
+    return single_flight(("sp_dc access token refresh",), _spotify_refresh_access_token_from_sp_dc, sp_dc)
+
+
+# Refreshes the sp_dc access token with retries and caches it; concurrent callers share one run through single_flight()
+def _spotify_refresh_access_token_from_sp_dc(sp_dc: str):
+    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID
 
     max_retries = TOKEN_MAX_RETRIES
     retry = 0
@@ -3989,24 +4868,26 @@ def spotify_get_access_token_from_sp_dc(sp_dc: str):
             client_id = token_data.get("client_id", "")
             length = token_data["length"]
 
-            SP_CACHED_ACCESS_TOKEN = token
-            SP_ACCESS_TOKEN_EXPIRES_AT = token_data["expires_at"]
-            SP_CACHED_CLIENT_ID = client_id
+            with TOKEN_CACHE_LOCK:
+                SP_CACHED_ACCESS_TOKEN = token
+                SP_ACCESS_TOKEN_EXPIRES_AT = token_data["expires_at"]
+                SP_CACHED_CLIENT_ID = client_id
 
             if SP_CACHED_ACCESS_TOKEN is None or not check_token_validity(SP_CACHED_ACCESS_TOKEN, SP_CACHED_CLIENT_ID, USER_AGENT):
                 debug_print("Received token is invalid, retrying")
                 retry += 1
-                time.sleep(TOKEN_RETRY_TIMEOUT)
+                sleep_within_request_deadline(TOKEN_RETRY_TIMEOUT)
             else:
                 debug_print(f"Spotify access token obtained successfully, length={length}")
                 verbose_print("Authentication token refreshed (cookie mode)")
+                save_spotify_token_cache()
                 break
         except Exception as e:
             last_error = str(e)
             debug_print(f"Token refresh attempt failed: {e}")
             retry += 1
             if retry < max_retries:
-                time.sleep(TOKEN_RETRY_TIMEOUT)
+                sleep_within_request_deadline(TOKEN_RETRY_TIMEOUT)
 
     if retry == max_retries:
 
@@ -4444,23 +5325,28 @@ def load_scrobble_health_state(path: Union[str, Path]) -> dict:
     return state
 
 
-# Writes the scrobble health state atomically with owner-only permissions
-def save_scrobble_health_state(path: Union[str, Path], state: dict) -> None:
-    state_path = Path(path).expanduser()
-    state_path.parent.mkdir(parents=True, exist_ok=True)
+# Writes one JSON document atomically with owner-only permissions
+def write_owner_only_json_file(path: Union[str, Path], payload) -> None:
+    target_path = Path(path).expanduser()
+    target_path.parent.mkdir(parents=True, exist_ok=True)
     temp_name = ""
     try:
-        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=state_path.parent, prefix=f".{state_path.name}.", delete=False) as temp_file:
-            json.dump(state, temp_file, sort_keys=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=target_path.parent, prefix=f".{target_path.name}.", delete=False) as temp_file:
+            json.dump(payload, temp_file, sort_keys=True)
             temp_file.write("\n")
             temp_name = temp_file.name
         os.chmod(temp_name, 0o600)
-        os.replace(temp_name, state_path)
+        os.replace(temp_name, target_path)
     finally:
         if temp_name and os.path.exists(temp_name):
             Path(temp_name).unlink()
 
 
+# Writes the scrobble health state atomically with owner-only permissions
+def save_scrobble_health_state(path: Union[str, Path], state: dict) -> None:
+    write_owner_only_json_file(path, state)
+
+
 # Advances persisted outage state and identifies whether an outage or recovery notice is due
 def transition_scrobble_health_state(state: dict, evaluation: ScrobbleHealthEvaluation, now: Optional[float] = None, repeat_interval: Optional[int] = None) -> tuple[dict, str]:
     current_time = time.time() if now is None else now
@@ -4902,16 +5788,24 @@ def build_clienttoken_request_protobuf(app_version, device_id, system_id, cpu_ar
 
 
 # Fetches Spotify access token based on provided device_id, system_id, user_uri_id, refresh_token and client_token value
-def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token):
-    global SP_CACHED_ACCESS_TOKEN, SP_CACHED_REFRESH_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT
-
-    if SP_CACHED_ACCESS_TOKEN and time.time() < SP_ACCESS_TOKEN_EXPIRES_AT and check_token_validity(SP_CACHED_ACCESS_TOKEN, user_agent=USER_AGENT):
+def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token, force_refresh=False):
+    # The known expiry is trusted; an HTTP 401 from the real request invalidates the token instead of a validation round trip
+    with TOKEN_CACHE_LOCK:
+        cached_token = SP_CACHED_ACCESS_TOKEN if time.time() < SP_ACCESS_TOKEN_EXPIRES_AT else None
+    if cached_token and not force_refresh:
         debug_print("Using cached Spotify access token (client source)")
-        return SP_CACHED_ACCESS_TOKEN
+        return cached_token
 
     if not client_token:
         raise Exception("Client token is missing")
 
+    return single_flight(("client access token refresh",), _spotify_request_access_token_from_client, device_id, system_id, user_uri_id, refresh_token, client_token)
+
+
+# Exchanges the refresh token for a new access token through the client login endpoint and caches it; concurrent callers share one request
+def _spotify_request_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token):
+    global SP_CACHED_ACCESS_TOKEN, SP_CACHED_REFRESH_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT
+
     if SP_CACHED_REFRESH_TOKEN:
         debug_print("Using cached refresh token for client auth flow")
         refresh_token = SP_CACHED_REFRESH_TOKEN
@@ -4938,11 +5832,9 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] headers={sanitize_debug_headers(headers)} payload_len={len(protobuf_body)}")
-        response = req.post(LOGIN_URL, headers=headers, data=protobuf_body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = spotify_pooled_session().post(LOGIN_URL, headers=headers, data=protobuf_body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] -> {response.status_code}")
     except TimeoutException as e:
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] timeout: {e}")
@@ -4950,9 +5842,6 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
     except Exception as e:
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] failed: {e}")
         raise Exception(f"spotify_get_access_token_from_client() network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     if response.status_code != 200:
         if response.headers.get("client-token-error") == "INVALID_CLIENTTOKEN":
@@ -5000,20 +5889,29 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
     if not access_token:
         raise Exception("Access token not found in response")
 
-    SP_CACHED_ACCESS_TOKEN = access_token
-    SP_CACHED_REFRESH_TOKEN = parsed[1].get(3)
-    SP_ACCESS_TOKEN_EXPIRES_AT = time.time() + expires_in
+    with TOKEN_CACHE_LOCK:
+        SP_CACHED_ACCESS_TOKEN = access_token
+        SP_CACHED_REFRESH_TOKEN = parsed[1].get(3)
+        SP_ACCESS_TOKEN_EXPIRES_AT = time.time() + expires_in
+    save_spotify_token_cache()
     verbose_print("Authentication token refreshed (advanced client mode)")
     return access_token
 
 
 # Fetches fresh client token
-def spotify_get_client_token(app_version, device_id, system_id, **device_overrides):
-    global SP_CACHED_CLIENT_TOKEN, SP_CLIENT_TOKEN_EXPIRES_AT
-
-    if SP_CACHED_CLIENT_TOKEN and time.time() < SP_CLIENT_TOKEN_EXPIRES_AT:
+def spotify_get_client_token(app_version, device_id, system_id, force_refresh=False, **device_overrides):
+    with TOKEN_CACHE_LOCK:
+        cached_client_token = SP_CACHED_CLIENT_TOKEN if time.time() < SP_CLIENT_TOKEN_EXPIRES_AT else None
+    if cached_client_token and not force_refresh:
         debug_print("Using cached client token")
-        return SP_CACHED_CLIENT_TOKEN
+        return cached_client_token
+
+    return single_flight(("client token refresh",), _spotify_request_client_token, app_version, device_id, system_id, **device_overrides)
+
+
+# Requests a new client token and caches it; concurrent callers share one request through single_flight()
+def _spotify_request_client_token(app_version, device_id, system_id, **device_overrides):
+    global SP_CACHED_CLIENT_TOKEN, SP_CLIENT_TOKEN_EXPIRES_AT
 
     body = build_clienttoken_request_protobuf(app_version, device_id, system_id, **device_overrides)
 
@@ -5034,11 +5932,9 @@ def spotify_get_client_token(app_version, device_id, system_id, **device_overrid
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] app_version={app_version}, device_overrides={device_overrides}, payload_len={len(body)}")
-        response = req.post(CLIENTTOKEN_URL, headers=headers, data=body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = spotify_pooled_session().post(CLIENTTOKEN_URL, headers=headers, data=body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] -> {response.status_code}")
     except TimeoutException as e:
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] timeout: {e}")
@@ -5046,9 +5942,6 @@ def spotify_get_client_token(app_version, device_id, system_id, **device_overrid
     except Exception as e:
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] failed: {e}")
         raise Exception(f"spotify_get_client_token() network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     if response.status_code != 200:
         raise req.HTTPError(f"Spotify client-token request failed with HTTP {response.status_code}", response=response)
@@ -5061,8 +5954,10 @@ def spotify_get_client_token(app_version, device_id, system_id, **device_overrid
     if not client_token:
         raise Exception("clienttoken response did not contain a token")
 
-    SP_CACHED_CLIENT_TOKEN = client_token
-    SP_CLIENT_TOKEN_EXPIRES_AT = time.time() + ttl
+    with TOKEN_CACHE_LOCK:
+        SP_CACHED_CLIENT_TOKEN = client_token
+        SP_CLIENT_TOKEN_EXPIRES_AT = time.time() + ttl
+    save_spotify_token_cache()
     debug_print(f"Client token refreshed successfully, ttl={ttl}s")
     verbose_print("Spotify client token refreshed")
 
@@ -5070,7 +5965,7 @@ def spotify_get_client_token(app_version, device_id, system_id, **device_overrid
 
 
 # Fetches Spotify access token with automatic client token refresh
-def spotify_get_access_token_from_client_auto(device_id, system_id, user_uri_id, refresh_token):
+def spotify_get_access_token_from_client_auto(device_id, system_id, user_uri_id, refresh_token, force_refresh=False):
     client_token = None
 
     if all([
@@ -5087,7 +5982,7 @@ def spotify_get_access_token_from_client_auto(device_id, system_id, user_uri_id,
         client_token = spotify_get_client_token(app_version=APP_VERSION, device_id=device_id, system_id=system_id, cpu_arch=CPU_ARCH, os_build=OS_BUILD, platform=PLATFORM, os_major=OS_MAJOR, os_minor=OS_MINOR, client_model=CLIENT_MODEL)
 
     try:
-        return spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token)
+        return spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token, force_refresh=force_refresh)
     except Exception as e:
         err = str(e).lower()
         debug_print(f"Client auth failed: {e}")
@@ -5107,51 +6002,256 @@ def spotify_get_access_token_from_client_auto(device_id, system_id, user_uri_id,
 
             client_token = spotify_get_client_token(app_version=APP_VERSION, device_id=DEVICE_ID, system_id=SYSTEM_ID, cpu_arch=CPU_ARCH, os_build=OS_BUILD, platform=PLATFORM, os_major=OS_MAJOR, os_minor=OS_MINOR, client_model=CLIENT_MODEL)
 
-            return spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token)
+            return spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token, force_refresh=force_refresh)
         raise
 
 
-# --------------------------------------------------------
+# Identifies the credentials the cached user tokens belong to without storing the secrets themselves
+def spotify_token_cache_fingerprint():
+    if TOKEN_SOURCE == "client":
+        credentials = f"client\0{REFRESH_TOKEN}\0{DEVICE_ID}\0{SYSTEM_ID}\0{USER_URI_ID}"
+    else:
+        credentials = f"cookie\0{SP_DC_COOKIE}"
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()
 
-# Fetches Spotify access token based on provided sp_client_id & sp_client_secret values (Client Credentials OAuth Flow)
-def spotify_get_access_token_from_oauth_app(sp_client_id, sp_client_secret, use_file_cache=True):
-    global SP_CACHED_OAUTH_APP_TOKEN, SPOTIPY_AVAILABLE, SPOTIPY_IMPORT_WARNING_SHOWN
 
-    if not sp_client_id or not sp_client_secret:
-        return None
+# Writes the current token caches to SP_TOKEN_CACHE_PATH atomically with owner-only permissions
+def save_spotify_token_cache():
+    if not SP_TOKEN_CACHE_PATH:
+        return
 
-    if SPOTIPY_AVAILABLE is False:
-        if not SPOTIPY_IMPORT_WARNING_SHOWN:
-            print("* Warning: Spotipy is unavailable. Install legacy OAuth support with `pip install 'spotify_monitor[legacy-oauth]'`")
-            SPOTIPY_IMPORT_WARNING_SHOWN = True
-        return None
+    with TOKEN_CACHE_LOCK:
+        payload = {
+            "version": TOKEN_CACHE_VERSION,
+            "fingerprint": spotify_token_cache_fingerprint(),
+            "access_token": {"token": SP_CACHED_ACCESS_TOKEN, "expires_at": SP_ACCESS_TOKEN_EXPIRES_AT, "client_id": SP_CACHED_CLIENT_ID, "refresh_token": SP_CACHED_REFRESH_TOKEN} if SP_CACHED_ACCESS_TOKEN else None,
+            "client_token": {"token": SP_CACHED_CLIENT_TOKEN, "expires_at": SP_CLIENT_TOKEN_EXPIRES_AT} if SP_CACHED_CLIENT_TOKEN else None,
+            "web_access_token": {"token": SP_CACHED_WEB_ACCESS_TOKEN, "expires_at": SP_WEB_ACCESS_TOKEN_EXPIRES_AT, "client_id": SP_CACHED_WEB_CLIENT_ID} if SP_CACHED_WEB_ACCESS_TOKEN else None,
+        }
 
     try:
-        from spotipy.oauth2 import SpotifyClientCredentials
-        from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
-    except ImportError:
-        SPOTIPY_AVAILABLE = False
-        if not SPOTIPY_IMPORT_WARNING_SHOWN:
-            print("* Warning: Spotipy is unavailable. Install legacy OAuth support with `pip install 'spotify_monitor[legacy-oauth]'`")
-            SPOTIPY_IMPORT_WARNING_SHOWN = True
-        return None
-    SPOTIPY_AVAILABLE = True
+        write_owner_only_json_file(SP_TOKEN_CACHE_PATH, payload)
+    except OSError as e:
+        debug_print(f"Could not write token cache file '{SP_TOKEN_CACHE_PATH}': {e}")
 
-    if SP_CACHED_OAUTH_APP_TOKEN and check_token_validity(SP_CACHED_OAUTH_APP_TOKEN, oauth_app=True):
-        debug_print("Using cached OAuth app access token")
-        return SP_CACHED_OAUTH_APP_TOKEN
 
-    if SP_APP_TOKENS_FILE and use_file_cache:
-        cache_handler = CacheFileHandler(cache_path=SP_APP_TOKENS_FILE)
-    else:
-        cache_handler = MemoryCacheHandler()
+# Returns one cached token entry when it is well formed and still valid at the given time
+def unexpired_token_cache_entry(payload, key, now):
+    entry = payload.get(key)
+    if not isinstance(entry, dict) or not isinstance(entry.get("token"), str) or not entry["token"]:
+        return None
+    expires_at = entry.get("expires_at")
+    if not isinstance(expires_at, (int, float)) or isinstance(expires_at, bool) or expires_at <= now:
+        return None
+    return entry
 
-    session = req.Session()
-    session.headers.update({'User-Agent': USER_AGENT})
 
-    auth_manager = SpotifyClientCredentials(client_id=sp_client_id, client_secret=sp_client_secret, cache_handler=cache_handler, requests_session=session)  # type: ignore[arg-type]
+# Restores still-valid tokens from a token cache file and returns the names of the restored tokens
+def load_spotify_token_cache(path, now=None):
+    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID, SP_CACHED_REFRESH_TOKEN
+    global SP_CACHED_CLIENT_TOKEN, SP_CLIENT_TOKEN_EXPIRES_AT
+    global SP_CACHED_WEB_ACCESS_TOKEN, SP_WEB_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_WEB_CLIENT_ID
 
-    SP_CACHED_OAUTH_APP_TOKEN = auth_manager.get_access_token(as_dict=False)
+    now = time.time() if now is None else now
+    try:
+        payload = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return []
+    if not isinstance(payload, dict) or payload.get("version") != TOKEN_CACHE_VERSION:
+        return []
+
+    restored = []
+    # The anonymous web-player token is not tied to the user's credentials, unlike the other two
+    same_credentials = payload.get("fingerprint") == spotify_token_cache_fingerprint()
+    access_entry = unexpired_token_cache_entry(payload, "access_token", now) if same_credentials else None
+    client_entry = unexpired_token_cache_entry(payload, "client_token", now) if same_credentials else None
+    web_entry = unexpired_token_cache_entry(payload, "web_access_token", now)
+
+    with TOKEN_CACHE_LOCK:
+        if access_entry:
+            SP_CACHED_ACCESS_TOKEN = access_entry["token"]
+            SP_ACCESS_TOKEN_EXPIRES_AT = access_entry["expires_at"]
+            SP_CACHED_CLIENT_ID = str(access_entry.get("client_id") or "")
+            if access_entry.get("refresh_token"):
+                SP_CACHED_REFRESH_TOKEN = access_entry["refresh_token"]
+            restored.append("access token")
+        if client_entry:
+            SP_CACHED_CLIENT_TOKEN = client_entry["token"]
+            SP_CLIENT_TOKEN_EXPIRES_AT = client_entry["expires_at"]
+            restored.append("client token")
+        if web_entry and web_entry.get("client_id"):
+            SP_CACHED_WEB_ACCESS_TOKEN = web_entry["token"]
+            SP_WEB_ACCESS_TOKEN_EXPIRES_AT = web_entry["expires_at"]
+            SP_CACHED_WEB_CLIENT_ID = str(web_entry["client_id"])
+            restored.append("web-player token")
+    return restored
+
+
+# Returns the access token for the configured token source from its expiry-aware cache
+def spotify_get_access_token():
+    if TOKEN_SOURCE == "client":
+        return spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
+    return spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
+
+
+# Drops the cached access token after Spotify rejected it so the next call obtains a fresh one
+def spotify_invalidate_access_token():
+    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT
+    with TOKEN_CACHE_LOCK:
+        SP_CACHED_ACCESS_TOKEN = None
+        SP_ACCESS_TOKEN_EXPIRES_AT = 0
+    save_spotify_token_cache()
+
+
+# Runs one request with the current access token and retries it once with a fresh token after an HTTP 401
+def spotify_request_with_access_token(request):
+    access_token = spotify_get_access_token()
+    try:
+        return access_token, request(access_token)
+    except SpotifyUnauthorizedError as e:
+        debug_print(f"Access token rejected ({e}), refreshing it and retrying once")
+        spotify_invalidate_access_token()
+        access_token = spotify_get_access_token()
+        return access_token, request(access_token)
+
+
+# Renews every cached token that expires within TOKEN_REFRESH_MARGIN and returns seconds until the next one is due
+def spotify_refresh_tokens_ahead_of_expiry(margin=None):
+    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID
+    global SP_CACHED_WEB_ACCESS_TOKEN, SP_WEB_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_WEB_CLIENT_ID
+
+    if margin is None:
+        margin = TOKEN_REFRESH_MARGIN
+
+    with TOKEN_CACHE_LOCK:
+        access_expires_at = SP_ACCESS_TOKEN_EXPIRES_AT if SP_CACHED_ACCESS_TOKEN else 0
+        client_token_expires_at = SP_CLIENT_TOKEN_EXPIRES_AT if SP_CACHED_CLIENT_TOKEN else 0
+        web_expires_at = SP_WEB_ACCESS_TOKEN_EXPIRES_AT if SP_CACHED_WEB_ACCESS_TOKEN else 0
+
+    # Tokens that were never obtained are left to the regular on-demand path
+    if TOKEN_SOURCE == "client":
+        if client_token_expires_at and client_token_expires_at - time.time() <= margin:
+            debug_print("Refreshing client token ahead of expiry")
+            spotify_get_client_token(app_version=APP_VERSION, device_id=DEVICE_ID, system_id=SYSTEM_ID, force_refresh=True, cpu_arch=CPU_ARCH, os_build=OS_BUILD, platform=PLATFORM, os_major=OS_MAJOR, os_minor=OS_MINOR, client_model=CLIENT_MODEL)
+        if access_expires_at and access_expires_at - time.time() <= margin:
+            debug_print("Refreshing Spotify access token ahead of expiry (client source)")
+            spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN, force_refresh=True)
+    elif access_expires_at and access_expires_at - time.time() <= margin:
+        debug_print("Refreshing Spotify access token ahead of expiry (sp_dc source)")
+        token_data = refresh_access_token_from_sp_dc(SP_DC_COOKIE)
+        if not token_data.get("access_token") or not token_data.get("expires_at"):
+            raise RuntimeError("Spotify returned incomplete access token data")
+        # The old token stays in place until the new one is complete, so readers never see a gap
+        with TOKEN_CACHE_LOCK:
+            SP_CACHED_ACCESS_TOKEN = token_data["access_token"]
+            SP_ACCESS_TOKEN_EXPIRES_AT = token_data["expires_at"]
+            SP_CACHED_CLIENT_ID = token_data.get("client_id", "")
+        save_spotify_token_cache()
+        verbose_print("Authentication token refreshed ahead of expiry (cookie mode)")
+
+    if web_expires_at and web_expires_at - time.time() <= margin:
+        debug_print("Refreshing anonymous Spotify web-player access token ahead of expiry")
+        token_data = refresh_access_token_from_sp_dc("")
+        if not token_data.get("access_token") or not token_data.get("expires_at") or not token_data.get("client_id"):
+            raise RuntimeError("Spotify returned incomplete anonymous web-player token data")
+        with TOKEN_CACHE_LOCK:
+            SP_CACHED_WEB_ACCESS_TOKEN = token_data["access_token"]
+            SP_WEB_ACCESS_TOKEN_EXPIRES_AT = token_data["expires_at"]
+            SP_CACHED_WEB_CLIENT_ID = token_data["client_id"]
+        save_spotify_token_cache()
+
+    with TOKEN_CACHE_LOCK:
+        expiries = [expires_at for token, expires_at in ((SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT), (SP_CACHED_CLIENT_TOKEN, SP_CLIENT_TOKEN_EXPIRES_AT), (SP_CACHED_WEB_ACCESS_TOKEN, SP_WEB_ACCESS_TOKEN_EXPIRES_AT)) if token and expires_at]
+
+    if not expiries:
+        return TOKEN_REFRESHER_MAX_WAIT
+    return min(max(min(expiries) - margin - time.time(), TOKEN_REFRESHER_MIN_WAIT), TOKEN_REFRESHER_MAX_WAIT)
+
+
+# Background loop renewing tokens before they expire; waits on TOKEN_REFRESHER_STOP so it can be stopped promptly
+def spotify_token_refresher_loop(margin):
+    error_wait = TOKEN_REFRESHER_MIN_WAIT
+    wait = 0
+    while not TOKEN_REFRESHER_STOP.wait(wait):
+        try:
+            with request_deadline(ALARM_TIMEOUT):
+                wait = spotify_refresh_tokens_ahead_of_expiry(margin)
+            error_wait = TOKEN_REFRESHER_MIN_WAIT
+        except Exception as e:
+            # The on-demand path still refreshes expired tokens, so failures here only delay the next attempt
+            debug_print(f"Background token refresh failed, retrying in {display_time(error_wait)}: {e}")
+            wait = error_wait
+            error_wait = min(error_wait * 2, TOKEN_REFRESHER_MAX_WAIT)
+
+
+# Starts the background token refresher once as a daemon thread
+def start_token_refresher(margin=None):
+    global TOKEN_REFRESHER_THREAD
+
+    if margin is None:
+        margin = TOKEN_REFRESH_MARGIN
+    if margin <= 0 or (TOKEN_REFRESHER_THREAD and TOKEN_REFRESHER_THREAD.is_alive()):
+        return TOKEN_REFRESHER_THREAD
+
+    TOKEN_REFRESHER_STOP.clear()
+    TOKEN_REFRESHER_THREAD = threading.Thread(target=spotify_token_refresher_loop, args=(margin,), name="spotify-token-refresher", daemon=True)
+    TOKEN_REFRESHER_THREAD.start()
+    debug_print(f"Background token refresher started, margin={display_time(margin)}")
+    return TOKEN_REFRESHER_THREAD
+
+
+# --------------------------------------------------------
+
+# Fetches Spotify access token based on provided sp_client_id & sp_client_secret values (Client Credentials OAuth Flow)
+def spotify_get_access_token_from_oauth_app(sp_client_id, sp_client_secret, use_file_cache=True):
+    global SP_CACHED_OAUTH_APP_TOKEN, SPOTIPY_AVAILABLE, SPOTIPY_IMPORT_WARNING_SHOWN
+
+    if not sp_client_id or not sp_client_secret:
+        return None
+
+    if SPOTIPY_AVAILABLE is False:
+        if not SPOTIPY_IMPORT_WARNING_SHOWN:
+            print("* Warning: Spotipy is unavailable. Install legacy OAuth support with `pip install 'spotify_monitor[legacy-oauth]'`")
+            SPOTIPY_IMPORT_WARNING_SHOWN = True
+        return None
+
+    try:
+        from spotipy.oauth2 import SpotifyClientCredentials
+        from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
+    except ImportError:
+        SPOTIPY_AVAILABLE = False
+        if not SPOTIPY_IMPORT_WARNING_SHOWN:
+            print("* Warning: Spotipy is unavailable. Install legacy OAuth support with `pip install 'spotify_monitor[legacy-oauth]'`")
+            SPOTIPY_IMPORT_WARNING_SHOWN = True
+        return None
+    SPOTIPY_AVAILABLE = True
+
+    # Concurrent lookups share one validity check and, when needed, one refresh of the OAuth app token
+    return single_flight(("OAuth app token refresh", sp_client_id), _spotify_refresh_access_token_from_oauth_app, sp_client_id, sp_client_secret, use_file_cache)
+
+
+# Reuses the cached OAuth app token while it validates, otherwise obtains a new one through Spotipy
+def _spotify_refresh_access_token_from_oauth_app(sp_client_id, sp_client_secret, use_file_cache):
+    global SP_CACHED_OAUTH_APP_TOKEN
+
+    from spotipy.oauth2 import SpotifyClientCredentials
+    from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
+
+    if SP_CACHED_OAUTH_APP_TOKEN and check_token_validity(SP_CACHED_OAUTH_APP_TOKEN, oauth_app=True):
+        debug_print("Using cached OAuth app access token")
+        return SP_CACHED_OAUTH_APP_TOKEN
+
+    if SP_APP_TOKENS_FILE and use_file_cache:
+        cache_handler = CacheFileHandler(cache_path=SP_APP_TOKENS_FILE)
+    else:
+        cache_handler = MemoryCacheHandler()
+
+    session = req.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    auth_manager = SpotifyClientCredentials(client_id=sp_client_id, client_secret=sp_client_secret, cache_handler=cache_handler, requests_session=session)  # type: ignore[arg-type]
+
+    SP_CACHED_OAUTH_APP_TOKEN = auth_manager.get_access_token(as_dict=False)
     debug_print("OAuth app access token refreshed successfully")
     verbose_print("Legacy OAuth metadata token refreshed")
 
@@ -5175,7 +6275,7 @@ def spotify_get_friends_json(access_token):
     response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
     debug_print(f"HTTP GET {url} [buddylist] -> {response.status_code}")
     if response.status_code == 401:
-        raise Exception("401 Unauthorized for url: " + url)
+        raise SpotifyUnauthorizedError("401 Unauthorized for url: " + url)
     response.raise_for_status()
     friends_json = response.json()
     error_str = friends_json.get("error")
@@ -5185,6 +6285,74 @@ def spotify_get_friends_json(access_token):
     return friends_json
 
 
+# Publishes one buddy-list snapshot with its fetch timestamp for co-located monitor processes
+def publish_buddylist_snapshot(path, friend_activity, fetched_at=None):
+    write_owner_only_json_file(path, {"fetched_at": time.time() if fetched_at is None else fetched_at, "account": buddylist_snapshot_account(), "friends": friend_activity})
+
+
+# Returns a fingerprint of the Spotify account whose buddy list this process polls: the sp_dc cookie in cookie mode, the user
+# URI ID in client mode; snapshots carry it so a subscriber never reads another account's friends
+def buddylist_snapshot_account():
+    credential = f"cookie\0{SP_DC_COOKIE}" if TOKEN_SOURCE == "cookie" else f"client\0{USER_URI_ID}"
+    return hashlib.sha256(credential.encode("utf-8")).hexdigest()
+
+
+# Returns a published buddy list and its fetch timestamp, or None when the snapshot is missing, malformed, stale or published
+# for an account other than the given one
+def load_buddylist_snapshot(path, max_age, now=None, account=None):
+    try:
+        payload = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("friends"), dict):
+        return None
+    fetched_at = payload.get("fetched_at")
+    if not isinstance(fetched_at, (int, float)) or isinstance(fetched_at, bool):
+        return None
+    if account is not None and payload.get("account") != account:
+        return None
+    age = (time.time() if now is None else now) - fetched_at
+    if max_age and age > max_age:
+        return None
+    return payload["friends"], float(fetched_at)
+
+
+# Returns the buddy list from the configured broker snapshot when it is fresh and published for this account, otherwise None
+def spotify_read_buddylist_snapshot():
+    global BUDDYLIST_SNAPSHOT_STALE
+    if not BUDDYLIST_SNAPSHOT_FILE:
+        return None
+    snapshot = load_buddylist_snapshot(BUDDYLIST_SNAPSHOT_FILE, BUDDYLIST_SNAPSHOT_MAX_AGE, account=buddylist_snapshot_account())
+    if snapshot is None:
+        if not BUDDYLIST_SNAPSHOT_STALE:
+            verbose_print(f"Buddy-list snapshot '{BUDDYLIST_SNAPSHOT_FILE}' is missing, older than {display_time(BUDDYLIST_SNAPSHOT_MAX_AGE)} or published for another account. Polling Spotify directly")
+            BUDDYLIST_SNAPSHOT_STALE = True
+        return None
+    friend_activity, fetched_at = snapshot
+    if BUDDYLIST_SNAPSHOT_STALE:
+        verbose_print("Buddy-list snapshot is fresh again. Using the broker instead of polling Spotify")
+        BUDDYLIST_SNAPSHOT_STALE = False
+    debug_print(f"Buddy-list snapshot read from {BUDDYLIST_SNAPSHOT_FILE} (age {time.time() - fetched_at:.1f}s)")
+    return friend_activity
+
+
+# Returns the buddy list from the local broker snapshot when configured and fresh, otherwise directly from Spotify
+def spotify_get_friends_json_via_broker(access_token):
+    friend_activity = spotify_read_buddylist_snapshot()
+    if friend_activity is None:
+        return spotify_get_friends_json(access_token)
+    return friend_activity
+
+
+# Returns the access token and buddy list for one check; a fresh broker snapshot is returned with an empty token and without
+# acquiring one, so subscribed monitors make no Spotify request for their friends' activity
+def spotify_request_friends(friends_source=None):
+    friend_activity = spotify_read_buddylist_snapshot()
+    if friend_activity is not None:
+        return "", friend_activity
+    return spotify_request_with_access_token(friends_source or spotify_get_friends_json)
+
+
 # Converts Spotify URI (e.g. spotify:user:username) to URL (e.g. https://open.spotify.com/user/username)
 def spotify_convert_uri_to_url(uri):
     # add si parameter so link opens in native Spotify app after clicking
@@ -5219,6 +6387,17 @@ def spotify_list_friends(friend_activity, access_token):
 
     print(f"Number of friends:\t\t{len(friend_activity['friends'])}\n")
 
+    # Metadata for every friend is resolved up front in batches and in parallel instead of one friend at a time
+    # Track metadata fills names the buddy list left empty and warms the caches for monitoring any of these friends next
+    track_uris = [friend["track"].get("uri") for friend in friend_activity["friends"]]
+    playlist_uris = list(dict.fromkeys(friend["track"]["context"].get("uri") for friend in friend_activity["friends"] if 'spotify:playlist:' in friend["track"]["context"].get("uri")))
+    try:
+        tracks_info = spotify_get_tracks_info(access_token, track_uris)
+    except Exception as e:
+        debug_print(f"spotify_list_friends(): track metadata unavailable, listing buddy-list names only: {e}")
+        tracks_info = {}
+    playlist_owners = spotify_resolve_concurrently(lambda playlist_uri: spotify_get_playlist_owner(access_token, playlist_uri), playlist_uris, "spotify_list_friends(): playlist owner")
+
     for index, friend in enumerate(friend_activity["friends"]):
         sp_uri = friend["user"].get("uri").split("spotify:user:", 1)[1]
         sp_username = friend["user"].get("name")
@@ -5231,8 +6410,15 @@ def spotify_list_friends(friend_activity, access_token):
         sp_playlist_uri = friend["track"]["context"].get("uri")
         sp_track_uri = friend["track"].get("uri")
 
+        sp_track_info = tracks_info.get(sp_track_uri, {})
+        sp_artist = sp_artist or sp_track_info.get("sp_artist_name", "")
+        sp_track = sp_track or sp_track_info.get("sp_track_name", "")
+        sp_album = sp_album or sp_track_info.get("sp_album_name", "")
+
         sp_playlist_owner = ""
-        if 'spotify:playlist:' in sp_playlist_uri:
+        if sp_playlist_uri in playlist_owners:
+            sp_playlist_owner = playlist_owners[sp_playlist_uri]
+        elif 'spotify:playlist:' in sp_playlist_uri:
             sp_playlist_owner = spotify_get_playlist_owner(access_token, sp_playlist_uri)
         playlist_suffix = SPOTIFY_SUFFIX if sp_playlist_owner == "Spotify" else ""
 
@@ -5274,26 +6460,53 @@ def spotify_list_friends(friend_activity, access_token):
         print(f"\nLast activity:\t\t\t{get_date_from_ts(float(str(sp_ts)[0:-3]))} ({calculate_timespan(int(time.time()), datetime.fromtimestamp(float(str(sp_ts)[0:-3])))} ago)")
 
 
-# Returns information for specific Spotify friend's user URI id
-def spotify_get_friend_info(friend_activity, uri):
+# Indexes the buddy list by user ID once per fetched payload so every lookup is a dictionary access
+def spotify_index_friends(friend_activity):
+    global SP_FRIENDS_INDEX_PAYLOAD, SP_FRIENDS_INDEX, SP_FRIEND_INFO_CACHE
+    if friend_activity is SP_FRIENDS_INDEX_PAYLOAD:
+        return SP_FRIENDS_INDEX
+    index = {}
     for friend in friend_activity["friends"]:
-        sp_uri = friend["user"]["uri"].split("spotify:user:", 1)[1]
-        if sp_uri == uri:
-            sp_username = friend["user"].get("name")
-            sp_artist = friend["track"]["artist"].get("name")
-            sp_album = friend["track"]["album"].get("name")
-            sp_album_uri = friend["track"]["album"].get("uri")
-            sp_playlist = friend["track"]["context"].get("name")
-            sp_playlist_uri = friend["track"]["context"].get("uri")
-            sp_track = friend["track"].get("name")
-            sp_track_uri = str(friend["track"].get("uri"))
-            if "spotify:track:" in sp_track_uri:
-                sp_track_uri_id = sp_track_uri.split(':', 2)[2]
-            else:
-                sp_track_uri_id = ""
-            sp_ts = int(str(friend.get("timestamp"))[0:-3])
-            return True, {"sp_uri": sp_uri, "sp_username": sp_username, "sp_artist": sp_artist, "sp_track": sp_track, "sp_track_uri": sp_track_uri, "sp_track_uri_id": sp_track_uri_id, "sp_album": sp_album, "sp_album_uri": sp_album_uri, "sp_playlist": sp_playlist, "sp_playlist_uri": sp_playlist_uri, "sp_ts": sp_ts}
-    return False, {}
+        user_uri = friend["user"]["uri"]
+        if "spotify:user:" in user_uri:
+            index[user_uri.split("spotify:user:", 1)[1]] = friend
+    SP_FRIENDS_INDEX_PAYLOAD = friend_activity
+    SP_FRIENDS_INDEX = index
+    SP_FRIEND_INFO_CACHE = {sp_uri: entry for sp_uri, entry in SP_FRIEND_INFO_CACHE.items() if sp_uri in index}
+    return index
+
+
+# Parses one buddy-list friend entry into the flat activity fields used by the monitor
+def spotify_parse_friend_entry(sp_uri, friend):
+    sp_username = friend["user"].get("name")
+    sp_artist = friend["track"]["artist"].get("name")
+    sp_album = friend["track"]["album"].get("name")
+    sp_album_uri = friend["track"]["album"].get("uri")
+    sp_playlist = friend["track"]["context"].get("name")
+    sp_playlist_uri = friend["track"]["context"].get("uri")
+    sp_track = friend["track"].get("name")
+    sp_track_uri = str(friend["track"].get("uri"))
+    if "spotify:track:" in sp_track_uri:
+        sp_track_uri_id = sp_track_uri.split(':', 2)[2]
+    else:
+        sp_track_uri_id = ""
+    sp_ts = int(str(friend.get("timestamp"))[0:-3])
+    return {"sp_uri": sp_uri, "sp_username": sp_username, "sp_artist": sp_artist, "sp_track": sp_track, "sp_track_uri": sp_track_uri, "sp_track_uri_id": sp_track_uri_id, "sp_album": sp_album, "sp_album_uri": sp_album_uri, "sp_playlist": sp_playlist, "sp_playlist_uri": sp_playlist_uri, "sp_ts": sp_ts}
+
+
+# Returns the activity of one friend, reusing the previous parse while its timestamp and track are unchanged
+# The returned dictionary is shared between calls and must be treated as read-only
+def spotify_get_friend_info(friend_activity, uri):
+    friend = spotify_index_friends(friend_activity).get(uri)
+    if friend is None:
+        return False, {}
+    fingerprint = (friend.get("timestamp"), friend.get("track", {}).get("uri"))
+    cached = SP_FRIEND_INFO_CACHE.get(uri)
+    if cached is not None and cached[0] == fingerprint:
+        return True, cached[1]
+    sp_data = spotify_parse_friend_entry(uri, friend)
+    SP_FRIEND_INFO_CACHE[uri] = (fingerprint, sp_data)
+    return True, sp_data
 
 
 # Returns True when complete non-placeholder OAuth app credentials are configured
@@ -5372,7 +6585,7 @@ def build_startup_summary(target: str, config_path, env_path, output_path) -> Li
         StartupSummaryRow("Target", str(target), concise=True),
         StartupSummaryRow("Authentication", authentication, concise=True),
         StartupSummaryRow("Token source", TOKEN_SOURCE, concise=False),
-        StartupSummaryRow("Polling interval", display_time(SPOTIFY_CHECK_INTERVAL), concise=True),
+        StartupSummaryRow("Polling interval", display_time(SPOTIFY_CHECK_INTERVAL) + (" (predictive around song ends)" if PREDICTIVE_POLLING else "") + (f" (±{min(max(POLL_JITTER, 0), 0.5):.0%} jitter)" if POLL_JITTER > 0 else ""), concise=True),
         StartupSummaryRow("Inactivity timer", display_time(SPOTIFY_INACTIVITY_CHECK), concise=False),
         StartupSummaryRow("Disappeared timer", display_time(SPOTIFY_DISAPPEARED_CHECK_INTERVAL), concise=False),
         StartupSummaryRow("Error retry timer", display_time(SPOTIFY_ERROR_INTERVAL), concise=False),
@@ -5434,12 +6647,22 @@ def emit_startup_summary(rows: Sequence[StartupSummaryRow], show_full: bool, str
 
 # Returns a cached or freshly generated anonymous Spotify web-player token
 def spotify_get_web_access_token_data():
-    global SP_CACHED_WEB_ACCESS_TOKEN, SP_WEB_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_WEB_CLIENT_ID
-
     now = time.time()
-    if SP_CACHED_WEB_ACCESS_TOKEN and now < SP_WEB_ACCESS_TOKEN_EXPIRES_AT - 60:
+    with TOKEN_CACHE_LOCK:
+        if SP_CACHED_WEB_ACCESS_TOKEN and now < SP_WEB_ACCESS_TOKEN_EXPIRES_AT - 60:
+            cached_data = {"access_token": SP_CACHED_WEB_ACCESS_TOKEN, "expires_at": SP_WEB_ACCESS_TOKEN_EXPIRES_AT, "client_id": SP_CACHED_WEB_CLIENT_ID}
+        else:
+            cached_data = None
+    if cached_data:
         debug_print("Using cached anonymous Spotify web-player access token")
-        return {"access_token": SP_CACHED_WEB_ACCESS_TOKEN, "expires_at": SP_WEB_ACCESS_TOKEN_EXPIRES_AT, "client_id": SP_CACHED_WEB_CLIENT_ID}
+        return cached_data
+
+    return single_flight(("web-player token refresh",), _spotify_refresh_web_access_token_data)
+
+
+# Requests a new anonymous web-player token and caches it; concurrent callers share one request through single_flight()
+def _spotify_refresh_web_access_token_data():
+    global SP_CACHED_WEB_ACCESS_TOKEN, SP_WEB_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_WEB_CLIENT_ID
 
     token_data = refresh_access_token_from_sp_dc("")
     access_token = token_data.get("access_token", "")
@@ -5448,33 +6671,115 @@ def spotify_get_web_access_token_data():
     if not access_token or not expires_at or not client_id:
         raise RuntimeError("Spotify returned incomplete anonymous web-player token data")
 
-    SP_CACHED_WEB_ACCESS_TOKEN = access_token
-    SP_WEB_ACCESS_TOKEN_EXPIRES_AT = expires_at
-    SP_CACHED_WEB_CLIENT_ID = client_id
+    with TOKEN_CACHE_LOCK:
+        SP_CACHED_WEB_ACCESS_TOKEN = access_token
+        SP_WEB_ACCESS_TOKEN_EXPIRES_AT = expires_at
+        SP_CACHED_WEB_CLIENT_ID = client_id
+    save_spotify_token_cache()
     debug_print(f"Anonymous Spotify web-player token obtained successfully, token_len={len(access_token)}")
     verbose_print("Web-player metadata token refreshed")
     return {"access_token": access_token, "expires_at": expires_at, "client_id": client_id}
 
 
-# Discovers and caches one persisted-query hash from the current web-player bundle
-def spotify_discover_web_query_hash(operation_name, force=False):
+# Stores discovered persisted-query hashes in the per-operation caches, keeping known hashes for operations not in the mapping
+def spotify_apply_web_query_hashes(hashes):
     global SP_CACHED_PLAYLIST_QUERY_HASH, SP_CACHED_TRACK_QUERY_HASH
 
+    for operation_name, query_hash in hashes.items():
+        if operation_name == "fetchPlaylistMetadata":
+            SP_CACHED_PLAYLIST_QUERY_HASH = query_hash
+        elif operation_name == "getTrack":
+            SP_CACHED_TRACK_QUERY_HASH = query_hash
+        elif operation_name in SPOTIFY_FOLLOW_OPERATION_TYPES:
+            SP_CACHED_FOLLOW_QUERY_HASHES[operation_name] = query_hash
+
+
+# Extracts every known persisted-query hash from streamed web-player bundle chunks, stopping once all are found
+def spotify_extract_web_query_hashes(bundle_chunks):
+    hashes = {}
+    tail = b""
+    for chunk in bundle_chunks:
+        if not chunk:
+            continue
+        # The kept tail covers declarations split across chunk boundaries while memory stays bounded by one chunk
+        window = tail + chunk
+        for match in WEB_QUERY_HASH_PATTERN.finditer(window):
+            operation_name, operation_type, query_hash = (group.decode("ascii") for group in match.groups())
+            if SPOTIFY_WEB_QUERY_OPERATION_TYPES.get(operation_name) == operation_type:
+                hashes.setdefault(operation_name, query_hash)
+        if len(hashes) == len(SPOTIFY_WEB_QUERY_OPERATION_TYPES):
+            break
+        tail = window[-WEB_QUERY_BUNDLE_SCAN_OVERLAP:]
+    return hashes
+
+
+# Returns every persisted-query hash currently known, keyed by operation name
+def spotify_known_web_query_hashes():
+    hashes = {"fetchPlaylistMetadata": SP_CACHED_PLAYLIST_QUERY_HASH, "getTrack": SP_CACHED_TRACK_QUERY_HASH, **SP_CACHED_FOLLOW_QUERY_HASHES}
+    return {operation_name: query_hash for operation_name, query_hash in hashes.items() if query_hash}
+
+
+# Restores persisted-query hashes discovered by an earlier run so a cold start needs no bundle download
+# They stay pending until the web-player HTML still references the bundle they were found in
+def load_web_query_hash_cache(path):
+    global SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL
+    try:
+        payload = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or not isinstance(payload.get("bundle_url"), str) or not isinstance(payload.get("hashes"), dict):
+        return {}
+    hashes = {name: value for name, value in payload["hashes"].items() if name in SPOTIFY_WEB_QUERY_OPERATION_TYPES and isinstance(value, str) and re.fullmatch(r"[0-9a-f]{64}", value)}
+    spotify_apply_web_query_hashes(hashes)
+    SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL = payload["bundle_url"] if hashes else ""
+    debug_print(f"Loaded persisted-query hashes discovered in {payload['bundle_url']}")
+    return hashes
+
+
+# Writes the discovered persisted-query hashes with the bundle URL they came from to SP_WEB_QUERY_HASH_CACHE_PATH
+def save_web_query_hash_cache(bundle_url, hashes):
+    if not SP_WEB_QUERY_HASH_CACHE_PATH:
+        return
+    try:
+        write_owner_only_json_file(SP_WEB_QUERY_HASH_CACHE_PATH, {"bundle_url": bundle_url, "hashes": hashes})
+    except OSError as e:
+        debug_print(f"Could not write persisted-query hash cache '{SP_WEB_QUERY_HASH_CACHE_PATH}': {e}")
+
+
+# Discovers and caches one persisted-query hash from the current web-player bundle
+def spotify_discover_web_query_hash(operation_name, force=False):
     if operation_name == "fetchPlaylistMetadata":
         cached_hash = SP_CACHED_PLAYLIST_QUERY_HASH
-        operation_type = "query"
     elif operation_name == "getTrack":
         cached_hash = SP_CACHED_TRACK_QUERY_HASH
-        operation_type = "query"
     elif operation_name in SPOTIFY_FOLLOW_OPERATION_TYPES:
         cached_hash = SP_CACHED_FOLLOW_QUERY_HASHES.get(operation_name, "")
-        operation_type = SPOTIFY_FOLLOW_OPERATION_TYPES[operation_name]
     else:
         raise ValueError(f"Unsupported Spotify web-player operation: {operation_name}")
 
-    if cached_hash and not force:
+    if cached_hash and not force and not SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL:
         return cached_hash
 
+    # One scan yields every operation's hash, so concurrent discoveries for any operation share the same bundle download
+    try:
+        hashes = single_flight(("persisted-query discovery",), _spotify_scan_web_query_hashes, operation_name, force)
+    except Exception as e:
+        if not cached_hash or force:
+            raise
+        # A restored hash that cannot be confirmed right now is still the best guess; Spotify rejecting it forces a rediscovery
+        debug_print(f"Could not confirm the restored {operation_name} persisted-query hash, using it unconfirmed: {e}")
+        return cached_hash
+    query_hash = hashes.get(operation_name, "")
+    if not query_hash:
+        raise RuntimeError(f"Cannot find the {operation_name} persisted-query hash in the Spotify web-player bundle")
+    return query_hash
+
+
+# Downloads the current web-player bundle once and caches every persisted-query hash found in it
+# Restored hashes are confirmed from the small web-player HTML alone when it still references the bundle they came from
+def _spotify_scan_web_query_hashes(operation_name, force=False):
+    global SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL
+
     headers = {"Accept": "text/html,application/xhtml+xml", "User-Agent": WEB_PLAYER_USER_AGENT}
     debug_print(f"HTTP GET {WEB_PLAYER_URL} [query discovery operation={operation_name}] headers={sanitize_debug_headers(headers)}")
     response = SESSION.get(WEB_PLAYER_URL, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
@@ -5490,29 +6795,31 @@ def spotify_discover_web_query_hash(operation_name, force=False):
     if not bundle_url:
         raise RuntimeError("Cannot find the Spotify web-player JavaScript bundle")
 
+    known_hashes = spotify_known_web_query_hashes()
+    pending_bundle_url = SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL
+    SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL = ""
+    if not force and bundle_url == pending_bundle_url and operation_name in known_hashes:
+        debug_print(f"Restored persisted-query hashes still match the current web-player bundle {bundle_url}")
+        return known_hashes
+    if pending_bundle_url and bundle_url != pending_bundle_url:
+        debug_print(f"Spotify web-player bundle changed from {pending_bundle_url} to {bundle_url}, rediscovering persisted-query hashes")
+
     debug_print(f"HTTP GET {bundle_url} [query bundle operation={operation_name}]")
-    bundle_response = SESSION.get(bundle_url, headers={"User-Agent": WEB_PLAYER_USER_AGENT}, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
-    debug_print(f"HTTP GET {bundle_url} [query bundle operation={operation_name}] -> {bundle_response.status_code}")
-    bundle_response.raise_for_status()
-
-    if operation_name in SPOTIFY_FOLLOW_OPERATION_TYPES:
-        for follow_operation, follow_type in SPOTIFY_FOLLOW_OPERATION_TYPES.items():
-            follow_match = re.search(rf'["\']{re.escape(follow_operation)}["\']\s*,\s*["\']{follow_type}["\']\s*,\s*["\']([0-9a-f]{{64}})["\']', bundle_response.text)
-            if follow_match:
-                SP_CACHED_FOLLOW_QUERY_HASHES[follow_operation] = follow_match.group(1)
-        query_hash = SP_CACHED_FOLLOW_QUERY_HASHES.get(operation_name, "")
-    else:
-        hash_match = re.search(rf'["\']{re.escape(operation_name)}["\']\s*,\s*["\']{operation_type}["\']\s*,\s*["\']([0-9a-f]{{64}})["\']', bundle_response.text)
-        query_hash = hash_match.group(1) if hash_match else ""
-    if not query_hash:
+    bundle_response = SESSION.get(bundle_url, headers={"User-Agent": WEB_PLAYER_USER_AGENT}, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL, stream=True)
+    with bundle_response:
+        debug_print(f"HTTP GET {bundle_url} [query bundle operation={operation_name}] -> {bundle_response.status_code}")
+        bundle_response.raise_for_status()
+
+        # One streamed pass collects every operation so later lookups and restarts skip the multi-megabyte download
+        hashes = spotify_extract_web_query_hashes(bundle_response.iter_content(chunk_size=WEB_QUERY_BUNDLE_CHUNK_BYTES))
+    if operation_name not in hashes:
         raise RuntimeError(f"Cannot find the {operation_name} persisted-query hash in the Spotify web-player bundle")
 
-    if operation_name == "fetchPlaylistMetadata":
-        SP_CACHED_PLAYLIST_QUERY_HASH = query_hash
-    elif operation_name == "getTrack":
-        SP_CACHED_TRACK_QUERY_HASH = query_hash
-    debug_print(f"Discovered Spotify {operation_name} persisted-query hash from {bundle_url}")
-    return query_hash
+    # Operations missing from this scan keep their known hashes, which are rediscovered only once Spotify rejects them
+    spotify_apply_web_query_hashes(hashes)
+    save_web_query_hash_cache(bundle_url, {**known_hashes, **hashes})
+    debug_print(f"Discovered Spotify persisted-query hashes for {', '.join(sorted(hashes))} from {bundle_url}")
+    return hashes
 
 
 # Discovers and caches the playlist metadata persisted-query hash
@@ -5732,7 +7039,7 @@ def spotify_get_web_playlist_metadata(playlist_uri):
     data = spotify_web_playlist_query("fetchPlaylistMetadata", {"enableWatchFeedEntrypoint": False, "uri": playlist_uri})
     playlist = data.get("playlistV2")
     if not isinstance(playlist, dict):
-        raise RuntimeError(f"Playlist is unavailable from the Spotify web-player service: {playlist_uri}")
+        raise SpotifyPlaylistUnavailableError(f"Playlist is unavailable from the Spotify web-player service: {playlist_uri}")
     return playlist
 
 
@@ -5766,6 +7073,25 @@ def spotify_get_error_status_code(error):
     return error.response.status_code if isinstance(error, req.HTTPError) and error.response is not None else None
 
 
+# Tells whether Spotify pushed a metadata request back, by rate limiting it or by answering it with a deferred retry
+# Such requests are rescheduled by the monitor loop, so they must reach it as is instead of falling back to the other backend
+def spotify_metadata_request_pushed_back(error):
+    return isinstance(error, (SpotifyRetryDeferredError, SpotifyRateLimitedError)) or spotify_get_error_status_code(error) == 429
+
+
+# Tells whether a failed metadata request reflects the health of its backend and so belongs in the router's statistics
+# Only 5xx answers, timeouts and unusable payloads count; rate limiting, missing items and auth answers say nothing about it
+def metadata_backend_failure_counts(error):
+    if isinstance(error, SpotifyRetryDeferredError):
+        return error.status_code >= 500
+    if isinstance(error, (SpotifyRateLimitedError, SpotifyPlaylistUnavailableError)):
+        return False
+    status_code = spotify_get_error_status_code(error)
+    if status_code is not None:
+        return status_code >= 500
+    return isinstance(error, (req.Timeout, TimeoutException, ValueError, KeyError, TypeError))
+
+
 # Decides whether to latch the web-player backend after a legacy Web API failure
 def spotify_should_latch_web_backend(error, consecutive_failures):
     # A 403 signals an app-level restriction so latch immediately while caller-specific 404 handling can run first
@@ -5774,6 +7100,131 @@ def spotify_should_latch_web_backend(error, consecutive_failures):
     return consecutive_failures >= METADATA_API_FAILURE_LATCH_THRESHOLD
 
 
+# Summarizes the rolling window of one metadata backend as (samples, success rate, p50 latency, p95 latency)
+def metadata_backend_stats(kind, backend):
+    with METADATA_BACKEND_LOCK:
+        samples = list(SP_METADATA_BACKEND_SAMPLES.get((kind, backend), ()))
+    latencies = sorted(latency for succeeded, latency in samples if succeeded)
+    if not latencies:
+        return len(samples), 0.0 if samples else 1.0, None, None
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return len(samples), len(latencies) / len(samples), p50, p95
+
+
+# Formats the rolling statistics of one metadata backend for debug output
+def format_metadata_backend_stats(kind, backend):
+    count, success_rate, p50, p95 = metadata_backend_stats(kind, backend)
+    if p50 is None or p95 is None:
+        return f"{backend}: {count} samples, {success_rate:.0%} ok"
+    return f"{backend}: {count} samples, {success_rate:.0%} ok, p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+
+
+# Tells whether the web-player backend currently beats the legacy Web API, judged on health first and median latency second
+# Returns None while there are too few samples or neither backend is clearly better
+def metadata_web_backend_is_better(kind):
+    api_count, api_success_rate, api_p50, _ = metadata_backend_stats(kind, "api")
+    web_count, web_success_rate, web_p50, _ = metadata_backend_stats(kind, "web")
+    if api_count < METADATA_BACKEND_MIN_SAMPLES or web_count < METADATA_BACKEND_MIN_SAMPLES:
+        return None
+
+    api_healthy = api_success_rate >= METADATA_BACKEND_MIN_SUCCESS_RATE
+    web_healthy = web_success_rate >= METADATA_BACKEND_MIN_SUCCESS_RATE
+    if api_healthy != web_healthy:
+        return web_healthy
+    if api_p50 is None or web_p50 is None:
+        return None
+    if web_p50 < api_p50 * (1 - METADATA_BACKEND_LATENCY_MARGIN):
+        return True
+    if api_p50 < web_p50 * (1 - METADATA_BACKEND_LATENCY_MARGIN):
+        return False
+    return None
+
+
+# Returns the backend to use for the next metadata request of a kind, handing the other backend one probe request every METADATA_BACKEND_PROBE_INTERVAL
+def spotify_metadata_backend_route(kind):
+    web_preferred = SP_WEB_TRACK_BACKEND_PREFERRED if kind == "track" else SP_WEB_PLAYLIST_BACKEND_PREFERRED
+    now = time.monotonic()
+    with METADATA_BACKEND_LOCK:
+        next_probe = SP_METADATA_BACKEND_NEXT_PROBE.setdefault(kind, now + METADATA_BACKEND_PROBE_INTERVAL)
+        probe = now >= next_probe
+        if probe:
+            SP_METADATA_BACKEND_NEXT_PROBE[kind] = now + METADATA_BACKEND_PROBE_INTERVAL
+
+    preferred, other = ("web", "api") if web_preferred else ("api", "web")
+    if probe:
+        debug_print(f"Probing the {other} {kind} metadata backend ({format_metadata_backend_stats(kind, 'api')}; {format_metadata_backend_stats(kind, 'web')})")
+        return other
+    return preferred
+
+
+# Records the outcome and latency of one metadata backend request and re-evaluates which backend the kind should prefer
+def record_metadata_backend_sample(kind, backend, succeeded, latency):
+    global SP_WEB_TRACK_BACKEND_PREFERRED, SP_WEB_PLAYLIST_BACKEND_PREFERRED, SP_WEB_TRACK_API_FAILURES, SP_WEB_PLAYLIST_API_FAILURES
+
+    with METADATA_BACKEND_LOCK:
+        samples = SP_METADATA_BACKEND_SAMPLES.setdefault((kind, backend), [])
+        samples.append((succeeded, latency))
+        del samples[:-METADATA_BACKEND_SAMPLE_WINDOW]
+
+    web_preferred = SP_WEB_TRACK_BACKEND_PREFERRED if kind == "track" else SP_WEB_PLAYLIST_BACKEND_PREFERRED
+    web_better = metadata_web_backend_is_better(kind)
+    # Only a successful legacy request moves a kind back off the web player, which also lifts a failure latch unless the statistics clearly favour the web player
+    if web_preferred and backend == "api" and succeeded:
+        web_better = False if web_better is None else web_better
+    elif web_preferred and web_better is False:
+        web_better = None
+
+    if web_better is not None and web_better != web_preferred:
+        if kind == "track":
+            SP_WEB_TRACK_BACKEND_PREFERRED = web_better
+            SP_WEB_TRACK_API_FAILURES = 0
+        else:
+            SP_WEB_PLAYLIST_BACKEND_PREFERRED = web_better
+            SP_WEB_PLAYLIST_API_FAILURES = 0
+        target = "web-player backend" if web_better else "legacy Web API"
+        debug_print(f"{kind.capitalize()} metadata routed to the {target} ({format_metadata_backend_stats(kind, 'api')}; {format_metadata_backend_stats(kind, 'web')})")
+        verbose_print(f"{kind.capitalize()} metadata switched to the {target} based on recent success rate and latency")
+
+    save_metadata_backend_state()
+
+
+# Writes the current backend choice per metadata kind to SP_METADATA_BACKEND_STATE_PATH when it changed since the last write
+def save_metadata_backend_state():
+    global SP_METADATA_BACKEND_SAVED_STATE
+
+    if not SP_METADATA_BACKEND_STATE_PATH:
+        return
+    state = {"track": "web" if SP_WEB_TRACK_BACKEND_PREFERRED else "api", "playlist": "web" if SP_WEB_PLAYLIST_BACKEND_PREFERRED else "api"}
+    if state == SP_METADATA_BACKEND_SAVED_STATE:
+        return
+    SP_METADATA_BACKEND_SAVED_STATE = state
+    try:
+        write_owner_only_json_file(SP_METADATA_BACKEND_STATE_PATH, {"saved_at": int(time.time()), "preferred": state})
+    except OSError as e:
+        debug_print(f"Could not write metadata backend state '{SP_METADATA_BACKEND_STATE_PATH}': {e}")
+
+
+# Restores the backend choice per metadata kind saved by an earlier run, returning the kinds routed to the web-player backend
+def load_metadata_backend_state(path, now=None):
+    global SP_WEB_TRACK_BACKEND_PREFERRED, SP_WEB_PLAYLIST_BACKEND_PREFERRED, SP_METADATA_BACKEND_SAVED_STATE
+
+    try:
+        payload = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return []
+    if not isinstance(payload, dict) or not isinstance(payload.get("saved_at"), int) or not isinstance(payload.get("preferred"), dict):
+        return []
+    if (now if now is not None else time.time()) - payload["saved_at"] > METADATA_BACKEND_STATE_MAX_AGE:
+        return []
+
+    state = {kind: "web" if payload["preferred"].get(kind) == "web" else "api" for kind in ("track", "playlist")}
+    SP_WEB_TRACK_BACKEND_PREFERRED = state["track"] == "web"
+    SP_WEB_PLAYLIST_BACKEND_PREFERRED = state["playlist"] == "web"
+    SP_METADATA_BACKEND_SAVED_STATE = state
+    return [kind for kind, backend in state.items() if backend == "web"]
+
+
 # Returns playlist owner metadata through the legacy Spotify Web API path
 def _spotify_get_playlist_owner_and_image_api(access_token, playlist_uri, oauth_app=False):
     if TOKEN_SOURCE in {"cookie", "client"} and not oauth_app:
@@ -5800,20 +7251,171 @@ def _spotify_get_playlist_owner_and_image_api(access_token, playlist_uri, oauth_
     return owner_data.get("display_name", ""), playlist_image_url
 
 
-# Selects the legacy or web-player playlist owner backend and falls back automatically
+# Returns an unexpired value from an insertion-ordered LRU cache and marks it as most recently used
+def lru_cache_get(cache, key):
+    with LRU_CACHE_LOCK:
+        entry = cache.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        cache[key] = entry
+        return entry[1]
+
+
+# Stores a value in an insertion-ordered LRU cache for ttl seconds, evicting the least recently used entries beyond max_size
+def lru_cache_put(cache, key, value, ttl, max_size):
+    with LRU_CACHE_LOCK:
+        cache.pop(key, None)
+        cache[key] = (time.monotonic() + ttl, value)
+        while len(cache) > max_size:
+            cache.pop(next(iter(cache)))
+
+
+# Records a playlist the legacy Web API hides, keeping only the most recently used SP_WEB_PLAYLIST_URIS_MAX hints
+def remember_web_playlist_uri(playlist_uri):
+    with LRU_CACHE_LOCK:
+        SP_WEB_PLAYLIST_URIS.pop(playlist_uri, None)
+        SP_WEB_PLAYLIST_URIS[playlist_uri] = True
+        while len(SP_WEB_PLAYLIST_URIS) > SP_WEB_PLAYLIST_URIS_MAX:
+            SP_WEB_PLAYLIST_URIS.pop(next(iter(SP_WEB_PLAYLIST_URIS)))
+
+
+# Tells whether the legacy Web API is known to hide a playlist, marking a known hint as the most recently used one
+def web_playlist_uri_known(playlist_uri):
+    with LRU_CACHE_LOCK:
+        if SP_WEB_PLAYLIST_URIS.pop(playlist_uri, None) is None:
+            return False
+        SP_WEB_PLAYLIST_URIS[playlist_uri] = True
+        return True
+
+
+# Tells whether a playlist lookup failed because Spotify reports the playlist as missing rather than a transient error
+# A 403 can also mean an auth or rate-limit problem, so only a 404 or a web-player answer without the playlist counts
+def spotify_playlist_is_unavailable(error):
+    return isinstance(error, SpotifyPlaylistUnavailableError) or spotify_get_error_status_code(error) == 404
+
+
+# Opens the SQLite metadata store in WAL mode so several monitor processes can read while one writes
+def metadata_store_connection():
+    global SP_METADATA_STORE_CONNECTION, SP_METADATA_STORE_CONNECTION_PATH
+
+    path = METADATA_STORE_FILE
+    if SP_METADATA_STORE_CONNECTION is not None and SP_METADATA_STORE_CONNECTION_PATH == path:
+        return SP_METADATA_STORE_CONNECTION
+    if SP_METADATA_STORE_CONNECTION is not None:
+        SP_METADATA_STORE_CONNECTION.close()
+        SP_METADATA_STORE_CONNECTION = None
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS metadata (kind TEXT NOT NULL, uri TEXT NOT NULL, payload TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (kind, uri))")
+        connection.execute("DELETE FROM metadata WHERE expires_at <= ?", (time.time(),))
+    except sqlite3.Error:
+        connection.close()
+        raise
+
+    debug_print(f"Opened metadata store '{path}'")
+    SP_METADATA_STORE_CONNECTION = connection
+    SP_METADATA_STORE_CONNECTION_PATH = path
+    return connection
+
+
+# Runs one metadata store operation, disabling the store for this process after the first database error
+def metadata_store_execute(operation):
+    global SP_METADATA_STORE_FAILED
+
+    if not METADATA_STORE_FILE or SP_METADATA_STORE_FAILED:
+        return None
+    with METADATA_STORE_LOCK:
+        try:
+            return operation(metadata_store_connection())
+        except (sqlite3.Error, OSError) as e:
+            # The store only saves requests, so monitoring continues with the in-memory caches
+            SP_METADATA_STORE_FAILED = True
+            print(f"* Warning: Metadata store '{METADATA_STORE_FILE}' is unavailable, continuing without it: {e}")
+            return None
+
+
+# Returns unexpired stored metadata of one kind for a Spotify URI, or None
+def metadata_store_get(kind, uri):
+    row = metadata_store_execute(lambda connection: connection.execute("SELECT payload FROM metadata WHERE kind = ? AND uri = ? AND expires_at > ?", (kind, uri, time.time())).fetchone())
+    if not row:
+        return None
+    try:
+        payload = json.loads(row[0])
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    debug_print(f"Metadata store hit for {kind} uri={uri}")
+    return payload
+
+
+# Stores metadata of one kind for a Spotify URI for ttl seconds
+def metadata_store_put(kind, uri, payload, ttl):
+    if ttl <= 0:
+        return
+    encoded = json.dumps(payload, sort_keys=True)
+    metadata_store_execute(lambda connection: connection.execute("INSERT OR REPLACE INTO metadata (kind, uri, payload, expires_at) VALUES (?, ?, ?, ?)", (kind, uri, encoded, time.time() + ttl)))
+
+
+# Returns the playlist owner and cover image from the in-memory cache, loading it once per PLAYLIST_INFO_CACHE_TTL
 def spotify_get_playlist_owner_and_image(access_token, playlist_uri, oauth_app=False):
+    if PLAYLIST_INFO_CACHE_TTL <= 0:
+        return single_flight(("playlist metadata", playlist_uri), spotify_load_playlist_owner_and_image, access_token, playlist_uri, oauth_app)
+
+    cached = lru_cache_get(SP_PLAYLIST_INFO_CACHE, playlist_uri)
+    if cached is not None:
+        debug_print(f"Playlist metadata cache hit for uri={playlist_uri}")
+        return cached
+
+    try:
+        result = single_flight(("playlist metadata", playlist_uri), spotify_load_playlist_owner_and_image, access_token, playlist_uri, oauth_app)
+    except Exception as error:
+        if not spotify_playlist_is_unavailable(error):
+            raise
+        # A missing or restricted playlist will not resolve on the next song, so it is reported without owner and image for a while
+        debug_print(f"Playlist uri={playlist_uri} is unavailable, not looking it up again for {display_time(PLAYLIST_INFO_NEGATIVE_CACHE_TTL)}: {error}")
+        lru_cache_put(SP_PLAYLIST_INFO_CACHE, playlist_uri, ("", ""), PLAYLIST_INFO_NEGATIVE_CACHE_TTL, PLAYLIST_INFO_CACHE_SIZE)
+        return "", ""
+
+    lru_cache_put(SP_PLAYLIST_INFO_CACHE, playlist_uri, result, PLAYLIST_INFO_CACHE_TTL, PLAYLIST_INFO_CACHE_SIZE)
+    return result
+
+
+# Returns the playlist owner and cover image, consulting the shared metadata store before any backend
+def spotify_load_playlist_owner_and_image(access_token, playlist_uri, oauth_app=False):
+    stored = metadata_store_get("playlist", playlist_uri)
+    if stored is not None and "owner" in stored:
+        return stored["owner"], stored.get("image_url", "")
+
+    owner, playlist_image_url = spotify_fetch_playlist_owner_and_image(access_token, playlist_uri, oauth_app)
+    metadata_store_put("playlist", playlist_uri, {"owner": owner, "image_url": playlist_image_url}, METADATA_STORE_PLAYLIST_TTL)
+    return owner, playlist_image_url
+
+
+# Selects the legacy or web-player playlist owner backend and falls back automatically
+def spotify_fetch_playlist_owner_and_image(access_token, playlist_uri, oauth_app=False):
     global SP_WEB_PLAYLIST_BACKEND_PREFERRED, SP_WEB_PLAYLIST_API_FAILURES
 
     api_error = None
     api_status = None
     api_available = bool(oauth_app and access_token) or spotify_has_oauth_app_credentials()
-    if api_available and not SP_WEB_PLAYLIST_BACKEND_PREFERRED and playlist_uri not in SP_WEB_PLAYLIST_URIS:
+    if api_available and not web_playlist_uri_known(playlist_uri) and spotify_metadata_backend_route("playlist") == "api":
+        started = time.monotonic()
         try:
             owner, playlist_image_url = _spotify_get_playlist_owner_and_image_api(access_token, playlist_uri, oauth_app)
             SP_WEB_PLAYLIST_API_FAILURES = 0
+            record_metadata_backend_sample("playlist", "api", True, time.monotonic() - started)
             debug_print(f"Playlist Image URL: {playlist_image_url}")
             return owner, playlist_image_url
         except Exception as error:
+            if metadata_backend_failure_counts(error):
+                record_metadata_backend_sample("playlist", "api", False, time.monotonic() - started)
+            if spotify_metadata_request_pushed_back(error):
+                raise
             api_error = error
             api_status = spotify_get_error_status_code(error)
             if api_status != 404:
@@ -5825,12 +7427,14 @@ def spotify_get_playlist_owner_and_image(access_token, playlist_uri, oauth_app=F
                 else:
                     debug_print(f"spotify_get_playlist_owner_and_image(): legacy Web API backend failed for uri={playlist_uri} (failures={SP_WEB_PLAYLIST_API_FAILURES}): {error}")
 
+    started = time.monotonic()
     try:
         info_web = spotify_get_playlist_info_web(playlist_uri)
+        latency = time.monotonic() - started
         playlist_owner = info_web["sp_playlist_owner"]
         playlist_image_url = info_web.get("sp_playlist_image_url", "")
         if api_status == 404:
-            SP_WEB_PLAYLIST_URIS.add(playlist_uri)
+            remember_web_playlist_uri(playlist_uri)
             owner_name = str(playlist_owner or "")
             owner_uri = str(info_web.get("sp_playlist_owner_uri", "") or "")
             spotify_owned = owner_uri.casefold() == "spotify:user:spotify" or owner_name.casefold() == "spotify"
@@ -5844,12 +7448,16 @@ def spotify_get_playlist_owner_and_image(access_token, playlist_uri, oauth_app=F
                 verbose_print("Playlist metadata switched to the web-player backend after a legacy API restriction")
             else:
                 debug_print(f"spotify_get_playlist_owner_and_image(): legacy Web API returned 404 for playlist uri={playlist_uri}, using the web-player backend for this playlist")
+        record_metadata_backend_sample("playlist", "web", True, latency)
         debug_print(f"Playlist Image URL: {playlist_image_url}")
         return playlist_owner, playlist_image_url
     except Exception as web_error:
+        if metadata_backend_failure_counts(web_error):
+            record_metadata_backend_sample("playlist", "web", False, time.monotonic() - started)
         debug_print(f"spotify_get_playlist_owner_and_image(): web-player backend failed for uri={playlist_uri}: {web_error}")
         if api_error is not None:
-            raise RuntimeError(f"Both Spotify playlist metadata backends failed for {playlist_uri}: Web API: {api_error}. Web player: {web_error}")
+            error_type = SpotifyPlaylistUnavailableError if spotify_playlist_is_unavailable(web_error) else RuntimeError
+            raise error_type(f"Both Spotify playlist metadata backends failed for {playlist_uri}: Web API: {api_error}. Web player: {web_error}")
         raise
 
 
@@ -5877,7 +7485,46 @@ def _spotify_get_track_info_api(access_token, track_uri, oauth_app=False):
     response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
     debug_print(f"HTTP GET {url} [legacy track info] -> {response.status_code}")
     response.raise_for_status()
-    json_response = response.json()
+    return spotify_parse_api_track_info(response.json(), track_uri)
+
+
+# Resolves up to TRACK_INFO_BATCH_SIZE tracks per legacy Web API request, returning metadata keyed by the requested URI
+def _spotify_get_tracks_info_api(access_token, track_uris, oauth_app=False):
+    if TOKEN_SOURCE in {"cookie", "client"} and not oauth_app:
+        access_token = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+        oauth_app = True
+    if not access_token:
+        raise Exception("_spotify_get_tracks_info_api(): OAuth app token is empty")
+
+    headers = {"Authorization": f"Bearer {access_token}", "User-Agent": USER_AGENT}
+    if TOKEN_SOURCE == "cookie" and not oauth_app:
+        headers["Client-Id"] = SP_CACHED_CLIENT_ID
+
+    results = {}
+    for start in range(0, len(track_uris), TRACK_INFO_BATCH_SIZE):
+        batch = track_uris[start:start + TRACK_INFO_BATCH_SIZE]
+        url = "https://api.spotify.com/v1/tracks?ids=" + ",".join(track_uri.split(':', 2)[2] for track_uri in batch)
+        debug_print(f"HTTP GET {url} [legacy track info batch of {len(batch)}] headers={sanitize_debug_headers(headers)}")
+        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        debug_print(f"HTTP GET {url} [legacy track info batch of {len(batch)}] -> {response.status_code}")
+        response.raise_for_status()
+        tracks = response.json().get("tracks")
+        if not isinstance(tracks, list) or len(tracks) != len(batch):
+            raise ValueError("Spotify Web API batch track data is missing or malformed")
+
+        # Unknown IDs come back as null in the requested position and are left for the caller to resolve elsewhere
+        for track_uri, json_track in zip(batch, tracks):
+            if not isinstance(json_track, dict):
+                continue
+            try:
+                results[track_uri] = spotify_parse_api_track_info(json_track, track_uri)
+            except (TypeError, ValueError) as error:
+                debug_print(f"_spotify_get_tracks_info_api(): skipping malformed track data for uri={track_uri}: {error}")
+    return results
+
+
+# Converts one legacy Web API track object to the track metadata dict used across the tool
+def spotify_parse_api_track_info(json_response, track_uri):
     duration_ms = json_response.get("duration_ms")
     artists = json_response.get("artists") or []
     artist = artists[0] if artists and isinstance(artists[0], dict) else {}
@@ -5895,16 +7542,56 @@ def _spotify_get_track_info_api(access_token, track_uri, oauth_app=False):
 
 # Selects the legacy or web-player track backend and falls back automatically
 def spotify_get_track_info(access_token, track_uri, oauth_app=False):
+    global SP_TRACK_INFO_CACHE_HITS, SP_TRACK_INFO_CACHE_MISSES
+
+    # Concurrent lookups of one track share a single request, and each caller gets its own copy of the result
+    if TRACK_INFO_CACHE_TTL <= 0 or TRACK_INFO_CACHE_SIZE <= 0:
+        return dict(single_flight(("track metadata", track_uri), spotify_load_track_info, access_token, track_uri, oauth_app))
+
+    cached = lru_cache_get(SP_TRACK_INFO_CACHE, track_uri)
+    if cached is not None:
+        SP_TRACK_INFO_CACHE_HITS += 1
+        debug_print(f"Track metadata cache hit for uri={track_uri} (hits={SP_TRACK_INFO_CACHE_HITS}, misses={SP_TRACK_INFO_CACHE_MISSES}, size={len(SP_TRACK_INFO_CACHE)})")
+        return dict(cached)
+
+    SP_TRACK_INFO_CACHE_MISSES += 1
+    debug_print(f"Track metadata cache miss for uri={track_uri} (hits={SP_TRACK_INFO_CACHE_HITS}, misses={SP_TRACK_INFO_CACHE_MISSES}, size={len(SP_TRACK_INFO_CACHE)})")
+    info = single_flight(("track metadata", track_uri), spotify_load_track_info, access_token, track_uri, oauth_app)
+
+    # Callers get their own copy so the cached entry cannot be modified through a returned dict
+    lru_cache_put(SP_TRACK_INFO_CACHE, track_uri, dict(info), TRACK_INFO_CACHE_TTL, TRACK_INFO_CACHE_SIZE)
+    return dict(info)
+
+
+# Returns track metadata from the shared metadata store, fetching and storing it on a miss
+def spotify_load_track_info(access_token, track_uri, oauth_app=False):
+    stored = metadata_store_get("track", track_uri)
+    if stored is not None:
+        return stored
+
+    info = spotify_fetch_track_info(access_token, track_uri, oauth_app)
+    metadata_store_put("track", track_uri, info, METADATA_STORE_TRACK_TTL)
+    return info
+
+
+# Returns track metadata from the legacy Web API when usable, otherwise from the web-player backend, bypassing the caches
+def spotify_fetch_track_info(access_token, track_uri, oauth_app=False):
     global SP_WEB_TRACK_BACKEND_PREFERRED, SP_WEB_TRACK_API_FAILURES
 
     api_error = None
     api_available = bool(oauth_app and access_token) or spotify_has_oauth_app_credentials()
-    if api_available and not SP_WEB_TRACK_BACKEND_PREFERRED:
+    if api_available and spotify_metadata_backend_route("track") == "api":
+        started = time.monotonic()
         try:
             info = _spotify_get_track_info_api(access_token, track_uri, oauth_app)
             SP_WEB_TRACK_API_FAILURES = 0
+            record_metadata_backend_sample("track", "api", True, time.monotonic() - started)
             return info
         except Exception as error:
+            if metadata_backend_failure_counts(error):
+                record_metadata_backend_sample("track", "api", False, time.monotonic() - started)
+            if spotify_metadata_request_pushed_back(error):
+                raise
             api_error = error
             SP_WEB_TRACK_API_FAILURES += 1
             if spotify_should_latch_web_backend(error, SP_WEB_TRACK_API_FAILURES):
@@ -5914,15 +7601,131 @@ def spotify_get_track_info(access_token, track_uri, oauth_app=False):
             else:
                 debug_print(f"spotify_get_track_info(): legacy Web API backend failed for uri={track_uri} (failures={SP_WEB_TRACK_API_FAILURES}): {error}")
 
+    started = time.monotonic()
     try:
-        return spotify_get_track_info_web(track_uri)
+        info = spotify_get_track_info_web(track_uri)
+        record_metadata_backend_sample("track", "web", True, time.monotonic() - started)
+        return info
     except Exception as web_error:
+        if metadata_backend_failure_counts(web_error):
+            record_metadata_backend_sample("track", "web", False, time.monotonic() - started)
         debug_print(f"spotify_get_track_info(): web-player backend failed for uri={track_uri}: {web_error}")
         if api_error is not None:
             raise RuntimeError(f"Both Spotify track metadata backends failed for {track_uri}: Web API: {api_error}. Web player: {web_error}")
         raise
 
 
+# Runs function over items on a bounded worker pool, returning results keyed by item and logging items that failed
+def spotify_resolve_concurrently(function, items, label):
+    results = {}
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(METADATA_BATCH_WORKERS, len(items)), thread_name_prefix="spotify-batch") as executor:
+        futures = {executor.submit(deadline_bound(function), item): item for item in items}
+        for future, item in futures.items():
+            try:
+                results[item] = future.result()
+            except Exception as error:
+                debug_print(f"{label} lookup failed for uri={item}: {error}")
+    return results
+
+
+# Resolves metadata for many tracks at once through the caches, batched legacy Web API requests and parallel web-player lookups
+def spotify_get_tracks_info(access_token, track_uris, oauth_app=False):
+    global SP_WEB_TRACK_BACKEND_PREFERRED, SP_WEB_TRACK_API_FAILURES, SP_TRACK_INFO_CACHE_HITS, SP_TRACK_INFO_CACHE_MISSES
+
+    cache_enabled = TRACK_INFO_CACHE_TTL > 0 and TRACK_INFO_CACHE_SIZE > 0
+    results = {}
+    missing = []
+    for track_uri in dict.fromkeys(track_uris):
+        if not track_uri or not track_uri.startswith("spotify:track:"):
+            continue
+        cached = lru_cache_get(SP_TRACK_INFO_CACHE, track_uri) if cache_enabled else None
+        if cached is None:
+            cached = metadata_store_get("track", track_uri)
+        if cached is not None:
+            results[track_uri] = dict(cached)
+        else:
+            missing.append(track_uri)
+
+    if cache_enabled:
+        SP_TRACK_INFO_CACHE_HITS += len(results)
+        SP_TRACK_INFO_CACHE_MISSES += len(missing)
+    debug_print(f"Batch track metadata lookup: {len(results)} cached, {len(missing)} to fetch")
+
+    fetched = {}
+    api_available = bool(oauth_app and access_token) or spotify_has_oauth_app_credentials()
+    if missing and api_available and spotify_metadata_backend_route("track") == "api":
+        started = time.monotonic()
+        try:
+            fetched = _spotify_get_tracks_info_api(access_token, missing, oauth_app)
+            SP_WEB_TRACK_API_FAILURES = 0
+            # Batch latency is spread over its tracks so it stays comparable with single web-player lookups
+            record_metadata_backend_sample("track", "api", True, (time.monotonic() - started) / len(missing))
+        except Exception as error:
+            if metadata_backend_failure_counts(error):
+                record_metadata_backend_sample("track", "api", False, time.monotonic() - started)
+            if spotify_metadata_request_pushed_back(error):
+                raise
+            SP_WEB_TRACK_API_FAILURES += 1
+            if spotify_should_latch_web_backend(error, SP_WEB_TRACK_API_FAILURES):
+                SP_WEB_TRACK_BACKEND_PREFERRED = True
+                debug_print(f"spotify_get_tracks_info(): legacy Web API unavailable (failures={SP_WEB_TRACK_API_FAILURES}, status={spotify_get_error_status_code(error)}), preferring the web-player backend for remaining tracks")
+                verbose_print("Track metadata switched to the web-player backend after legacy API failures")
+            else:
+                debug_print(f"spotify_get_tracks_info(): legacy Web API batch failed for {len(missing)} tracks (failures={SP_WEB_TRACK_API_FAILURES}): {error}")
+
+    # The web-player backend has no batch endpoint, so whatever the legacy API did not return is looked up one track per worker
+    remaining = [track_uri for track_uri in missing if track_uri not in fetched]
+    fetched.update(spotify_resolve_concurrently(spotify_get_track_info_web, remaining, "spotify_get_tracks_info(): web-player track"))
+
+    for track_uri, info in fetched.items():
+        metadata_store_put("track", track_uri, info, METADATA_STORE_TRACK_TTL)
+        if cache_enabled:
+            lru_cache_put(SP_TRACK_INFO_CACHE, track_uri, dict(info), TRACK_INFO_CACHE_TTL, TRACK_INFO_CACHE_SIZE)
+        results[track_uri] = info
+    return results
+
+
+# Resolves the tracks the given targets are playing in one batched lookup, so each target's first check is served from the caches
+# Best effort: with the caches and the metadata store disabled there is nothing to warm, and failures are left to the regular lookups
+def spotify_warm_up_track_metadata(access_token, friend_activity, user_uri_ids):
+    if (TRACK_INFO_CACHE_TTL <= 0 or TRACK_INFO_CACHE_SIZE <= 0) and not METADATA_STORE_FILE:
+        return
+    target_uris = {f"spotify:user:{user_uri_id}" for user_uri_id in user_uri_ids}
+    try:
+        track_uris = [friend["track"].get("uri") for friend in friend_activity.get("friends", []) if friend["user"].get("uri") in target_uris]
+        tracks_info = spotify_get_tracks_info(access_token, track_uris)
+        debug_print(f"Track metadata warm-up: {len(tracks_info)}/{len(track_uris)} target tracks resolved")
+    except Exception as e:
+        debug_print(f"Track metadata warm-up failed, targets fall back to single lookups: {e}")
+
+
+# Fetches track metadata and, for a playlist context, the playlist owner and image concurrently under one shared deadline
+def spotify_get_track_change_metadata(access_token, track_uri, playlist_uri=""):
+    global METADATA_ENRICHMENT_EXECUTOR
+
+    if not playlist_uri:
+        return spotify_get_track_info(access_token, track_uri), None
+
+    if METADATA_ENRICHMENT_EXECUTOR is None:
+        METADATA_ENRICHMENT_EXECUTOR = ThreadPoolExecutor(max_workers=METADATA_ENRICHMENT_WORKERS, thread_name_prefix="spotify-metadata")
+    # Both workers share the deadline, so requests still running when it passes are cut short instead of lingering
+    with request_deadline(METADATA_ENRICHMENT_TIMEOUT):
+        track_future = METADATA_ENRICHMENT_EXECUTOR.submit(deadline_bound(spotify_get_track_info), access_token, track_uri)
+        playlist_future = METADATA_ENRICHMENT_EXECUTOR.submit(deadline_bound(spotify_get_playlist_owner_and_image), access_token, playlist_uri)
+
+    _, pending = wait_for_futures((track_future, playlist_future), timeout=METADATA_ENRICHMENT_TIMEOUT)
+    if pending:
+        for future in pending:
+            future.cancel()
+        raise TimeoutError(f"Track and playlist metadata requests did not finish within {display_time(METADATA_ENRICHMENT_TIMEOUT)}")
+
+    # Track errors are raised first, matching the order of the former sequential lookups
+    return track_future.result(), playlist_future.result()
+
+
 # Checks if a Spotify user URI ID has been deleted
 def is_user_removed(access_token, user_uri_id, oauth_app=False):
     # Use internal Spotify API (official /users/{id} endpoint was removed in Feb 2026)
@@ -5938,16 +7741,10 @@ def is_user_removed(access_token, user_uri_id, oauth_app=False):
             "Client-Id": SP_CACHED_CLIENT_ID
         })
 
-    if platform.system() != 'Windows':
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(FUNCTION_TIMEOUT + 2)
-
     try:
-        temp_session = req.Session()
-        temp_session.headers.update(headers)
-
         debug_print(f"HTTP GET {url} [user removed check] headers={sanitize_debug_headers(headers)}")
-        response = temp_session.get(url, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        with request_deadline(FUNCTION_TIMEOUT + 2):
+            response = spotify_pooled_session().get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [user removed check] -> {response.status_code}")
 
         if response.status_code == 429:
@@ -5966,9 +7763,6 @@ def is_user_removed(access_token, user_uri_id, oauth_app=False):
         return False
     except Exception:
         return False
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
 
 def spotify_macos_play_song(sp_track_uri_id, method=SPOTIFY_MACOS_PLAYING_METHOD):
@@ -8209,8 +10003,143 @@ def run_scrobble_health_setup_wizard(config_file=None, env_file=None) -> None:
     raise SystemExit(0)
 
 
+# Returns the wait before the next check of an active friend, checking sparsely mid-track and densely around the predicted track end
+# Falls back to SPOTIFY_CHECK_INTERVAL when predictive polling is off, the friend is inactive or the prediction cannot be trusted
+def predict_check_interval(sp_ts, sp_track_duration, active, now=None):
+    if not PREDICTIVE_POLLING or not active or not sp_track_duration or sp_track_duration <= 0:
+        return SPOTIFY_CHECK_INTERVAL
+
+    remaining = sp_ts + sp_track_duration - (time.time() if now is None else now)
+    # Well past the predicted end the friend has paused, is hearing an ad or the timestamp is off, so the prediction no longer holds
+    if remaining < -PREDICTIVE_POLL_WINDOW or remaining > sp_track_duration + PREDICTIVE_POLL_WINDOW:
+        return SPOTIFY_CHECK_INTERVAL
+
+    dense_interval = min(PREDICTIVE_POLL_DENSE_INTERVAL, SPOTIFY_CHECK_INTERVAL)
+    if remaining <= PREDICTIVE_POLL_WINDOW:
+        return dense_interval
+
+    # Mid-track the next check lands at the start of the dense window, but no later than the longest allowed wait
+    return max(dense_interval, min(int(remaining - PREDICTIVE_POLL_WINDOW), max(PREDICTIVE_POLL_MAX_INTERVAL, SPOTIFY_CHECK_INTERVAL)))
+
+
+# Returns the wait after the given number of consecutive checks that found the friend inactive, doubling up to IDLE_BACKOFF_MAX_INTERVAL
+def idle_backoff_interval(idle_checks):
+    if IDLE_BACKOFF_MAX_INTERVAL <= SPOTIFY_CHECK_INTERVAL or idle_checks <= 0:
+        return SPOTIFY_CHECK_INTERVAL
+    # The exponent is bounded so weeks of inactivity cannot build an enormous intermediate value
+    return min(IDLE_BACKOFF_MAX_INTERVAL, SPOTIFY_CHECK_INTERVAL * IDLE_BACKOFF_FACTOR ** min(idle_checks, 32))
+
+
+# Returns the wait before the next regular check: backing off while the friend stays inactive, otherwise following the current track
+def next_check_interval(sp_ts, sp_track_duration, active, idle_checks, now=None):
+    if not active and idle_checks > 0:
+        return idle_backoff_interval(idle_checks)
+    return predict_check_interval(sp_ts, sp_track_duration, active, now)
+
+
+# Returns a tick scheduler with the configured start phase and per-check jitter, drawn from a generator seeded with seed
+def jittered_tick_scheduler(seed):
+    scheduler = MonitorTickScheduler(start_jitter=START_JITTER, jitter=min(max(POLL_JITTER, 0), 0.5))
+    if START_JITTER or scheduler.jitter > 0:
+        scheduler.rng = random.Random(f"spotify_monitor tick jitter {seed}")
+    return scheduler
+
+
+# Returns a new tick scheduler for the given target, registered so debug output can report its lag
+# Jitter draws are seeded with the target, so every target gets its own stable phase; jittered=False leaves the cadence exact
+def monitor_tick_scheduler(user_uri_id, jittered=True):
+    scheduler = jittered_tick_scheduler(user_uri_id) if jittered else MonitorTickScheduler()
+    SP_MONITOR_TICK_SCHEDULERS[user_uri_id] = scheduler
+    return scheduler
+
+
+# Returns a DeferredRetry for a check whose Spotify request was answered with HTTP 429 or 5xx inside deferred_request_retries(),
+# or None for any other error and once attempt exceeds DEFERRED_RETRY_ATTEMPTS, so the caller falls back to its error interval
+def monitor_deferred_retry(error, attempt):
+    while error is not None and not isinstance(error, SpotifyRetryDeferredError):
+        error = error.__cause__ or error.__context__
+    if error is None or attempt > DEFERRED_RETRY_ATTEMPTS:
+        return None
+    if error.retry_after is not None:
+        delay = error.retry_after
+    else:
+        delay = DEFERRED_RETRY_BACKOFF * 2 ** (attempt - 1)
+        if error.status_code == 429:
+            delay = max(delay, SPOTIFY_RATE_LIMIT_DEFAULT_PAUSE)
+    deferred = DeferredRetry(min(delay, MAX_RETRY_AFTER_SECONDS), sanitize_error_text(error))
+    debug_print(f"Deferred retry {attempt}/{DEFERRED_RETRY_ATTEMPTS} in {deferred.delay:.1f}s: {deferred.reason}")
+    return deferred
+
+
+# Drives one monitoring state machine, waiting until each next check's deadline on the monotonic clock
+def run_monitor_steps(steps, scheduler=None):
+    scheduler = scheduler or MonitorTickScheduler()
+    start_phase = scheduler.start_phase(SPOTIFY_CHECK_INTERVAL)
+    if start_phase > 0:
+        time.sleep(start_phase)
+    scheduler.record_start(time.monotonic())
+    for sleep_time in steps:
+        delay = scheduler.schedule(sleep_time, time.monotonic()) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        scheduler.record_start(time.monotonic())
+
+
+# Polls the buddy list on the regular interval and yields wait times, publishing every response for subscribed monitors
+def spotify_buddylist_broker_steps(snapshot_file):
+    global SP_CACHED_ACCESS_TOKEN
+    recovery_hint_tracker = RecoveryHintTracker()
+    deferred_attempts = 0
+
+    out = f"Publishing buddy-list snapshots to {snapshot_file}"
+    print(out)
+    print("─" * HORIZONTAL_LINE)
+
+    while True:
+        # Every request of this check shares one ALARM_TIMEOUT budget, so slow responses and retries cannot stall the loop
+        # HTTP 429 and 5xx answers come back as deferred retries that this generator yields instead of sleeping through
+        try:
+            with request_deadline(ALARM_TIMEOUT), deferred_request_retries():
+                _sp_accessToken, sp_friends = spotify_request_with_access_token(spotify_get_friends_json)
+            deferred_attempts = 0
+        except TimeoutException:
+            print_monitor_recovery(TimeoutException(f"Spotify request timed out after {display_time(ALARM_TIMEOUT)}"), "runtime", recovery_hint_tracker, f"* Error, retrying in {display_time(ALARM_RETRY)}: ")
+            print_cur_ts("Timestamp:\t\t\t")
+            yield ALARM_RETRY
+            continue
+        except Exception as e:
+            deferred_attempts += 1
+            deferred = monitor_deferred_retry(e, deferred_attempts)
+            if deferred is not None:
+                yield deferred
+                continue
+            deferred_attempts = 0
+            auth_context = "client_auth" if TOKEN_SOURCE == "client" else "cookie_auth"
+            advice = print_monitor_recovery(e, auth_context, recovery_hint_tracker, f"* Error, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: ")
+            if TOKEN_SOURCE == 'cookie' and advice.code in ("auth.cookie_invalid", "auth.rejected"):
+                SP_CACHED_ACCESS_TOKEN = None
+            print_cur_ts("Timestamp:\t\t\t")
+            yield SPOTIFY_ERROR_INTERVAL
+            continue
+
+        try:
+            publish_buddylist_snapshot(snapshot_file, sp_friends)
+        except Exception as e:
+            print_recovery_error(e, "file_write", detail=f"Buddy-list snapshot '{snapshot_file}' could not be written: {e}")
+            yield SPOTIFY_ERROR_INTERVAL
+            continue
+        recovery_hint_tracker.reset()
+        debug_print(f"Buddy-list snapshot published: {len(sp_friends.get('friends', []))} friends")
+        yield SPOTIFY_CHECK_INTERVAL
+
+
 # Monitors music activity of the specified Spotify friend's user URI ID
 def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
+    run_monitor_steps(spotify_monitor_friend_uri_steps(user_uri_id, tracks, csv_file_name), monitor_tick_scheduler(user_uri_id))
+
+
+# Runs the monitoring state machine for one friend, yielding the number of seconds to wait before each next check
+def spotify_monitor_friend_uri_steps(user_uri_id, tracks, csv_file_name, friends_source=None):
     global SP_CACHED_ACCESS_TOKEN
     sp_active_ts_start = 0
     sp_active_ts_stop = 0
@@ -8233,6 +10162,8 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
     sp_accessToken = ""
     recovery_hint_tracker = RecoveryHintTracker()
     transient_request_failure_active = False
+    deferred_buddylist_attempts = 0
+    deferred_metadata_attempts = 0
 
     try:
         if csv_file_name:
@@ -8254,37 +10185,33 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
     while True:
         debug_print(f"Loop tick: token_source={TOKEN_SOURCE}, check_interval={SPOTIFY_CHECK_INTERVAL}, error_interval={SPOTIFY_ERROR_INTERVAL}")
 
-        # Sometimes Spotify network functions halt even though we specified the timeout
-        # To overcome this we use alarm signal functionality to kill it inevitably, not available on Windows
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(ALARM_TIMEOUT)
+        # Every request of this check shares one ALARM_TIMEOUT budget, so slow responses and retries cannot stall the loop
+        # HTTP 429 and 5xx answers come back as deferred retries that this generator yields instead of sleeping through
         try:
-            if TOKEN_SOURCE == "client":
-                sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
-            else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-
-            sp_friends = spotify_get_friends_json(sp_accessToken)
-            sp_found, sp_data = spotify_get_friend_info(sp_friends, user_uri_id)
+            with request_deadline(ALARM_TIMEOUT), deferred_request_retries():
+                sp_accessToken, sp_friends = spotify_request_friends(friends_source)
+                sp_found, sp_data = spotify_get_friend_info(sp_friends, user_uri_id)
+                # Friends read from a broker snapshot come without a token, which the profile check of a missing target needs
+                if not sp_found and not sp_accessToken:
+                    sp_accessToken = spotify_get_access_token()
+            deferred_buddylist_attempts = 0
             recovery_hint_tracker.reset()
             debug_print(f"Friend lookup result: found={sp_found}")
             email_sent = False
             webhook_sent = False
-            if platform.system() != 'Windows':
-                signal.alarm(0)
         except TimeoutException:
-            if platform.system() != 'Windows':
-                signal.alarm(0)
             print_monitor_recovery(TimeoutException(f"Spotify request timed out after {display_time(ALARM_TIMEOUT)}"), "runtime", recovery_hint_tracker, f"* Error, retrying in {display_time(ALARM_RETRY)}: ")
             print_cur_ts("Timestamp:\t\t\t")
-            time.sleep(ALARM_RETRY)
+            yield ALARM_RETRY
             continue
         except Exception as e:
-            if platform.system() != 'Windows':
-                signal.alarm(0)
-
             debug_print(f"Main monitor loop error: {e}")
+            deferred_buddylist_attempts += 1
+            deferred = monitor_deferred_retry(e, deferred_buddylist_attempts)
+            if deferred is not None:
+                yield deferred
+                continue
+            deferred_buddylist_attempts = 0
 
             auth_context = "client_auth" if TOKEN_SOURCE == "client" else "cookie_auth"
             advice = print_monitor_recovery(e, auth_context, recovery_hint_tracker, f"* Error, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: ")
@@ -8313,7 +10240,7 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                     webhook_sent = webhook_sent or webhook_attempted
 
             print_cur_ts("Timestamp:\t\t\t")
-            time.sleep(SPOTIFY_ERROR_INTERVAL)
+            yield SPOTIFY_ERROR_INTERVAL
             continue
 
         playlist_m_body = ""
@@ -8337,18 +10264,26 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
 
             sp_playlist_data = {}
             try:
-                sp_track_data = spotify_get_track_info(sp_accessToken, sp_track_uri)
+                is_playlist = 'spotify:playlist:' in sp_playlist_uri
+                with deferred_request_retries():
+                    sp_track_data, sp_playlist_info = spotify_get_track_change_metadata(sp_accessToken, sp_track_uri, sp_playlist_uri if is_playlist else "")
+                deferred_metadata_attempts = 0
                 sp_album_image_url = sp_track_data.get("sp_album_image_url", "")
                 debug_print(f"Album Image URL: {sp_album_image_url}")
-                is_playlist = 'spotify:playlist:' in sp_playlist_uri
-                if is_playlist:
-                    sp_playlist_owner, sp_playlist_image_url = spotify_get_playlist_owner_and_image(sp_accessToken, sp_playlist_uri)
+                if is_playlist and sp_playlist_info is not None:
+                    sp_playlist_owner, sp_playlist_image_url = sp_playlist_info
                     playlist_suffix = SPOTIFY_SUFFIX if sp_playlist_owner == "Spotify" else ""
 
             except Exception as e:
+                deferred_metadata_attempts += 1
+                deferred = monitor_deferred_retry(e, deferred_metadata_attempts)
+                if deferred is not None:
+                    yield deferred
+                    continue
+                deferred_metadata_attempts = 0
                 print_monitor_recovery(e, "metadata", recovery_hint_tracker, f"* Error, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: ")
                 print_cur_ts("Timestamp:\t\t\t")
-                time.sleep(SPOTIFY_ERROR_INTERVAL)
+                yield SPOTIFY_ERROR_INTERVAL
                 continue
 
             sp_username = sp_data["sp_username"]
@@ -8498,6 +10433,8 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
 
             sp_ts_old = sp_ts
             alive_counter = 0
+            idle_checks = 0
+            check_interval = SPOTIFY_CHECK_INTERVAL
 
             email_sent = False
 
@@ -8512,38 +10449,34 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                 check_started_at = debug_monitor_check_start(check_count, user_uri_id)
 
                 while True:
-                    # Sometimes Spotify network functions halt even though we specified the timeout
-                    # To overcome this we use alarm signal functionality to kill it inevitably, not available on Windows
-                    if platform.system() != 'Windows':
-                        signal.signal(signal.SIGALRM, timeout_handler)
-                        signal.alarm(ALARM_TIMEOUT)
+                    # Every request of this check shares one ALARM_TIMEOUT budget, so slow responses and retries cannot stall the loop
+                    # HTTP 429 and 5xx answers come back as deferred retries that this generator yields instead of sleeping through
                     try:
-                        if TOKEN_SOURCE == "client":
-                            sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
-                        else:
-                            sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-
-                        sp_friends = spotify_get_friends_json(sp_accessToken)
-                        sp_found, sp_data = spotify_get_friend_info(sp_friends, user_uri_id)
+                        with request_deadline(ALARM_TIMEOUT), deferred_request_retries():
+                            sp_accessToken, sp_friends = spotify_request_friends(friends_source)
+                            sp_found, sp_data = spotify_get_friend_info(sp_friends, user_uri_id)
+                            # Friends read from a broker snapshot come without a token, which the profile check of a missing target needs
+                            if not sp_found and not sp_accessToken:
+                                sp_accessToken = spotify_get_access_token()
+                        deferred_buddylist_attempts = 0
                         if transient_request_failure_active:
                             verbose_print("Spotify requests recovered after a transient failure")
                             transient_request_failure_active = False
                         recovery_hint_tracker.reset()
                         email_sent = False
                         webhook_sent = False
-                        if platform.system() != 'Windows':
-                            signal.alarm(0)
                         break
                     except TimeoutException:
-                        if platform.system() != 'Windows':
-                            signal.alarm(0)
                         print_monitor_recovery(TimeoutException(f"Spotify request timed out after {display_time(ALARM_TIMEOUT)}"), "runtime", recovery_hint_tracker, f"* Error, retrying in {display_time(ALARM_RETRY)}: ")
                         print_cur_ts("Timestamp:\t\t\t")
-                        time.sleep(ALARM_RETRY)
+                        yield ALARM_RETRY
                     except Exception as e:
-                        if platform.system() != 'Windows':
-                            signal.alarm(0)
-
+                        deferred_buddylist_attempts += 1
+                        deferred = monitor_deferred_retry(e, deferred_buddylist_attempts)
+                        if deferred is not None:
+                            yield deferred
+                            continue
+                        deferred_buddylist_attempts = 0
                         auth_context = "client_auth" if TOKEN_SOURCE == "client" else "cookie_auth"
                         advice = classify_recovery_error(e, auth_context)
 
@@ -8604,7 +10537,7 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                                     webhook_sent = webhook_sent or webhook_attempted
 
                             print_cur_ts("Timestamp:\t\t\t")
-                        time.sleep(SPOTIFY_ERROR_INTERVAL)
+                        yield SPOTIFY_ERROR_INTERVAL
 
                 if sp_found is False:
                     # User has disappeared from the Spotify's friend list or account has been removed
@@ -8613,7 +10546,7 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                         verbose_print(f"Target {user_uri_id} was absent from one buddy-list response. Waiting for confirmation before reporting disappearance")
                     if disappeared_counter < REMOVED_DISAPPEARED_COUNTER:
                         debug_monitor_check_timing(check_count, user_uri_id, check_started_at, SPOTIFY_CHECK_INTERVAL)
-                        time.sleep(SPOTIFY_CHECK_INTERVAL)
+                        yield SPOTIFY_CHECK_INTERVAL
                         continue
                     if user_not_found is False:
                         if is_user_removed(sp_accessToken, user_uri_id):
@@ -8640,7 +10573,7 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                         print_cur_ts("Timestamp:\t\t\t")
                         user_not_found = True
                     debug_monitor_check_timing(check_count, user_uri_id, check_started_at, SPOTIFY_DISAPPEARED_CHECK_INTERVAL)
-                    time.sleep(SPOTIFY_DISAPPEARED_CHECK_INTERVAL)
+                    yield SPOTIFY_DISAPPEARED_CHECK_INTERVAL
                     continue
                 else:
                     # User reappeared in the Spotify's friend list
@@ -8671,19 +10604,27 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                     sp_album_uri = sp_data["sp_album_uri"]
                     sp_playlist_uri = sp_data["sp_playlist_uri"]
                     try:
-                        sp_track_data = spotify_get_track_info(sp_accessToken, sp_track_uri)
+                        is_playlist = 'spotify:playlist:' in sp_playlist_uri
+                        with deferred_request_retries():
+                            sp_track_data, sp_playlist_info = spotify_get_track_change_metadata(sp_accessToken, sp_track_uri, sp_playlist_uri if is_playlist else "")
+                        deferred_metadata_attempts = 0
                         sp_album_image_url = sp_track_data.get("sp_album_image_url", "")
                         debug_print(f"Album Image URL: {sp_album_image_url}")
-                        is_playlist = 'spotify:playlist:' in sp_playlist_uri
-                        if is_playlist:
-                            sp_playlist_owner, sp_playlist_image_url = spotify_get_playlist_owner_and_image(sp_accessToken, sp_playlist_uri)
+                        if is_playlist and sp_playlist_info is not None:
+                            sp_playlist_owner, sp_playlist_image_url = sp_playlist_info
                             playlist_suffix = SPOTIFY_SUFFIX if sp_playlist_owner == "Spotify" else ""
                         else:
                             sp_playlist_image_url = ""
                     except Exception as e:
+                        deferred_metadata_attempts += 1
+                        deferred = monitor_deferred_retry(e, deferred_metadata_attempts)
+                        if deferred is not None:
+                            yield deferred
+                            continue
+                        deferred_metadata_attempts = 0
                         print_monitor_recovery(e, "metadata", recovery_hint_tracker, f"* Error, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: ")
                         print_cur_ts("Timestamp:\t\t\t")
-                        time.sleep(SPOTIFY_ERROR_INTERVAL)
+                        yield SPOTIFY_ERROR_INTERVAL
                         continue
 
                     sp_username = sp_data["sp_username"]
@@ -8982,7 +10923,8 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                     sp_ts_old = sp_ts
                 # Track has not changed
                 else:
-                    alive_counter += 1
+                    # Counted in base intervals so liveness output keeps its cadence when checks are spread out
+                    alive_counter += check_interval / SPOTIFY_CHECK_INTERVAL
                     # Friend got inactive
                     if (cur_ts - sp_ts) > SPOTIFY_INACTIVITY_CHECK and sp_active_ts_start > 0:
                         sp_active_ts_stop = sp_ts
@@ -9104,8 +11046,11 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                         print_cur_ts("Liveness check, timestamp:\t")
                         alive_counter = 0
 
-                debug_monitor_check_timing(check_count, user_uri_id, check_started_at, SPOTIFY_CHECK_INTERVAL)
-                time.sleep(SPOTIFY_CHECK_INTERVAL)
+                # Quiet checks past the inactivity timer lengthen the wait; any activity starts the count again
+                idle_checks = idle_checks + 1 if sp_active_ts_start == 0 and (cur_ts - sp_ts) > SPOTIFY_INACTIVITY_CHECK else 0
+                check_interval = next_check_interval(sp_ts, sp_track_duration, sp_active_ts_start > 0, idle_checks)
+                debug_monitor_check_timing(check_count, user_uri_id, check_started_at, check_interval)
+                yield check_interval
 
                 ERROR_500_ZERO_TIME_LIMIT = ERROR_500_TIME_LIMIT + SPOTIFY_CHECK_INTERVAL
                 if SPOTIFY_CHECK_INTERVAL * ERROR_500_NUMBER_LIMIT > ERROR_500_ZERO_TIME_LIMIT:
@@ -9139,10 +11084,78 @@ def spotify_monitor_friend_uri(user_uri_id, tracks, csv_file_name):
                 print_cur_ts("Timestamp:\t\t\t")
                 user_not_found = True
             debug_monitor_wait_timing(user_uri_id, SPOTIFY_DISAPPEARED_CHECK_INTERVAL)
-            time.sleep(SPOTIFY_DISAPPEARED_CHECK_INTERVAL)
+            yield SPOTIFY_DISAPPEARED_CHECK_INTERVAL
             continue
 
 
+# Derives a per-target CSV file name so several monitored friends never share one CSV file
+def build_target_csv_file_name(csv_file_name, user_uri_id):
+    if not csv_file_name:
+        return csv_file_name
+    root, extension = os.path.splitext(csv_file_name)
+    safe_target = re.sub(r"[^A-Za-z0-9._-]+", "_", str(user_uri_id)).strip("._") or "target"
+    return f"{root}_{safe_target}{extension or '.csv'}"
+
+
+# Reads Spotify targets from a file with one user ID, URI or profile URL per line
+def load_targets_file(targets_file):
+    try:
+        with open(targets_file, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except UnicodeDecodeError:
+        with open(targets_file, encoding="cp1252") as file:
+            lines = file.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+# Monitors several Spotify friends in one process, fanning one buddy-list poll per tick out to every target
+# Each target's output is prefixed with its user URI ID, since all targets share one console and log file
+# Targets keep exact cadences and the start phase and jitter are drawn once per tick for the whole process,
+# so targets on the same interval stay due together and keep sharing one poll
+# A target waiting out a deferred retry is never woken before the delay the server asked for
+def spotify_monitor_friend_uris(user_uri_ids, tracks, csv_file_name):
+    shared_poll = SharedBuddylistPoll(warm_up_targets=user_uri_ids)
+    monitors = [spotify_monitor_friend_uri_steps(user_uri_id, tracks, build_target_csv_file_name(csv_file_name, user_uri_id), friends_source=shared_poll.get) for user_uri_id in user_uri_ids]
+    schedulers = [monitor_tick_scheduler(user_uri_id, jittered=False) for user_uri_id in user_uri_ids]
+    tick_scheduler = jittered_tick_scheduler(",".join(user_uri_ids))
+    wake_at = [0.0] * len(monitors)
+    deferred = [False] * len(monitors)
+    last_tick = None
+
+    start_phase = tick_scheduler.start_phase(SPOTIFY_CHECK_INTERVAL)
+    if start_phase > 0:
+        time.sleep(start_phase)
+
+    while True:
+        next_wake = min(wake_at)
+        wake = next_wake
+        if last_tick is not None and next_wake > last_tick:
+            wake = last_tick + tick_scheduler.planned_interval(next_wake - last_tick)
+            # Retry-After delays may only be jittered later, never earlier
+            if any(deferred[index] and wake_at[index] == next_wake for index in range(len(monitors))):
+                wake = max(wake, next_wake)
+        now = time.monotonic()
+        if wake > now:
+            time.sleep(wake - now)
+            now = time.monotonic()
+
+        tick_scheduler.record_start(now)
+        last_tick = now
+        shared_poll.start_tick()
+        due_targets = 0
+        # Targets are due relative to the unjittered wake, so an early jittered tick still checks everything it was meant for
+        due_until = max(next_wake, now) + MULTI_TARGET_TICK_GROUPING
+        for index, monitor in enumerate(monitors):
+            if wake_at[index] <= (now if deferred[index] else due_until):
+                due_targets += 1
+                schedulers[index].record_start(now)
+                with redirect_stdout(TargetPrefixedOutput(sys.stdout, f"[{user_uri_ids[index]}] ")):
+                    sleep_time = next(monitor)
+                deferred[index] = isinstance(sleep_time, DeferredRetry)
+                wake_at[index] = schedulers[index].schedule(sleep_time, time.monotonic())
+        debug_print(f"Multi-target tick: {due_targets}/{len(monitors)} targets checked, buddy-list fetches so far: {shared_poll.fetch_count}")
+
+
 # Applies validated one-run webhook command-line overrides to runtime settings
 def apply_webhook_cli_overrides(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
     global WEBHOOK_ENABLED, WEBHOOK_URL, WEBHOOK_PROVIDER, WEBHOOK_ACTIVE_NOTIFICATION, WEBHOOK_INACTIVE_NOTIFICATION, WEBHOOK_TRACK_NOTIFICATION, WEBHOOK_SONG_NOTIFICATION, WEBHOOK_SONG_ON_LOOP_NOTIFICATION, WEBHOOK_ERROR_NOTIFICATION
@@ -9192,7 +11205,7 @@ def select_monitor_mode(configured_mode: str, cli_mode: Optional[str] = None) ->
 
 # Parses command-line options then starts the selected command or monitoring mode
 def main():
-    global CLI_CONFIG_PATH, DOTENV_FILE, LIVENESS_CHECK_COUNTER, LOGIN_REQUEST_BODY_FILE, CLIENTTOKEN_REQUEST_BODY_FILE, REFRESH_TOKEN, LOGIN_URL, USER_AGENT, DEVICE_ID, SYSTEM_ID, USER_URI_ID, SP_DC_COOKIE, CSV_FILE, MONITOR_LIST_FILE, FILE_SUFFIX, DISABLE_LOGGING, DEBUG_MODE, VERBOSE_MODE, SP_LOGFILE, ACTIVE_NOTIFICATION, INACTIVE_NOTIFICATION, TRACK_NOTIFICATION, SONG_NOTIFICATION, SONG_ON_LOOP_NOTIFICATION, ERROR_NOTIFICATION, SCROBBLE_HEALTH_NOTIFICATION, WEBHOOK_ENABLED, WEBHOOK_URL, WEBHOOK_ACTIVE_NOTIFICATION, WEBHOOK_INACTIVE_NOTIFICATION, WEBHOOK_TRACK_NOTIFICATION, WEBHOOK_SONG_NOTIFICATION, WEBHOOK_SONG_ON_LOOP_NOTIFICATION, WEBHOOK_ERROR_NOTIFICATION, WEBHOOK_SCROBBLE_HEALTH_NOTIFICATION, SPOTIFY_CHECK_INTERVAL, SPOTIFY_INACTIVITY_CHECK, SPOTIFY_ERROR_INTERVAL, SPOTIFY_DISAPPEARED_CHECK_INTERVAL, MONITOR_MODE, LASTFM_USERNAME, LASTFM_API_KEY, SPOTIFY_SCROBBLE_CLIENT_ID, SPOTIFY_SCROBBLE_REDIRECT_URI, SPOTIFY_SCROBBLE_REFRESH_TOKEN, SCROBBLE_HEALTH_CHECK_INTERVAL, SCROBBLE_HEALTH_DEAD_PERIOD, SCROBBLE_HEALTH_MIN_UNMATCHED, SCROBBLE_HEALTH_MATCH_WINDOW, SCROBBLE_HEALTH_LOOKBACK, SCROBBLE_HEALTH_REPEAT_INTERVAL, SCROBBLE_HEALTH_STATE_FILE, TRACK_SONGS, SMTP_PASSWORD, stdout_bck, APP_VERSION, CPU_ARCH, OS_BUILD, PLATFORM, OS_MAJOR, OS_MINOR, CLIENT_MODEL, TOKEN_SOURCE, ALARM_TIMEOUT, pyotp, USER_AGENT, FLAG_FILE, TRUNCATE_CHARS, SP_APP_TOKENS_FILE, SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET, NTFY_IMAGES, NTFY_SHORT
+    global CLI_CONFIG_PATH, DOTENV_FILE, LIVENESS_CHECK_COUNTER, LOGIN_REQUEST_BODY_FILE, CLIENTTOKEN_REQUEST_BODY_FILE, REFRESH_TOKEN, LOGIN_URL, USER_AGENT, DEVICE_ID, SYSTEM_ID, USER_URI_ID, SP_DC_COOKIE, CSV_FILE, MONITOR_LIST_FILE, FILE_SUFFIX, DISABLE_LOGGING, DEBUG_MODE, VERBOSE_MODE, SP_LOGFILE, ACTIVE_NOTIFICATION, INACTIVE_NOTIFICATION, TRACK_NOTIFICATION, SONG_NOTIFICATION, SONG_ON_LOOP_NOTIFICATION, ERROR_NOTIFICATION, SCROBBLE_HEALTH_NOTIFICATION, WEBHOOK_ENABLED, WEBHOOK_URL, WEBHOOK_ACTIVE_NOTIFICATION, WEBHOOK_INACTIVE_NOTIFICATION, WEBHOOK_TRACK_NOTIFICATION, WEBHOOK_SONG_NOTIFICATION, WEBHOOK_SONG_ON_LOOP_NOTIFICATION, WEBHOOK_ERROR_NOTIFICATION, WEBHOOK_SCROBBLE_HEALTH_NOTIFICATION, SPOTIFY_CHECK_INTERVAL, SPOTIFY_INACTIVITY_CHECK, SPOTIFY_ERROR_INTERVAL, SPOTIFY_DISAPPEARED_CHECK_INTERVAL, MONITOR_MODE, LASTFM_USERNAME, LASTFM_API_KEY, SPOTIFY_SCROBBLE_CLIENT_ID, SPOTIFY_SCROBBLE_REDIRECT_URI, SPOTIFY_SCROBBLE_REFRESH_TOKEN, SCROBBLE_HEALTH_CHECK_INTERVAL, SCROBBLE_HEALTH_DEAD_PERIOD, SCROBBLE_HEALTH_MIN_UNMATCHED, SCROBBLE_HEALTH_MATCH_WINDOW, SCROBBLE_HEALTH_LOOKBACK, SCROBBLE_HEALTH_REPEAT_INTERVAL, SCROBBLE_HEALTH_STATE_FILE, TRACK_SONGS, SMTP_PASSWORD, stdout_bck, APP_VERSION, CPU_ARCH, OS_BUILD, PLATFORM, OS_MAJOR, OS_MINOR, CLIENT_MODEL, TOKEN_SOURCE, ALARM_TIMEOUT, pyotp, USER_AGENT, FLAG_FILE, TRUNCATE_CHARS, SP_APP_TOKENS_FILE, SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET, NTFY_IMAGES, NTFY_SHORT, BUDDYLIST_SNAPSHOT_FILE, SP_TOKEN_CACHE_PATH, METADATA_STORE_FILE, SP_WEB_QUERY_HASH_CACHE_PATH, SP_METADATA_BACKEND_STATE_PATH, PREDICTIVE_POLLING, IDLE_BACKOFF_MAX_INTERVAL, START_JITTER, POLL_JITTER
 
     if "--generate-config" in sys.argv and "--setup" not in sys.argv and "--setup-scrobble-health" not in sys.argv and "--authorize-scrobble-health" not in sys.argv and "--set-sp-dc" not in sys.argv and "--set-lastfm-credentials" not in sys.argv and "--set-webhook-url" not in sys.argv:
         config_content = generate_config_with_current_values()
@@ -9353,6 +11366,35 @@ def main():
         help="Spotify recent-play refresh token for this run (may remain in shell history)",
     )
 
+    # Multiple friend activity targets sharing one buddy-list poll
+    multi_target = parser.add_argument_group("Multiple targets")
+    multi_target.add_argument(
+        "--targets",
+        dest="targets",
+        metavar="SPOTIFY_USER_URI_ID",
+        nargs="+",
+        help="Monitor several friends in one process using one buddy-list poll per check",
+    )
+    multi_target.add_argument(
+        "--targets-file",
+        dest="targets_file",
+        metavar="PATH",
+        help="File with one Spotify user ID, URI or profile URL per line to monitor in one process",
+    )
+    multi_target.add_argument(
+        "--buddylist-broker",
+        dest="buddylist_broker",
+        action="store_true",
+        default=None,
+        help="Only poll the buddy list and publish it to the snapshot file for other monitor processes",
+    )
+    multi_target.add_argument(
+        "--buddylist-snapshot",
+        dest="buddylist_snapshot",
+        metavar="PATH",
+        help="Buddy-list snapshot file written by the broker and read by monitors on the same host",
+    )
+
     # Token source
     parser.add_argument(
         "--token-source",
@@ -9572,6 +11614,34 @@ def main():
         type=int,
         help="Time between monitoring checks, in seconds"
     )
+    times.add_argument(
+        "--idle-backoff",
+        dest="idle_backoff",
+        metavar="SECONDS",
+        type=int,
+        help="Longest wait between checks while the user stays inactive, growing from the check interval; 0 disables"
+    )
+    times.add_argument(
+        "--poll-jitter",
+        dest="poll_jitter",
+        metavar="FRACTION",
+        type=float,
+        help="Randomly move each check and error retry earlier or later by up to this fraction of its wait (0-0.5)"
+    )
+    times.add_argument(
+        "--start-jitter",
+        dest="start_jitter",
+        action="store_true",
+        default=None,
+        help="Delay the first check by a random part of the interval so instances started together fall out of step"
+    )
+    times.add_argument(
+        "--predictive-polling",
+        dest="predictive_polling",
+        action="store_true",
+        default=None,
+        help="Check sparsely mid-song and densely around the predicted end of the current song"
+    )
     times.add_argument(
         "-o", "--offline-timer",
         dest="offline_timer",
@@ -9805,6 +11875,10 @@ def main():
             (args.send_test_email, "--send-test-email"),
             (args.send_test_webhook, "--send-test-webhook"),
             (args.list_friends, "--list-friends"),
+            (args.targets, "--targets"),
+            (args.targets_file, "--targets-file"),
+            (args.buddylist_broker, "--buddylist-broker"),
+            (args.buddylist_snapshot, "--buddylist-snapshot"),
             (args.token_source, "--token-source"),
             (args.spotify_dc_cookie, "--spotify-dc-cookie"),
             (args.login_request_body_file, "--login-request-body-file"),
@@ -9813,6 +11887,8 @@ def main():
             (args.webhook_url, "--webhook-url"),
             (args.webhook_provider, "--webhook-provider"),
             (args.check_interval, "--check-interval"),
+            (args.idle_backoff, "--idle-backoff"),
+            (args.poll_jitter, "--poll-jitter"),
             (args.offline_timer, "--offline-timer"),
             (args.disappeared_timer, "--disappeared-timer"),
             (args.monitor_mode, "--monitor-mode"),
@@ -9840,7 +11916,7 @@ def main():
             (args.force, "--force"),
         )
         set_sp_dc_conflicts.extend(flag for value, flag in conflict_values if value is not None and value is not False)
-        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
+        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.predictive_polling, "--predictive-polling"), (args.start_jitter, "--start-jitter"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
         set_sp_dc_conflicts.extend(flag for value, flag in boolean_conflicts if value is not None)
         if set_sp_dc_conflicts:
             parser.error("--set-sp-dc cannot be combined with " + ", ".join(set_sp_dc_conflicts))
@@ -9868,6 +11944,10 @@ def main():
             (args.send_test_email, "--send-test-email"),
             (args.send_test_webhook, "--send-test-webhook"),
             (args.list_friends, "--list-friends"),
+            (args.targets, "--targets"),
+            (args.targets_file, "--targets-file"),
+            (args.buddylist_broker, "--buddylist-broker"),
+            (args.buddylist_snapshot, "--buddylist-snapshot"),
             (args.token_source, "--token-source"),
             (args.spotify_dc_cookie, "--spotify-dc-cookie"),
             (args.login_request_body_file, "--login-request-body-file"),
@@ -9876,6 +11956,8 @@ def main():
             (args.webhook_url, "--webhook-url"),
             (args.webhook_provider, "--webhook-provider"),
             (args.check_interval, "--check-interval"),
+            (args.idle_backoff, "--idle-backoff"),
+            (args.poll_jitter, "--poll-jitter"),
             (args.offline_timer, "--offline-timer"),
             (args.disappeared_timer, "--disappeared-timer"),
             (args.monitor_mode, "--monitor-mode"),
@@ -9903,7 +11985,7 @@ def main():
             (args.force, "--force"),
         )
         set_webhook_conflicts.extend(flag for value, flag in conflict_values if value is not None and value is not False)
-        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
+        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.predictive_polling, "--predictive-polling"), (args.start_jitter, "--start-jitter"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
         set_webhook_conflicts.extend(flag for value, flag in boolean_conflicts if value is not None)
         if set_webhook_conflicts:
             parser.error("--set-webhook-url cannot be combined with " + ", ".join(set_webhook_conflicts))
@@ -9929,6 +12011,10 @@ def main():
             (args.send_test_email, "--send-test-email"),
             (args.send_test_webhook, "--send-test-webhook"),
             (args.list_friends, "--list-friends"),
+            (args.targets, "--targets"),
+            (args.targets_file, "--targets-file"),
+            (args.buddylist_broker, "--buddylist-broker"),
+            (args.buddylist_snapshot, "--buddylist-snapshot"),
             (args.token_source, "--token-source"),
             (args.spotify_dc_cookie, "--spotify-dc-cookie"),
             (args.login_request_body_file, "--login-request-body-file"),
@@ -9937,6 +12023,8 @@ def main():
             (args.webhook_url, "--webhook-url"),
             (args.webhook_provider, "--webhook-provider"),
             (args.check_interval, "--check-interval"),
+            (args.idle_backoff, "--idle-backoff"),
+            (args.poll_jitter, "--poll-jitter"),
             (args.offline_timer, "--offline-timer"),
             (args.disappeared_timer, "--disappeared-timer"),
             (args.monitor_mode, "--monitor-mode"),
@@ -9960,7 +12048,7 @@ def main():
             (args.truncate, "--truncate"),
         )
         setup_conflicts.extend(flag for value, flag in conflict_values if value is not None and value is not False)
-        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
+        boolean_conflicts = ((args.notify_active, "--notify-active"), (args.notify_inactive, "--notify-inactive"), (args.notify_track, "--notify-track"), (args.notify_song_changes, "--notify-song-changes"), (args.notify_loop, "--notify-loop"), (args.notify_errors, "--no-error-notify"), (args.webhook_enabled, "--webhook/--no-webhook"), (args.webhook_active, "--webhook-active"), (args.webhook_inactive, "--webhook-inactive"), (args.webhook_track, "--webhook-track"), (args.webhook_song_changes, "--webhook-song-changes"), (args.webhook_loop, "--webhook-loop"), (args.webhook_errors, "--webhook-errors/--no-webhook-error-notify"), (args.track_in_spotify, "--track-in-spotify"), (args.predictive_polling, "--predictive-polling"), (args.start_jitter, "--start-jitter"), (args.disable_logging, "--disable-logging"), (args.debug_mode, "--debug"), (args.verbose_mode, "--verbose"))
         setup_conflicts.extend(flag for value, flag in boolean_conflicts if value is not None)
         import_conflicts = ((args.browser, "--browser"), (args.browser_profile, "--browser-profile"), (args.cookie_file, "--cookie-file"), (args.force, "--force"))
         setup_conflicts.extend(flag for value, flag in import_conflicts if value is not None and value is not False)
@@ -10059,20 +12147,42 @@ def main():
         sys.exit(0)
 
     target_user_id = scrobble_health_username or None
-    if not args.list_friends and not args.send_test_email and not args.send_test_webhook and not args.doctor and not args.authorize_scrobble_health:
+    target_user_ids = []
+    if not args.list_friends and not args.send_test_email and not args.send_test_webhook and not args.doctor and not args.authorize_scrobble_health and not args.buddylist_broker:
         if scrobble_health_mode:
             if args.user_id is not None:
                 parser.error("The positional Spotify target cannot be used in scrobble_health mode")
+            if args.targets or args.targets_file:
+                parser.error("--targets and --targets-file cannot be used in scrobble_health mode")
             if not scrobble_health_username:
                 parser.error("Scrobble health mode needs a Last.fm username or configured LASTFM_USERNAME")
             if any(character.isspace() or ord(character) < 32 for character in scrobble_health_username):
                 parser.error("The Last.fm username cannot contain whitespace or control characters")
+        elif args.targets or args.targets_file:
+            raw_targets = ([args.user_id] if args.user_id is not None else []) + list(args.targets or [])
+            if args.targets_file:
+                try:
+                    raw_targets += load_targets_file(os.path.expanduser(args.targets_file))
+                except Exception as e:
+                    print_recovery_error(e, "file_read", detail=f"Targets file '{args.targets_file}' cannot be opened: {e}")
+                    sys.exit(1)
+            try:
+                for raw_target in raw_targets:
+                    normalized_target = normalize_spotify_user_id(raw_target)
+                    if normalized_target not in target_user_ids:
+                        target_user_ids.append(normalized_target)
+            except ValueError as exc:
+                print_recovery_error(exc, "target_invalid")
+                sys.exit(1)
+            target_user_id = target_user_ids[0] if target_user_ids else None
         else:
             try:
                 target_user_id = resolve_target_user_id(args.user_id, TARGET_USER_URI_ID)
             except ValueError as exc:
                 print_recovery_error(exc, "target_invalid")
                 sys.exit(1)
+            if target_user_id:
+                target_user_ids = [target_user_id]
 
     if args.debug_mode is not None:
         DEBUG_MODE = args.debug_mode
@@ -10191,6 +12301,18 @@ def main():
 
     if args.check_interval is not None:
         SPOTIFY_CHECK_INTERVAL = args.check_interval
+    if args.predictive_polling is True:
+        PREDICTIVE_POLLING = True
+    if args.idle_backoff is not None:
+        if args.idle_backoff < 0:
+            parser.error("--idle-backoff must be zero or greater")
+        IDLE_BACKOFF_MAX_INTERVAL = args.idle_backoff
+    if args.start_jitter is True:
+        START_JITTER = True
+    if args.poll_jitter is not None:
+        if not 0 <= args.poll_jitter <= 0.5:
+            parser.error("--poll-jitter must be between 0 and 0.5")
+        POLL_JITTER = args.poll_jitter
     if args.offline_timer is not None:
         SPOTIFY_INACTIVITY_CHECK = args.offline_timer
     if args.disappeared_timer is not None:
@@ -10447,14 +12569,31 @@ def main():
     if SP_APP_TOKENS_FILE:
         SP_APP_TOKENS_FILE = os.path.expanduser(SP_APP_TOKENS_FILE)
 
+    if METADATA_STORE_FILE:
+        METADATA_STORE_FILE = os.path.expanduser(METADATA_STORE_FILE)
+
+    if TOKEN_CACHE_FILE and not scrobble_health_mode:
+        SP_TOKEN_CACHE_PATH = os.path.expanduser(TOKEN_CACHE_FILE)
+        restored_tokens = load_spotify_token_cache(SP_TOKEN_CACHE_PATH)
+        if restored_tokens:
+            debug_print(f"Restored {', '.join(restored_tokens)} from token cache file '{SP_TOKEN_CACHE_PATH}'")
+
+    if QUERY_HASH_CACHE_FILE and not scrobble_health_mode:
+        SP_WEB_QUERY_HASH_CACHE_PATH = os.path.expanduser(QUERY_HASH_CACHE_FILE)
+        restored_hashes = load_web_query_hash_cache(SP_WEB_QUERY_HASH_CACHE_PATH)
+        if restored_hashes:
+            debug_print(f"Restored persisted-query hashes for {', '.join(sorted(restored_hashes))} from '{SP_WEB_QUERY_HASH_CACHE_PATH}'")
+
+    if BACKEND_STATE_FILE and not scrobble_health_mode:
+        SP_METADATA_BACKEND_STATE_PATH = os.path.expanduser(BACKEND_STATE_FILE)
+        web_routed_kinds = load_metadata_backend_state(SP_METADATA_BACKEND_STATE_PATH)
+        if web_routed_kinds:
+            debug_print(f"Restored web-player backend preference for {', '.join(web_routed_kinds)} metadata from '{SP_METADATA_BACKEND_STATE_PATH}'")
+
     if args.list_friends:
         print("* Listing Spotify friends ...\n")
         try:
-            if TOKEN_SOURCE == "client":
-                sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
-            else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            sp_friends = spotify_get_friends_json(sp_accessToken)
+            sp_accessToken, sp_friends = spotify_request_with_access_token(spotify_get_friends_json)
             spotify_list_friends(sp_friends, sp_accessToken)
             print("─" * HORIZONTAL_LINE)
         except Exception as e:
@@ -10463,7 +12602,17 @@ def main():
             sys.exit(1)
         sys.exit(0)
 
-    if not target_user_id:
+    if args.buddylist_snapshot is not None:
+        BUDDYLIST_SNAPSHOT_FILE = args.buddylist_snapshot
+    if BUDDYLIST_SNAPSHOT_FILE:
+        BUDDYLIST_SNAPSHOT_FILE = os.path.expanduser(BUDDYLIST_SNAPSHOT_FILE)
+
+    if args.buddylist_broker:
+        if scrobble_health_mode:
+            parser.error("--buddylist-broker cannot be used in scrobble_health mode")
+        if not BUDDYLIST_SNAPSHOT_FILE:
+            parser.error("--buddylist-broker needs a snapshot path from --buddylist-snapshot or BUDDYLIST_SNAPSHOT_FILE")
+    elif not target_user_id:
         print_recovery_error(context="target_missing")
         sys.exit(1)
 
@@ -10499,16 +12648,26 @@ def main():
         if CSV_FILE:
             CSV_FILE = os.path.expanduser(CSV_FILE)
 
+    multi_target_mode = len(target_user_ids) > 1
+
     if CSV_FILE:
-        try:
-            with open(CSV_FILE, 'a', newline='', buffering=1, encoding="utf-8") as _:
-                pass
-        except Exception as e:
-            print_recovery_error(e, "file_write", detail=f"CSV destination '{CSV_FILE}' cannot be opened for writing: {e}")
-            sys.exit(1)
+        csv_destinations = [build_target_csv_file_name(CSV_FILE, user_uri_id) for user_uri_id in target_user_ids] if multi_target_mode else [CSV_FILE]
+        for csv_destination in csv_destinations:
+            try:
+                with open(csv_destination, 'a', newline='', buffering=1, encoding="utf-8") as _:
+                    pass
+            except Exception as e:
+                print_recovery_error(e, "file_write", detail=f"CSV destination '{csv_destination}' cannot be opened for writing: {e}")
+                sys.exit(1)
+
+    if multi_target_mode and FLAG_FILE:
+        parser.error("A flag file cannot be used when monitoring several targets in one process")
 
     if not FILE_SUFFIX:
-        FILE_SUFFIX = resolve_log_file_suffix(target_user_id, scrobble_health_username if scrobble_health_mode else None)
+        if args.buddylist_broker:
+            FILE_SUFFIX = "buddylist_broker"
+        else:
+            FILE_SUFFIX = "multi" if multi_target_mode else resolve_log_file_suffix(target_user_id, scrobble_health_username if scrobble_health_mode else None)
 
     if args.disable_logging is True:
         DISABLE_LOGGING = True
@@ -10563,7 +12722,13 @@ def main():
         ERROR_NOTIFICATION = False
         SCROBBLE_HEALTH_NOTIFICATION = False
 
-    startup_rows = build_startup_summary(target_user_id, cfg_path, env_path, FINAL_LOG_PATH)
+    if args.buddylist_broker:
+        summary_target = f"None (buddy-list broker publishing to {BUDDYLIST_SNAPSHOT_FILE})"
+    elif multi_target_mode:
+        summary_target = ", ".join(target_user_ids)
+    else:
+        summary_target = target_user_id or ""
+    startup_rows = build_startup_summary(summary_target, cfg_path, env_path, FINAL_LOG_PATH)
     emit_startup_summary(startup_rows, show_full=bool(VERBOSE_MODE or DEBUG_MODE))
     playback_warning = container_playback_warning()
     if playback_warning is not None:
@@ -10587,8 +12752,17 @@ def main():
         signal.signal(signal.SIGABRT, decrease_inactivity_check_signal_handler)
         signal.signal(signal.SIGHUP, reload_secrets_signal_handler)
 
+    # Recent-play health checks use their own OAuth token, so only buddy-list monitoring renews tokens in the background
+    # Broker subscribers read the snapshot without a token and fetch one on demand only while the snapshot is stale
+    if not scrobble_health_mode and not (BUDDYLIST_SNAPSHOT_FILE and not args.buddylist_broker):
+        start_token_refresher()
+
     if scrobble_health_mode:
         spotify_monitor_scrobble_health(scrobble_health_username, SCROBBLE_HEALTH_STATE_FILE)
+    elif args.buddylist_broker:
+        run_monitor_steps(spotify_buddylist_broker_steps(BUDDYLIST_SNAPSHOT_FILE), monitor_tick_scheduler(BUDDYLIST_SNAPSHOT_FILE))
+    elif multi_target_mode:
+        spotify_monitor_friend_uris(target_user_ids, sp_tracks, CSV_FILE)
     else:
         spotify_monitor_friend_uri(target_user_id, sp_tracks, CSV_FILE)
 
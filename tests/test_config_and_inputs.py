@@ -378,3 +378,18 @@ def test_successful_config_load_updates_namespace():
         assert monitor.load_config_file(config_path, namespace) is True
     assert namespace["TARGET_USER_URI_ID"] == "configured-user"
     assert namespace["SPOTIFY_CHECK_INTERVAL"] == 45
+
+
+# Verifies --targets-file and --targets merge into one normalized multi-target run with a shared log suffix
+def test_targets_file_starts_multi_target_monitoring():
+    with make_temp_directory() as directory_name:
+        directory = Path(directory_name)
+        config_path = directory / "spotify_monitor.conf"
+        config_path.write_text('SP_DC_COOKIE = "test-cookie"\nDOTENV_FILE = "none"\nDISABLE_LOGGING = True\n', encoding="utf-8")
+        targets_path = directory / "targets.txt"
+        targets_path.write_text("# friends\nspotify:user:first.user\n\nhttps://open.spotify.com/user/second.user?si=x\nfirst.user\n", encoding="utf-8")
+        setup = "runtime['check_internet'] = lambda: True; runtime['spotify_monitor_friend_uris'] = lambda user_ids, tracks, csv_file: print(f'MONITOR_TARGETS={user_ids}\\nFILE_SUFFIX={runtime[\"FILE_SUFFIX\"]}');"
+        result = run_cli(["--config-file", str(config_path), "--targets", "third.user", "--targets-file", str(targets_path)], setup)
+    assert result.returncode == 0, result.stderr
+    assert "MONITOR_TARGETS=['third.user', 'first.user', 'second.user']" in result.stdout
+    assert "FILE_SUFFIX=multi" in result.stdout
@@ -3,11 +3,12 @@
 import json
 import socketserver
 import threading
+import time
 from collections.abc import Iterator
 from email import policy
 from email.parser import BytesParser
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Any
+from typing import Any, Optional
 
 import pytest
 
@@ -175,3 +176,267 @@ def test_email_delivery_over_loopback(monkeypatch: pytest.MonkeyPatch, smtp_serv
     assert plain_body.get_content().strip() == "Plain body"
     assert html_body.get_content().strip() == "<strong>HTML body</strong>"
     assert any(command.startswith("AUTH PLAIN ") for command in handler.commands)
+
+
+# Answers every GET over a keep-alive HTTP/1.1 connection
+class KeepAliveRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Returns one small JSON body with an explicit length so the connection stays open
+    def do_GET(self) -> None:
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Suppresses default request logging during tests
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+# Verifies the retrying session and single-shot sessions share one keep-alive connection per host
+@pytest.mark.integration
+def test_spotify_call_paths_share_pooled_connections():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/ping"
+    try:
+        before = {host: (sent, opened) for host, sent, opened in monitor.spotify_transport_stats()}.get("127.0.0.1", (0, 0))
+        monitor.SESSION.get(url, timeout=5)
+        monitor.spotify_pooled_session().get(url, timeout=5)
+        monitor.spotify_pooled_session().get(url, headers={"Authorization": "Bearer test"}, timeout=5)
+        after = {host: (sent, opened) for host, sent, opened in monitor.spotify_transport_stats()}["127.0.0.1"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert (after[0] - before[0], after[1] - before[1]) == (3, 1)
+    assert "127.0.0.1" in monitor.format_spotify_transport_stats()
+
+
+# Sets a cookie on every keep-alive response, as Spotify's web endpoints do
+class CookieSettingRequestHandler(KeepAliveRequestHandler):
+    # Adds the cookie header before the response headers are closed
+    def end_headers(self) -> None:
+        self.send_header("Set-Cookie", "sp_t=test; Path=/")
+        super().end_headers()
+
+
+# Verifies single-shot requests reuse one session whose jar never keeps cookies from earlier callers
+@pytest.mark.integration
+def test_single_shot_session_is_shared_without_keeping_cookies():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CookieSettingRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = monitor.spotify_pooled_session().get(f"http://127.0.0.1:{server.server_port}/ping", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert response.headers["Set-Cookie"] == "sp_t=test; Path=/"
+    assert monitor.spotify_pooled_session() is monitor.spotify_pooled_session()
+    assert len(monitor.spotify_pooled_session().cookies) == 0
+
+
+# Answers every GET only after a delay longer than the request budgets used below
+class SlowRequestHandler(KeepAliveRequestHandler):
+
+    # Delays the response so the caller's request deadline passes first
+    def do_GET(self) -> None:
+        time.sleep(2)
+        super().do_GET()
+
+
+# Verifies a request deadline cuts a slow request short on a worker thread, where signal-based timeouts cannot run
+@pytest.mark.integration
+def test_request_deadline_bounds_request_on_worker_thread():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    outcome: dict[str, Any] = {}
+
+    # Sends one request with a long per-request timeout under a short total budget
+    def request_with_budget() -> None:
+        started = time.monotonic()
+        try:
+            with monitor.request_deadline(0.3):
+                monitor.spotify_pooled_session().get(f"http://127.0.0.1:{server.server_port}/slow", timeout=10)
+        except Exception as error:
+            outcome["error"] = error
+        outcome["elapsed"] = time.monotonic() - started
+
+    try:
+        worker = threading.Thread(target=request_with_budget)
+        worker.start()
+        worker.join(timeout=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert isinstance(outcome["error"], monitor.TimeoutException)
+    assert outcome["elapsed"] < 1.5
+
+
+# Verifies a request deadline also bounds a separate connect and read timeout whose read part is unlimited
+@pytest.mark.integration
+def test_request_deadline_bounds_split_timeout():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(monitor.TimeoutException):
+            with monitor.request_deadline(0.3):
+                monitor.spotify_pooled_session().get(f"http://127.0.0.1:{server.server_port}/slow", timeout=(10, None))
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert time.monotonic() - started < 1.5
+
+
+# Answers every GET with HTTP 429 and a Retry-After header, counting the requests that reached it
+class RateLimitedRequestHandler(KeepAliveRequestHandler):
+    request_count = 0
+
+    # Rejects the request as rate limited
+    def do_GET(self) -> None:
+        type(self).request_count += 1
+        self.send_response(429)
+        self.send_header("Retry-After", "7")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+# Verifies the token bucket lets a burst through then spaces requests at the sustained rate
+def test_rate_limiter_spaces_requests_after_burst(monkeypatch: pytest.MonkeyPatch):
+    clock = [100.0]
+    sleeps: list[float] = []
+    monkeypatch.setattr(monitor, "SP_RATE_LIMIT_BUCKETS", {})
+    monkeypatch.setattr(monitor, "SPOTIFY_RATE_LIMIT_RATE", 2.0)
+    monkeypatch.setattr(monitor, "SPOTIFY_RATE_LIMIT_BURST", 2)
+    monkeypatch.setattr(monitor.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(monitor.time, "sleep", lambda seconds: sleeps.append(seconds) or clock.__setitem__(0, clock[0] + seconds))
+    for _ in range(3):
+        monitor.spotify_rate_limit_acquire("api.spotify.com")
+    assert sleeps == [0.5]
+    assert monitor.format_spotify_rate_limits() == "api.spotify.com 0.0/2 tokens"
+
+
+# Verifies a 429 from one request pauses later requests to that host before they reach the network
+@pytest.mark.integration
+def test_rate_limit_response_pauses_host(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(monitor, "SP_RATE_LIMIT_BUCKETS", {})
+    RateLimitedRequestHandler.request_count = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RateLimitedRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/limited"
+    try:
+        assert monitor.spotify_pooled_session().get(url, timeout=5).status_code == 429
+        with monitor.request_deadline(2):
+            with pytest.raises(monitor.SpotifyRateLimitedError):
+                monitor.spotify_pooled_session().get(url, timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert RateLimitedRequestHandler.request_count == 1
+    assert "127.0.0.1 1.0/10 tokens, paused" in monitor.format_spotify_rate_limits()
+    assert monitor.classify_recovery_error(monitor.SpotifyRateLimitedError("Spotify rate limit on api.spotify.com: requests paused for another 7 seconds"), "runtime").code == "spotify.rate_limited"
+
+
+# Answers every GET with the configured status, counting the requests that reached it
+class ConfiguredStatusRequestHandler(KeepAliveRequestHandler):
+    status = 503
+    retry_after: Optional[int] = None
+    request_count = 0
+
+    # Returns the configured status and Retry-After header with an empty body
+    def do_GET(self) -> None:
+        type(self).request_count += 1
+        self.send_response(type(self).status)
+        if type(self).retry_after is not None:
+            self.send_header("Retry-After", str(type(self).retry_after))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+# Verifies an endpoint family's circuit opens after repeated 5xx responses, fails fast, then closes after one successful probe
+@pytest.mark.integration
+def test_circuit_breaker_opens_fails_fast_and_recovers(monkeypatch: pytest.MonkeyPatch):
+    ConfiguredStatusRequestHandler.status = 503
+    ConfiguredStatusRequestHandler.retry_after = None
+    ConfiguredStatusRequestHandler.request_count = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ConfiguredStatusRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/presence-view/v1/buddylist"
+    monkeypatch.setattr(monitor, "SPOTIFY_ENDPOINT_FAMILIES", (("buddylist", f"http://127.0.0.1:{server.server_port}/presence-view/"),))
+    monkeypatch.setattr(monitor, "SP_CIRCUIT_BREAKERS", {})
+    monkeypatch.setattr(monitor, "SP_RATE_LIMIT_BUCKETS", {})
+    monkeypatch.setattr(monitor, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 3)
+    try:
+        for _ in range(3):
+            assert monitor.spotify_pooled_session().get(url, timeout=5).status_code == 503
+        with pytest.raises(monitor.SpotifyCircuitOpenError) as caught:
+            monitor.spotify_pooled_session().get(url, timeout=5)
+        assert ConfiguredStatusRequestHandler.request_count == 3
+        assert monitor.classify_recovery_error(caught.value, "cookie_auth").code == "spotify.unavailable"
+        assert monitor.format_spotify_circuit_breakers() == "buddylist open (3 failures)"
+        monkeypatch.setitem(monitor.SP_CIRCUIT_BREAKERS["buddylist"], "opened_at", 0.0)
+        ConfiguredStatusRequestHandler.status = 200
+        assert monitor.SESSION.get(url, timeout=5).status_code == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert ConfiguredStatusRequestHandler.request_count == 4
+    assert monitor.format_spotify_circuit_breakers() == "buddylist closed"
+
+
+# Verifies a failed half-open probe reopens the circuit for a doubled cool-down while other callers keep failing fast
+def test_circuit_breaker_failed_probe_doubles_cool_down(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(monitor, "SP_CIRCUIT_BREAKERS", {})
+    monkeypatch.setattr(monitor, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 1)
+    monitor.spotify_circuit_record("token", False, ("network.unavailable", "Connection refused"))
+    monitor.SP_CIRCUIT_BREAKERS["token"]["opened_at"] -= monitor.CIRCUIT_BREAKER_OPEN_SECONDS
+    assert monitor.spotify_circuit_allow("token") is True
+    with pytest.raises(monitor.SpotifyCircuitOpenError):
+        monitor.spotify_circuit_allow("token")
+    monitor.spotify_circuit_record("token", True, ("network.unavailable", "Connection refused"))
+    assert monitor.SP_CIRCUIT_BREAKERS["token"]["state"] == "open"
+    assert monitor.SP_CIRCUIT_BREAKERS["token"]["open_seconds"] == monitor.CIRCUIT_BREAKER_OPEN_SECONDS * 2
+    assert monitor.spotify_circuit_allow(None) is False
+
+
+# Verifies a 429 inside deferred_request_retries() is handed back with its Retry-After instead of being retried in the adapter
+@pytest.mark.integration
+def test_deferred_request_retries_hand_rate_limits_back(monkeypatch: pytest.MonkeyPatch):
+    ConfiguredStatusRequestHandler.status = 429
+    ConfiguredStatusRequestHandler.retry_after = 7
+    ConfiguredStatusRequestHandler.request_count = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ConfiguredStatusRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/presence-view/v1/buddylist"
+    monkeypatch.setattr(monitor, "SP_RATE_LIMIT_BUCKETS", {})
+    monkeypatch.setattr(monitor.time, "sleep", lambda seconds: pytest.fail("the adapter slept before retrying"))
+    try:
+        with monitor.deferred_request_retries(), pytest.raises(monitor.SpotifyRetryDeferredError) as caught:
+            monitor.SESSION.get(url, timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert ConfiguredStatusRequestHandler.request_count == 1
+    assert (caught.value.status_code, caught.value.retry_after, caught.value.url) == (429, 7, url)
+    assert monitor.classify_recovery_error(caught.value, "cookie_auth").code == "spotify.rate_limited"
+    assert "paused" in monitor.format_spotify_rate_limits("127.0.0.1")
+    assert not monitor.request_retries_deferred()
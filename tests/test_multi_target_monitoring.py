@@ -0,0 +1,261 @@
+"""Regression tests for monitoring several friends from one buddy-list poll."""
+
+import io
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pytest
+
+import spotify_monitor as monitor
+
+
+# Stops the multi-target driver after a fixed number of scheduler sleeps
+class StopMonitoring(Exception):
+    pass
+
+
+# Verifies targets checked during one tick share a single buddy-list request
+def test_shared_poll_fetches_once_per_tick():
+    calls = []
+    poll = monitor.SharedBuddylistPoll()
+    with patch.object(monitor, "spotify_get_friends_json", side_effect=lambda token: calls.append(token) or {"friends": []}):
+        poll.start_tick()
+        assert poll.get("token") == {"friends": []}
+        assert poll.get("token") == {"friends": []}
+        poll.start_tick()
+        poll.get("token")
+    assert calls == ["token", "token"]
+    assert poll.fetch_count == 2
+
+
+# Verifies one failed fetch is reported to every target of the tick without retrying upstream
+def test_shared_poll_reuses_fetch_error_within_tick():
+    poll = monitor.SharedBuddylistPoll()
+    with patch.object(monitor, "spotify_get_friends_json", side_effect=RuntimeError("boom")) as fetch:
+        poll.start_tick()
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                poll.get("token")
+    assert fetch.call_count == 1
+
+
+# Verifies the driver fans one buddy-list fetch per tick out to every target state machine
+def test_multi_target_driver_polls_buddylist_once_per_tick():
+    seen = []
+
+    # Emulates one target's state machine reading the shared buddy list each check
+    def fake_steps(user_uri_id, tracks, csv_file_name, friends_source=None):
+        assert friends_source is not None
+        while True:
+            seen.append((user_uri_id, csv_file_name, friends_source("token")["friends"][0]))
+            yield 30
+
+    sleeps = []
+    clock = [1000.0]
+
+    # Records scheduler waits, advances the fake clock and stops after three ticks
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise StopMonitoring()
+        clock[0] += seconds
+
+    fetches = []
+    with patch.object(monitor, "spotify_monitor_friend_uri_steps", fake_steps), patch.object(monitor, "spotify_get_friends_json", side_effect=lambda token: fetches.append(token) or {"friends": [len(fetches)]}), patch.object(monitor.time, "sleep", fake_sleep), patch.object(monitor.time, "monotonic", lambda: clock[0]):
+        with pytest.raises(StopMonitoring):
+            monitor.spotify_monitor_friend_uris(["alice", "bob", "carol"], [], "tracks.csv")
+    assert len(fetches) == 3
+    assert [entry[0] for entry in seen[:3]] == ["alice", "bob", "carol"]
+    assert {entry[2] for entry in seen[:3]} == {1}
+    assert seen[0][1] == "tracks_alice.csv"
+    assert sleeps == [30, 30, 30]
+
+
+# Verifies each target's status lines are prefixed with its user URI ID while blank and separator lines keep the layout
+def test_multi_target_output_is_attributed_to_targets():
+
+    # Prints one status block per check, the way the real state machine does
+    def fake_steps(user_uri_id, tracks, csv_file_name, friends_source=None):
+        while True:
+            print("─" * 5)
+            print("\n*** Friend got INACTIVE after listening to music for 5 minutes")
+            print("Liveness check, timestamp:\t", end="")
+            print("Mon 13 Jul 2026, 17:00:00")
+            yield 30
+
+    # Stops the driver at its first wait
+    def fake_sleep(seconds):
+        raise StopMonitoring()
+
+    output = io.StringIO()
+    with patch.object(monitor, "spotify_monitor_friend_uri_steps", fake_steps), patch.object(monitor.time, "sleep", fake_sleep), patch.object(monitor.time, "monotonic", lambda: 1000.0), redirect_stdout(output):
+        with pytest.raises(StopMonitoring):
+            monitor.spotify_monitor_friend_uris(["alice", "bob"], [], "")
+    block = "─────\n\n[{0}] *** Friend got INACTIVE after listening to music for 5 minutes\n[{0}] Liveness check, timestamp:\tMon 13 Jul 2026, 17:00:00\n"
+    assert output.getvalue().startswith(block.format("alice") + block.format("bob"))
+
+
+# Verifies start and per-check jitter move the whole multi-target tick, so targets keep sharing one buddy-list fetch per interval
+def test_multi_target_jitter_keeps_one_fetch_per_interval():
+    checks = []
+
+    # Emulates one target's state machine reading the shared buddy list every 30 seconds
+    def fake_steps(user_uri_id, tracks, csv_file_name, friends_source=None):
+        assert friends_source is not None
+        while True:
+            friends_source("token")
+            checks.append(user_uri_id)
+            yield 30
+
+    clock = [0.0]
+    sleeps = []
+
+    # Advances the fake clock and stops after one simulated hour
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if clock[0] + seconds > 3600:
+            raise StopMonitoring()
+        clock[0] += seconds
+
+    polls = []
+    shared_poll_class = monitor.SharedBuddylistPoll
+
+    # Keeps the driver's shared poll so its fetch count can be inspected
+    def make_poll(**kwargs):
+        polls.append(shared_poll_class(**kwargs))
+        return polls[-1]
+
+    with patch.object(monitor, "START_JITTER", True), patch.object(monitor, "POLL_JITTER", 0.2), patch.object(monitor, "SharedBuddylistPoll", make_poll), patch.object(monitor, "spotify_monitor_friend_uri_steps", fake_steps), patch.object(monitor, "spotify_get_friends_json", return_value={"friends": []}), patch.object(monitor.time, "sleep", fake_sleep), patch.object(monitor.time, "monotonic", lambda: clock[0]):
+        with pytest.raises(StopMonitoring):
+            monitor.spotify_monitor_friend_uris(["alice", "bob", "carol"], [], "tracks.csv")
+    fetch_count = polls[0].fetch_count
+    assert 0 < sleeps[0] < 30
+    assert len(checks) == 3 * fetch_count
+    assert 115 <= fetch_count <= 121
+    assert len(set(round(gap, 6) for gap in sleeps[1:])) > 1
+
+
+# Verifies the per-tick jitter never wakes a target before the Retry-After delay of its deferred retry
+def test_multi_target_jitter_never_shortens_deferred_retry():
+    checks = []
+
+    # Emulates one target rate limited on every check while the other polls normally
+    def fake_steps(user_uri_id, tracks, csv_file_name, friends_source=None):
+        while True:
+            checks.append((user_uri_id, clock[0]))
+            yield monitor.DeferredRetry(60, "HTTP 429") if user_uri_id == "alice" else 300
+
+    clock = [0.0]
+
+    # Advances the fake clock and stops after one simulated hour
+    def fake_sleep(seconds):
+        if clock[0] + seconds > 3600:
+            raise StopMonitoring()
+        clock[0] += seconds
+
+    with patch.object(monitor, "POLL_JITTER", 0.5), patch.object(monitor, "spotify_monitor_friend_uri_steps", fake_steps), patch.object(monitor.time, "sleep", fake_sleep), patch.object(monitor.time, "monotonic", lambda: clock[0]):
+        with pytest.raises(StopMonitoring):
+            monitor.spotify_monitor_friend_uris(["alice", "bob"], [], "")
+    retries = [at for user_uri_id, at in checks if user_uri_id == "alice"]
+    assert len(retries) > 10
+    assert min(later - earlier for earlier, later in zip(retries, retries[1:])) > 60 - 1e-6
+
+
+# Verifies per-target CSV names stay stable and filesystem safe
+def test_target_csv_file_name_is_derived_per_target():
+    assert monitor.build_target_csv_file_name("out/tracks.csv", "user.one") == "out/tracks_user.one.csv"
+    assert monitor.build_target_csv_file_name("tracks", "a/b") == "tracks_a_b.csv"
+    assert monitor.build_target_csv_file_name("", "user") == ""
+
+
+# Verifies a published snapshot round-trips with owner-only permissions and expires after its maximum age
+def test_buddylist_snapshot_round_trip_and_expiry(tmp_path):
+    snapshot_path = tmp_path / "buddylist.json"
+    monitor.publish_buddylist_snapshot(snapshot_path, {"friends": [{"user": {"uri": "spotify:user:a"}}]}, fetched_at=1000.0)
+    assert snapshot_path.stat().st_mode & 0o777 == 0o600
+    assert monitor.load_buddylist_snapshot(snapshot_path, 90, now=1050.0) == ({"friends": [{"user": {"uri": "spotify:user:a"}}]}, 1000.0)
+    assert monitor.load_buddylist_snapshot(snapshot_path, 90, now=1091.0) is None
+    snapshot_path.write_text("{broken", encoding="utf-8")
+    assert monitor.load_buddylist_snapshot(snapshot_path, 90) is None
+
+
+# Verifies subscribed monitors read a fresh snapshot and fall back to Spotify only when it is stale
+def test_subscriber_prefers_fresh_snapshot_over_spotify(tmp_path):
+    snapshot_path = tmp_path / "buddylist.json"
+    monitor.publish_buddylist_snapshot(snapshot_path, {"friends": ["from-broker"]})
+    with patch.object(monitor, "BUDDYLIST_SNAPSHOT_FILE", str(snapshot_path)), patch.object(monitor, "BUDDYLIST_SNAPSHOT_MAX_AGE", 90), patch.object(monitor, "BUDDYLIST_SNAPSHOT_STALE", False), patch.object(monitor, "spotify_get_friends_json", return_value={"friends": ["from-spotify"]}) as fetch:
+        assert monitor.spotify_get_friends_json_via_broker("token") == {"friends": ["from-broker"]}
+        assert fetch.call_count == 0
+        monitor.publish_buddylist_snapshot(snapshot_path, {"friends": ["old"]}, fetched_at=1.0)
+        assert monitor.spotify_get_friends_json_via_broker("token") == {"friends": ["from-spotify"]}
+        assert fetch.call_count == 1
+
+
+# Verifies the broker publishes every successful poll and waits the regular check interval
+def test_broker_publishes_each_poll(tmp_path):
+    snapshot_path = tmp_path / "buddylist.json"
+    with patch.object(monitor, "TOKEN_SOURCE", "cookie"), patch.object(monitor, "SPOTIFY_CHECK_INTERVAL", 30), patch.object(monitor, "spotify_get_access_token_from_sp_dc", return_value="token"), patch.object(monitor, "spotify_get_friends_json", return_value={"friends": []}):
+        steps = monitor.spotify_buddylist_broker_steps(str(snapshot_path))
+        assert next(steps) == 30
+    snapshot = monitor.load_buddylist_snapshot(snapshot_path, 0)
+    assert snapshot is not None
+    assert snapshot[0] == {"friends": []}
+
+
+# Verifies subscribers read a fresh snapshot without acquiring a token and ignore snapshots published for another sp_dc
+def test_subscriber_skips_token_and_rejects_other_accounts(tmp_path):
+    snapshot_path = tmp_path / "buddylist.json"
+    with patch.object(monitor, "TOKEN_SOURCE", "cookie"), patch.object(monitor, "SP_DC_COOKIE", "broker-cookie"):
+        monitor.publish_buddylist_snapshot(snapshot_path, {"friends": ["from-broker"]})
+    with patch.object(monitor, "BUDDYLIST_SNAPSHOT_FILE", str(snapshot_path)), patch.object(monitor, "BUDDYLIST_SNAPSHOT_MAX_AGE", 90), patch.object(monitor, "BUDDYLIST_SNAPSHOT_STALE", False), patch.object(monitor, "TOKEN_SOURCE", "cookie"), patch.object(monitor, "spotify_get_access_token", return_value="token") as get_token, patch.object(monitor, "spotify_get_friends_json", return_value={"friends": ["from-spotify"]}) as fetch:
+        with patch.object(monitor, "SP_DC_COOKIE", "broker-cookie"):
+            assert monitor.spotify_request_friends() == ("", {"friends": ["from-broker"]})
+        assert get_token.call_count == 0
+        with patch.object(monitor, "SP_DC_COOKIE", "other-cookie"):
+            assert monitor.spotify_request_friends() == ("token", {"friends": ["from-spotify"]})
+    assert fetch.call_count == 1
+
+
+# Builds one buddy-list friend entry for lookup tests
+def make_friend(user_id, timestamp, track_uri="spotify:track:abc"):
+    return {"timestamp": timestamp, "user": {"uri": f"spotify:user:{user_id}", "name": user_id.title()}, "track": {"uri": track_uri, "name": "Song", "artist": {"name": "Artist"}, "album": {"name": "Album", "uri": "spotify:album:x"}, "context": {"name": "Album", "uri": "spotify:album:x"}}}
+
+
+# Verifies a subscriber whose fresh snapshot lacks the target retries on the error interval when no token can be fetched
+def test_subscriber_snapshot_miss_survives_token_failure(tmp_path):
+    snapshot_path = tmp_path / "buddylist.json"
+    track_data = {"sp_album_image_url": "", "sp_artist_name": "Artist", "sp_track_name": "Song", "sp_album_name": "Album", "sp_track_duration": 180, "sp_track_url": "", "sp_artist_url": "", "sp_album_url": ""}
+    monitor.publish_buddylist_snapshot(snapshot_path, {"friends": [make_friend("other", 1700000000000)]})
+    with patch.object(monitor, "BUDDYLIST_SNAPSHOT_FILE", str(snapshot_path)), patch.object(monitor, "BUDDYLIST_SNAPSHOT_MAX_AGE", 90), patch.object(monitor, "BUDDYLIST_SNAPSHOT_STALE", False), patch.object(monitor, "SPOTIFY_ERROR_INTERVAL", 180), patch.object(monitor, "REMOVED_DISAPPEARED_COUNTER", 1), patch.object(monitor, "spotify_get_access_token", side_effect=monitor.req.ConnectionError("token endpoint down")) as get_token, patch.object(monitor, "spotify_get_track_change_metadata", return_value=(track_data, None)), patch.object(monitor, "is_user_removed", side_effect=AssertionError("profile checked without a token")), redirect_stdout(io.StringIO()):
+        steps = monitor.spotify_monitor_friend_uri_steps("target", [], "")
+        assert next(steps) == 180
+        monitor.publish_buddylist_snapshot(snapshot_path, {"friends": [make_friend("target", 1700000000000)]})
+        next(steps)
+        monitor.publish_buddylist_snapshot(snapshot_path, {"friends": [make_friend("other", 1700000000000)]})
+        assert next(steps) == 180
+    assert get_token.call_count == 2
+
+
+# Verifies the first shared poll resolves every target's current track in one batch and later polls do not repeat it
+def test_shared_poll_warms_target_tracks_once():
+    friends = {"friends": [make_friend("alice", 1700000000000, "spotify:track:a"), make_friend("bob", 1700000000000, "spotify:track:b"), make_friend("stranger", 1700000000000, "spotify:track:c")]}
+    poll = monitor.SharedBuddylistPoll(warm_up_targets=["alice", "bob"])
+    with patch.object(monitor, "TRACK_INFO_CACHE_TTL", 600), patch.object(monitor, "TRACK_INFO_CACHE_SIZE", 512), patch.object(monitor, "spotify_get_friends_json", return_value=friends), patch.object(monitor, "spotify_get_tracks_info", return_value={}) as batch:
+        for _ in range(2):
+            poll.start_tick()
+            assert poll.get("token") == friends
+    batch.assert_called_once_with("token", ["spotify:track:a", "spotify:track:b"])
+
+
+# Verifies lookups index each payload once and reuse the parse while a friend's fingerprint is unchanged
+def test_friend_lookup_uses_index_and_fingerprint_cache():
+    with patch.object(monitor, "SP_FRIENDS_INDEX_PAYLOAD", None), patch.object(monitor, "SP_FRIENDS_INDEX", {}), patch.object(monitor, "SP_FRIEND_INFO_CACHE", {}):
+        first_payload = {"friends": [make_friend("alice", 1700000000000), make_friend("bob", 1700000001000)]}
+        found, first = monitor.spotify_get_friend_info(first_payload, "bob")
+        assert found and first["sp_ts"] == 1700000001 and first["sp_track_uri_id"] == "abc"
+        assert monitor.spotify_get_friend_info(first_payload, "nobody") == (False, {})
+        with patch.object(monitor, "spotify_parse_friend_entry", side_effect=AssertionError("unchanged friend parsed again")):
+            assert monitor.spotify_get_friend_info({"friends": [make_friend("bob", 1700000001000)]}, "bob")[1] is first
+        _found, changed = monitor.spotify_get_friend_info({"friends": [make_friend("bob", 1700000099000, "spotify:track:def")]}, "bob")
+        assert changed["sp_ts"] == 1700000099 and changed["sp_track_uri_id"] == "def"
+        assert "alice" not in monitor.SP_FRIEND_INFO_CACHE
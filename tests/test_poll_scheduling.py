@@ -0,0 +1,220 @@
+"""Regression tests for choosing the wait before each monitoring check."""
+
+import pytest
+
+import spotify_monitor as monitor
+
+
+# Enables predictive polling with fixed intervals and no idle backoff for each test
+@pytest.fixture(autouse=True)
+def predictive_settings(monkeypatch):
+    monkeypatch.setattr(monitor, "PREDICTIVE_POLLING", True)
+    monkeypatch.setattr(monitor, "SPOTIFY_CHECK_INTERVAL", 30)
+    monkeypatch.setattr(monitor, "PREDICTIVE_POLL_WINDOW", 15)
+    monkeypatch.setattr(monitor, "PREDICTIVE_POLL_DENSE_INTERVAL", 5)
+    monkeypatch.setattr(monitor, "PREDICTIVE_POLL_MAX_INTERVAL", 120)
+    monkeypatch.setattr(monitor, "IDLE_BACKOFF_MAX_INTERVAL", 0)
+
+
+# Verifies checks are sparse mid-track, dense around the predicted end and capped at the longest allowed wait
+def test_predictive_interval_follows_track_end():
+    assert monitor.predict_check_interval(1000, 300, True, now=1010) == 120
+    assert monitor.predict_check_interval(1000, 300, True, now=1200) == 85
+    assert monitor.predict_check_interval(1000, 300, True, now=1290) == 5
+    assert monitor.predict_check_interval(1000, 300, True, now=1310) == 5
+    assert monitor.predict_check_interval(1000, 300, True, now=1280) == 5
+
+
+# Verifies unreliable predictions and inactive friends fall back to the base interval
+def test_predictive_interval_falls_back_to_base_interval(monkeypatch):
+    assert monitor.predict_check_interval(1000, 300, True, now=1400) == 30
+    assert monitor.predict_check_interval(1000, 300, True, now=600) == 30
+    assert monitor.predict_check_interval(1000, 300, False, now=1010) == 30
+    assert monitor.predict_check_interval(1000, 0, True, now=1010) == 30
+    monkeypatch.setattr(monitor, "PREDICTIVE_POLLING", False)
+    assert monitor.predict_check_interval(1000, 300, True, now=1290) == 30
+
+
+# Verifies a base interval shorter than the dense interval is never lengthened
+def test_predictive_interval_respects_short_base_interval(monkeypatch):
+    monkeypatch.setattr(monitor, "SPOTIFY_CHECK_INTERVAL", 2)
+    assert monitor.predict_check_interval(1000, 300, True, now=1290) == 2
+    assert monitor.predict_check_interval(1000, 300, True, now=1010) == 120
+
+
+# Verifies the wait for an inactive friend doubles per quiet check up to the ceiling
+def test_idle_backoff_grows_to_ceiling(monkeypatch):
+    monkeypatch.setattr(monitor, "IDLE_BACKOFF_MAX_INTERVAL", 300)
+    assert [monitor.idle_backoff_interval(checks) for checks in range(6)] == [30, 60, 120, 240, 300, 300]
+    assert monitor.idle_backoff_interval(10**6) == 300
+
+
+# Verifies idle backoff is disabled by default and never applies to an active friend
+def test_idle_backoff_only_applies_to_inactive_friends(monkeypatch):
+    assert monitor.next_check_interval(1000, 300, False, 4, now=5000) == 30
+    monkeypatch.setattr(monitor, "IDLE_BACKOFF_MAX_INTERVAL", 300)
+    assert monitor.next_check_interval(1000, 300, False, 4, now=5000) == 300
+    assert monitor.next_check_interval(1000, 300, False, 0, now=5000) == 30
+    assert monitor.next_check_interval(1000, 300, True, 4, now=1010) == 120
+
+
+# Verifies deadlines follow the fixed cadence whatever each check's work and sleep overshoot take
+def test_tick_scheduler_keeps_fixed_cadence():
+    scheduler = monitor.MonitorTickScheduler()
+    scheduler.record_start(100.0)
+    assert scheduler.schedule(30, 112.0) == 130.0
+    scheduler.record_start(130.5)
+    assert scheduler.schedule(30, 141.0) == 160.0
+    scheduler.record_start(160.0)
+    assert scheduler.ticks == 3
+    assert scheduler.overruns == 0
+    assert scheduler.lag_stats() == (0.0, 0.5, 0.5)
+
+
+# Verifies a check running past its interval is recorded as an overrun and the next one starts at once without catching up
+def test_tick_scheduler_records_overruns():
+    scheduler = monitor.MonitorTickScheduler()
+    scheduler.record_start(100.0)
+    assert scheduler.schedule(30, 175.0) == 175.0
+    scheduler.record_start(175.0)
+    assert scheduler.schedule(30, 180.0) == 205.0
+    assert scheduler.overruns == 1
+
+
+# Verifies the monitor driver sleeps only for the part of each interval the check did not use
+def test_run_monitor_steps_subtracts_check_time(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+
+    # Advances the fake clock as if each check took seven seconds
+    def steps():
+        for _ in range(3):
+            clock[0] += 7
+            yield 30
+
+    # Sleeps on the fake clock, overshooting by half a second
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds + 0.5
+
+    monkeypatch.setattr(monitor.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(monitor.time, "sleep", fake_sleep)
+    scheduler = monitor.MonitorTickScheduler()
+    monitor.run_monitor_steps(steps(), scheduler)
+    assert sleeps == [23.0, 22.5, 22.5]
+    assert scheduler.deadline == 190.0
+    assert scheduler.lag_stats()[2] == 0.5
+
+
+# Verifies debug timing reports the scheduled next check and the target's tick-lag statistics
+def test_debug_check_timing_reports_tick_lag(monkeypatch, capsys):
+    scheduler = monitor.MonitorTickScheduler()
+    scheduler.record_start(100.0)
+    scheduler.lags[-1] = 1.5
+    monkeypatch.setattr(monitor, "DEBUG_MODE", True)
+    monkeypatch.setattr(monitor, "SP_MONITOR_TICK_SCHEDULERS", {"target.user": scheduler})
+    monkeypatch.setattr(monitor.time, "monotonic", lambda: 105.0)
+    completed_at = monitor.datetime(2026, 7, 14, 17, 0, 5)
+    monitor.debug_monitor_check_timing(3, "target.user", completed_at, 30, completed_at)
+    output = capsys.readouterr().out
+    assert f"next={monitor.get_date_from_ts(completed_at + monitor.timedelta(seconds=25))}" in output
+    assert "tick lag p50=1.50s p95=1.50s max=1.50s, overruns=0/1" in output
+
+
+# Verifies the start phase delays only the first check, by less than one interval, and is stable per target
+def test_start_jitter_delays_first_check_once(monkeypatch):
+    monkeypatch.setattr(monitor, "START_JITTER", True)
+    monkeypatch.setattr(monitor, "POLL_JITTER", 0)
+    monkeypatch.setattr(monitor, "SP_MONITOR_TICK_SCHEDULERS", {})
+    clock = [0.0]
+    sleeps = []
+
+    # Sleeps on the fake clock
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(monitor.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(monitor.time, "sleep", fake_sleep)
+    monitor.run_monitor_steps(iter([30, 30]), monitor.monitor_tick_scheduler("alice"))
+    phase = sleeps[0]
+    assert 0 < phase < 30
+    assert sleeps == pytest.approx([phase, 30, 30])
+    assert monitor.monitor_tick_scheduler("alice").start_phase(30) == phase
+    assert monitor.monitor_tick_scheduler("bob").start_phase(30) != phase
+
+
+# Verifies per-check jitter stays within the configured fraction and averages out to the interval
+def test_poll_jitter_spreads_checks_around_interval(monkeypatch):
+    monkeypatch.setattr(monitor, "START_JITTER", False)
+    monkeypatch.setattr(monitor, "POLL_JITTER", 0.2)
+    monkeypatch.setattr(monitor, "SP_MONITOR_TICK_SCHEDULERS", {})
+    scheduler = monitor.monitor_tick_scheduler("alice")
+    scheduler.record_start(0.0)
+    gaps = []
+    for _ in range(500):
+        previous = scheduler.deadline
+        assert previous is not None
+        deadline = scheduler.schedule(30, previous)
+        gaps.append(deadline - previous)
+        scheduler.record_start(deadline)
+    assert all(24 <= gap <= 36 for gap in gaps)
+    assert 29 < sum(gaps) / len(gaps) < 31
+
+
+# Verifies schedulers stay deterministic when jitter is disabled
+def test_jitter_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(monitor, "START_JITTER", False)
+    monkeypatch.setattr(monitor, "POLL_JITTER", 0)
+    monkeypatch.setattr(monitor, "SP_MONITOR_TICK_SCHEDULERS", {})
+    scheduler = monitor.monitor_tick_scheduler("alice")
+    assert scheduler.rng is None
+    scheduler.record_start(0.0)
+    assert scheduler.schedule(30, 5.0) == 30.0
+
+
+# Verifies a deferred retry waits its own delay from the failure, outside the cadence, and is counted separately from overruns
+def test_tick_scheduler_defers_retry_from_now():
+    scheduler = monitor.MonitorTickScheduler()
+    scheduler.record_start(100.0)
+    assert scheduler.schedule(monitor.DeferredRetry(4), 107.0) == 111.0
+    scheduler.record_start(111.0)
+    assert scheduler.schedule(30, 112.0) == 141.0
+    assert (scheduler.deferrals, scheduler.overruns) == (1, 0)
+
+
+# Verifies deferred retries honour Retry-After, back off without it and stop after the configured number of attempts
+def test_monitor_deferred_retry_delays(monkeypatch):
+    monkeypatch.setattr(monitor, "DEFERRED_RETRY_ATTEMPTS", 5)
+    monkeypatch.setattr(monitor, "DEFERRED_RETRY_BACKOFF", 1)
+    monkeypatch.setattr(monitor, "SPOTIFY_RATE_LIMIT_DEFAULT_PAUSE", 5)
+    monkeypatch.setattr(monitor, "MAX_RETRY_AFTER_SECONDS", 60)
+    unavailable = monitor.SpotifyRetryDeferredError(503)
+    delays = []
+    for attempt in range(1, 6):
+        deferred = monitor.monitor_deferred_retry(unavailable, attempt)
+        assert deferred is not None
+        delays.append(deferred.delay)
+    assert delays == [1, 2, 4, 8, 16]
+    assert monitor.monitor_deferred_retry(unavailable, 6) is None
+    retry_after = monitor.monitor_deferred_retry(monitor.SpotifyRetryDeferredError(429, 30), 1)
+    assert retry_after is not None
+    assert retry_after.delay == 30
+    default_pause = monitor.monitor_deferred_retry(monitor.SpotifyRetryDeferredError(429), 1)
+    assert default_pause is not None
+    assert default_pause.delay == 5
+    assert monitor.monitor_deferred_retry(ValueError("malformed buddy list"), 1) is None
+
+
+# Verifies a deferred answer is found behind the error a metadata fallback raised while handling it
+def test_monitor_deferred_retry_follows_wrapped_errors():
+    try:
+        try:
+            raise monitor.SpotifyRetryDeferredError(502, url="https://api-partner.spotify.com/pathfinder/v2/query")
+        except monitor.SpotifyRetryDeferredError:
+            raise RuntimeError("Both Spotify track metadata backends failed")
+    except RuntimeError as error:
+        deferred = monitor.monitor_deferred_retry(error, 2)
+    assert deferred is not None
+    assert deferred.delay == 2
+    assert deferred.reason.startswith("502 Server Error")
@@ -1,7 +1,10 @@
 import io
+import json
 import os
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 import types
 import unittest
@@ -47,6 +50,20 @@ class FakeResponse:
     def json(self):
         return self._json_data
 
+    # Streams the configured text body in fixed-size byte chunks
+    def iter_content(self, chunk_size=1):
+        body = self.text.encode("utf-8")
+        for offset in range(0, len(body), chunk_size):
+            yield body[offset:offset + chunk_size]
+
+    # Supports use as a context manager like a streamed requests response
+    def __enter__(self):
+        return self
+
+    # Releases nothing because the body is held in memory
+    def __exit__(self, *exc_info):
+        return False
+
     # Raises an HTTPError for configured error status codes
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -97,11 +114,18 @@ class SpotifyWebBackendTests(unittest.TestCase):
         monitor.SP_CACHED_PLAYLIST_QUERY_HASH = ""
         monitor.SP_CACHED_TRACK_QUERY_HASH = ""
         monitor.SP_CACHED_FOLLOW_QUERY_HASHES.clear()
+        monitor.SP_WEB_QUERY_HASH_PENDING_BUNDLE_URL = ""
         monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED = False
         monitor.SP_WEB_TRACK_BACKEND_PREFERRED = False
         monitor.SP_WEB_PLAYLIST_API_FAILURES = 0
         monitor.SP_WEB_TRACK_API_FAILURES = 0
+        monitor.SP_METADATA_BACKEND_SAMPLES.clear()
+        monitor.SP_METADATA_BACKEND_NEXT_PROBE.clear()
         monitor.SP_WEB_PLAYLIST_URIS.clear()
+        monitor.SP_TRACK_INFO_CACHE.clear()
+        monitor.TRACK_INFO_CACHE_TTL = 0
+        monitor.SP_PLAYLIST_INFO_CACHE.clear()
+        monitor.PLAYLIST_INFO_CACHE_TTL = 0
         monitor.SP_CACHED_OAUTH_APP_TOKEN = None
         monitor.SPOTIPY_AVAILABLE = None
         monitor.SPOTIPY_IMPORT_WARNING_SHOWN = False
@@ -121,7 +145,7 @@ class SpotifyWebBackendTests(unittest.TestCase):
         session = Mock()
         session.get.return_value = response
 
-        with patch.object(monitor.req, "Session", return_value=session), patch.object(monitor, "fetch_server_time", return_value=1700000000), patch.object(monitor, "check_token_validity") as validity_check:
+        with patch.object(monitor, "SINGLE_SHOT_SESSION", session), patch.object(monitor, "fetch_server_time", return_value=1700000000), patch.object(monitor, "check_token_validity") as validity_check:
             token_data = monitor.refresh_access_token_from_sp_dc("")
 
         self.assertEqual(token_data["access_token"], "anonymous-token")
@@ -260,6 +284,22 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertEqual(owner, "Agnes Hali")
         self.assertEqual(owner_image, "https://i.scdn.co/image/large.jpg")
 
+    # Verifies a deferred 429 on the legacy metadata path reschedules the check instead of falling back to or latching the web player
+    def test_metadata_429_reschedules_check_without_switching_backends(self):
+        friend = {"timestamp": int(time.time() * 1000), "user": {"uri": "spotify:user:deferredtarget", "name": "Target"}, "track": {"uri": TRACK_URI, "name": "Song", "artist": {"name": "Artist"}, "album": {"name": "Album", "uri": "spotify:album:album"}, "context": {"name": "Album", "uri": "spotify:album:album"}}}
+        with patch.object(monitor, "spotify_request_friends", return_value=("legacy-token", {"friends": [friend]})), patch.object(monitor, "spotify_has_oauth_app_credentials", return_value=True), patch.object(monitor, "_spotify_get_track_info_api", side_effect=monitor.SpotifyRetryDeferredError(429, 30)) as legacy, patch.object(monitor, "_spotify_get_playlist_owner_and_image_api", side_effect=monitor.SpotifyRetryDeferredError(429, 30)), patch.object(monitor, "spotify_get_track_info_web", side_effect=AssertionError("web track backend used")), patch.object(monitor, "spotify_get_playlist_info_web", side_effect=AssertionError("web playlist backend used")), redirect_stdout(io.StringIO()):
+            deferred = next(monitor.spotify_monitor_friend_uri_steps("deferredtarget", [], ""))
+            with self.assertRaises(monitor.SpotifyRetryDeferredError):
+                monitor.spotify_fetch_playlist_owner_and_image("legacy-token", PLAYLIST_URI)
+        self.assertIsInstance(deferred, monitor.DeferredRetry)
+        self.assertEqual(deferred.delay, 30)
+        self.assertEqual(legacy.call_count, 1)
+        self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+        self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
+        self.assertEqual((monitor.SP_WEB_TRACK_API_FAILURES, monitor.SP_WEB_PLAYLIST_API_FAILURES), (0, 0))
+        self.assertEqual(monitor.metadata_backend_stats("track", "api")[0], 0)
+        self.assertEqual(monitor.metadata_backend_stats("playlist", "api")[0], 0)
+
     # Verifies one track 403 switches current and later requests to Pathfinder
     def test_track_403_falls_back_and_caches_backend_decision(self):
         normalized = monitor.spotify_normalize_web_track(web_track_fixture())
@@ -305,7 +345,7 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertEqual(third, ("Agnes Hali", legacy_image))
         self.assertEqual(legacy.call_args_list, [call("legacy-token", PLAYLIST_URI, True), call("legacy-token", OTHER_PLAYLIST_URI, True)])
         self.assertEqual(web.call_args_list, [call(PLAYLIST_URI), call(PLAYLIST_URI)])
-        self.assertEqual(monitor.SP_WEB_PLAYLIST_URIS, {PLAYLIST_URI})
+        self.assertEqual(set(monitor.SP_WEB_PLAYLIST_URIS), {PLAYLIST_URI})
         self.assertEqual(monitor.SP_WEB_PLAYLIST_API_FAILURES, 0)
         self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
 
@@ -319,7 +359,7 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertEqual(second, first)
         legacy.assert_called_once_with("legacy-token", PLAYLIST_URI, True)
         self.assertEqual(web.call_args_list, [call(PLAYLIST_URI), call(OTHER_PLAYLIST_URI)])
-        self.assertEqual(monitor.SP_WEB_PLAYLIST_URIS, {PLAYLIST_URI})
+        self.assertEqual(set(monitor.SP_WEB_PLAYLIST_URIS), {PLAYLIST_URI})
         self.assertEqual(monitor.SP_WEB_PLAYLIST_API_FAILURES, 1)
         self.assertTrue(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
 
@@ -330,7 +370,7 @@ class SpotifyWebBackendTests(unittest.TestCase):
                 monitor.spotify_get_playlist_owner_and_image("legacy-token", PLAYLIST_URI, oauth_app=True)
         legacy.assert_called_once_with("legacy-token", PLAYLIST_URI, True)
         web.assert_called_once_with(PLAYLIST_URI)
-        self.assertEqual(monitor.SP_WEB_PLAYLIST_URIS, set())
+        self.assertEqual(set(monitor.SP_WEB_PLAYLIST_URIS), set())
         self.assertEqual(monitor.SP_WEB_PLAYLIST_API_FAILURES, 0)
         self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
 
@@ -359,6 +399,88 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertEqual(legacy.call_count, monitor.METADATA_API_FAILURE_LATCH_THRESHOLD)
         self.assertEqual(web.call_count, monitor.METADATA_API_FAILURE_LATCH_THRESHOLD + 1)
 
+    # Verifies a latched web backend hands the legacy API a periodic probe and returns to it once the probe succeeds
+    def test_track_latch_is_revisited_by_periodic_probe(self):
+        normalized = monitor.spotify_normalize_web_track(web_track_fixture())
+        legacy_result = {"sp_track_name": "My Love"}
+        with patch.object(monitor, "_spotify_get_track_info_api", side_effect=[make_http_error(403), legacy_result, legacy_result]) as legacy, patch.object(monitor, "spotify_get_track_info_web", return_value=normalized) as web, redirect_stdout(io.StringIO()):
+            with patch.object(monitor.time, "monotonic", return_value=1000.0):
+                monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True)
+                monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True)
+            self.assertTrue(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+            with patch.object(monitor.time, "monotonic", return_value=1000.0 + monitor.METADATA_BACKEND_PROBE_INTERVAL):
+                self.assertEqual(monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True), legacy_result)
+            self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+            with patch.object(monitor.time, "monotonic", return_value=1001.0 + monitor.METADATA_BACKEND_PROBE_INTERVAL):
+                monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True)
+        self.assertEqual(legacy.call_count, 3)
+        self.assertEqual(web.call_count, 2)
+
+    # Verifies the router moves a healthy kind to the clearly faster backend and only moves back after a legacy success
+    def test_backend_router_prefers_faster_healthy_backend(self):
+        for _ in range(monitor.METADATA_BACKEND_MIN_SAMPLES):
+            monitor.record_metadata_backend_sample("track", "api", True, 0.8)
+            monitor.record_metadata_backend_sample("track", "web", True, 0.2)
+        self.assertTrue(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+        self.assertEqual(monitor.metadata_backend_stats("track", "web"), (monitor.METADATA_BACKEND_MIN_SAMPLES, 1.0, 0.2, 0.2))
+        for _ in range(monitor.METADATA_BACKEND_SAMPLE_WINDOW):
+            monitor.record_metadata_backend_sample("track", "web", False, 0.1)
+        self.assertTrue(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+        monitor.record_metadata_backend_sample("track", "api", True, 0.8)
+        self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+        self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
+
+    # Verifies a missing track does not count against the web-player backend and stats without latencies format cleanly
+    def test_track_404_is_not_a_web_backend_failure(self):
+        with patch.object(monitor, "spotify_has_oauth_app_credentials", return_value=False), patch.object(monitor, "spotify_get_track_info_web", side_effect=make_http_error(404)):
+            with self.assertRaises(requests.HTTPError):
+                monitor.spotify_fetch_track_info("", TRACK_URI)
+        self.assertEqual(monitor.metadata_backend_stats("track", "web"), (0, 1.0, None, None))
+        monitor.record_metadata_backend_sample("track", "web", False, 0.1)
+        self.assertEqual(monitor.format_metadata_backend_stats("track", "web"), "web: 1 samples, 0% ok")
+
+    # Verifies rate-limit pushbacks never reach the router's samples, the latch or the backend state file
+    def test_rate_limited_api_is_not_a_backend_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state_path = os.path.join(directory, "backends.json")
+            with patch.object(monitor, "SP_METADATA_BACKEND_STATE_PATH", state_path), patch.object(monitor, "SP_METADATA_BACKEND_SAVED_STATE", {}), patch.object(monitor, "_spotify_get_track_info_api", side_effect=make_http_error(429)), patch.object(monitor, "_spotify_get_playlist_owner_and_image_api", side_effect=monitor.SpotifyRateLimitedError("Spotify rate limit on api.spotify.com: requests paused for another 1 hour")), patch.object(monitor, "spotify_get_track_info_web", side_effect=AssertionError("web track backend used")), redirect_stdout(io.StringIO()):
+                for _ in range(monitor.METADATA_API_FAILURE_LATCH_THRESHOLD + 1):
+                    with self.assertRaises(requests.HTTPError):
+                        monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True)
+                    with self.assertRaises(monitor.SpotifyRateLimitedError):
+                        monitor.spotify_fetch_playlist_owner_and_image("legacy-token", PLAYLIST_URI, oauth_app=True)
+            self.assertFalse(os.path.exists(state_path))
+        self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+        self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
+        self.assertEqual(monitor.metadata_backend_stats("track", "api")[0], 0)
+        self.assertEqual(monitor.metadata_backend_stats("playlist", "api")[0], 0)
+
+    # Verifies server errors and unusable payloads still count against the backend that produced them
+    def test_server_errors_and_bad_payloads_are_backend_failures(self):
+        normalized = monitor.spotify_normalize_web_track(web_track_fixture())
+        with patch.object(monitor, "_spotify_get_track_info_api", side_effect=make_http_error(503)), patch.object(monitor, "spotify_get_track_info_web", return_value=normalized), redirect_stdout(io.StringIO()):
+            self.assertEqual(monitor.spotify_get_track_info("legacy-token", TRACK_URI, oauth_app=True), normalized)
+        with patch.object(monitor, "spotify_has_oauth_app_credentials", return_value=False), patch.object(monitor, "spotify_get_track_info_web", side_effect=ValueError("malformed track payload")), redirect_stdout(io.StringIO()):
+            with self.assertRaises(ValueError):
+                monitor.spotify_fetch_track_info("", TRACK_URI)
+        self.assertEqual(monitor.metadata_backend_stats("track", "api")[:2], (1, 0.0))
+        self.assertEqual(monitor.metadata_backend_stats("track", "web")[:2], (2, 0.5))
+
+    # Verifies the backend choice survives a restart through the state file and stale choices are ignored
+    def test_backend_state_persists_across_restarts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state_path = os.path.join(directory, "backends.json")
+            with patch.object(monitor, "SP_METADATA_BACKEND_STATE_PATH", state_path), patch.object(monitor, "SP_METADATA_BACKEND_SAVED_STATE", {}), patch.object(monitor, "_spotify_get_playlist_owner_and_image_api", side_effect=make_http_error(403)), patch.object(monitor, "spotify_get_playlist_info_web", return_value=monitor.spotify_normalize_web_playlist(web_playlist_fixture())), redirect_stdout(io.StringIO()):
+                monitor.spotify_get_playlist_owner_and_image("legacy-token", PLAYLIST_URI, oauth_app=True)
+            monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED = False
+            with patch.object(monitor, "SP_METADATA_BACKEND_SAVED_STATE", {}):
+                self.assertEqual(monitor.load_metadata_backend_state(state_path), ["playlist"])
+                self.assertTrue(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
+                self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
+                monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED = False
+                self.assertEqual(monitor.load_metadata_backend_state(state_path, now=time.time() + monitor.METADATA_BACKEND_STATE_MAX_AGE + 60), [])
+        self.assertFalse(monitor.SP_WEB_PLAYLIST_BACKEND_PREFERRED)
+
     # Verifies a successful legacy track request resets the consecutive-failure counter
     def test_track_success_resets_failure_counter(self):
         normalized = monitor.spotify_normalize_web_track(web_track_fixture())
@@ -373,6 +495,243 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertFalse(monitor.SP_WEB_TRACK_BACKEND_PREFERRED)
         self.assertEqual(monitor.SP_WEB_TRACK_API_FAILURES, 2)
 
+    # Verifies repeat plays reuse cached track metadata and the least recently used track is evicted at capacity
+    def test_track_info_cache_reuses_metadata_and_evicts_lru(self):
+        other_uri = "spotify:track:0000000000000000000000"
+        third_uri = "spotify:track:1111111111111111111111"
+        with patch.object(monitor, "TRACK_INFO_CACHE_TTL", 600), patch.object(monitor, "TRACK_INFO_CACHE_SIZE", 2), patch.object(monitor, "spotify_fetch_track_info", side_effect=lambda token, uri, oauth_app=False: {"sp_track_name": uri}) as fetch:
+            first = monitor.spotify_get_track_info("token", TRACK_URI)
+            first["sp_track_name"] = "modified by caller"
+            self.assertEqual(monitor.spotify_get_track_info("token", TRACK_URI), {"sp_track_name": TRACK_URI})
+            monitor.spotify_get_track_info("token", other_uri)
+            monitor.spotify_get_track_info("token", TRACK_URI)
+            monitor.spotify_get_track_info("token", third_uri)
+            self.assertEqual(list(monitor.SP_TRACK_INFO_CACHE), [TRACK_URI, third_uri])
+        self.assertEqual([entry.args[1] for entry in fetch.call_args_list], [TRACK_URI, other_uri, third_uri])
+
+    # Verifies expired track metadata is requested again
+    def test_track_info_cache_expires_entries(self):
+        with patch.object(monitor, "TRACK_INFO_CACHE_TTL", 600), patch.object(monitor, "TRACK_INFO_CACHE_SIZE", 8), patch.object(monitor, "spotify_fetch_track_info", return_value={"sp_track_name": "My Love"}) as fetch:
+            with patch.object(monitor.time, "monotonic", return_value=1000.0):
+                monitor.spotify_get_track_info("token", TRACK_URI)
+            with patch.object(monitor.time, "monotonic", return_value=1601.0):
+                monitor.spotify_get_track_info("token", TRACK_URI)
+        self.assertEqual(fetch.call_count, 2)
+
+    # Verifies songs from the same playlist share one playlist lookup while the cache entry is fresh
+    def test_playlist_cache_reuses_owner_and_image(self):
+        with patch.object(monitor, "PLAYLIST_INFO_CACHE_TTL", 600), patch.object(monitor, "spotify_fetch_playlist_owner_and_image", return_value=("Owner", "https://image.test/cover.jpg")) as fetch:
+            for _ in range(3):
+                self.assertEqual(monitor.spotify_get_playlist_owner_and_image("token", PLAYLIST_URI), ("Owner", "https://image.test/cover.jpg"))
+        fetch.assert_called_once_with("token", PLAYLIST_URI, False)
+
+    # Verifies a missing playlist is negatively cached while transient failures are still raised and retried
+    def test_playlist_cache_stores_unavailable_playlists_only(self):
+        with patch.object(monitor, "PLAYLIST_INFO_CACHE_TTL", 600), patch.object(monitor, "spotify_get_playlist_info_web", side_effect=monitor.SpotifyPlaylistUnavailableError("gone")) as web, redirect_stdout(io.StringIO()):
+            self.assertEqual(monitor.spotify_get_playlist_owner_and_image("token", PLAYLIST_URI), ("", ""))
+            self.assertEqual(monitor.spotify_get_playlist_owner_and_image("token", PLAYLIST_URI), ("", ""))
+        web.assert_called_once_with(PLAYLIST_URI)
+        with patch.object(monitor, "PLAYLIST_INFO_CACHE_TTL", 600), patch.object(monitor, "spotify_get_playlist_info_web", side_effect=RuntimeError("web unavailable")) as web, redirect_stdout(io.StringIO()):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    monitor.spotify_get_playlist_owner_and_image("token", OTHER_PLAYLIST_URI)
+        self.assertEqual(web.call_count, 2)
+
+    # Verifies backend hints for hidden playlists keep only the most recently used URIs
+    def test_web_playlist_hints_are_bounded(self):
+        with patch.object(monitor, "SP_WEB_PLAYLIST_URIS_MAX", 2):
+            for uri in (PLAYLIST_URI, OTHER_PLAYLIST_URI, PLAYLIST_URI, TRACK_URI):
+                monitor.remember_web_playlist_uri(uri)
+        self.assertEqual(list(monitor.SP_WEB_PLAYLIST_URIS), [PLAYLIST_URI, TRACK_URI])
+
+    # Verifies consulting a hidden-playlist hint marks it as recently used so it outlives hints that are not looked up
+    def test_web_playlist_hint_lookup_refreshes_recency(self):
+        with patch.object(monitor, "SP_WEB_PLAYLIST_URIS_MAX", 2):
+            monitor.remember_web_playlist_uri(PLAYLIST_URI)
+            monitor.remember_web_playlist_uri(OTHER_PLAYLIST_URI)
+            self.assertTrue(monitor.web_playlist_uri_known(PLAYLIST_URI))
+            self.assertFalse(monitor.web_playlist_uri_known(TRACK_URI))
+            monitor.remember_web_playlist_uri(TRACK_URI)
+        self.assertEqual(list(monitor.SP_WEB_PLAYLIST_URIS), [PLAYLIST_URI, TRACK_URI])
+
+    # Verifies a 403 is not cached as a missing playlist because it may be an auth or rate-limit refusal
+    def test_playlist_403_is_not_negatively_cached(self):
+        self.assertTrue(monitor.spotify_playlist_is_unavailable(make_http_error(404)))
+        self.assertFalse(monitor.spotify_playlist_is_unavailable(make_http_error(403)))
+
+    # Verifies track and playlist lookups for a track change overlap instead of running back to back
+    def test_track_change_metadata_fetches_track_and_playlist_concurrently(self):
+        playlist_started = threading.Event()
+
+        # Finishes only once the playlist lookup is running at the same time
+        def track_info(token, uri):
+            self.assertTrue(playlist_started.wait(5))
+            return {"sp_track_name": "My Love"}
+
+        # Signals that the playlist lookup has started
+        def playlist_info(token, uri):
+            playlist_started.set()
+            return "Owner", "https://image.test/cover.jpg"
+
+        with patch.object(monitor, "spotify_get_track_info", side_effect=track_info), patch.object(monitor, "spotify_get_playlist_owner_and_image", side_effect=playlist_info):
+            result = monitor.spotify_get_track_change_metadata("token", TRACK_URI, PLAYLIST_URI)
+        self.assertEqual(result, ({"sp_track_name": "My Love"}, ("Owner", "https://image.test/cover.jpg")))
+
+    # Verifies a lookup that misses the shared deadline surfaces as a timeout and non-playlist contexts skip the pool
+    def test_track_change_metadata_deadline_and_direct_track_lookup(self):
+        release = threading.Event()
+        with patch.object(monitor, "METADATA_ENRICHMENT_TIMEOUT", 0.05), patch.object(monitor, "spotify_get_track_info", return_value={"sp_track_name": "My Love"}), patch.object(monitor, "spotify_get_playlist_owner_and_image", side_effect=lambda token, uri: release.wait(5)):
+            with self.assertRaises(TimeoutError):
+                monitor.spotify_get_track_change_metadata("token", TRACK_URI, PLAYLIST_URI)
+        release.set()
+        with patch.object(monitor, "spotify_get_track_info", return_value={"sp_track_name": "My Love"}), patch.object(monitor, "METADATA_ENRICHMENT_EXECUTOR", None), patch.object(monitor, "ThreadPoolExecutor", side_effect=AssertionError("pool used")):
+            self.assertEqual(monitor.spotify_get_track_change_metadata("token", TRACK_URI), ({"sp_track_name": "My Love"}, None))
+
+    # Verifies many tracks resolve through a few legacy batch requests of at most TRACK_INFO_BATCH_SIZE IDs, skipping cached tracks
+    def test_tracks_info_batches_legacy_requests(self):
+        track_uris = [f"spotify:track:{index:022d}" for index in range(120)]
+        monitor.SP_TRACK_INFO_CACHE.clear()
+        requested_ids = []
+
+        # Returns one legacy track object per requested ID
+        def batch_response(url, **kwargs):
+            ids = url.split("ids=", 1)[1].split(",")
+            requested_ids.append(ids)
+            return FakeResponse(json_data={"tracks": [{"uri": f"spotify:track:{track_id}", "name": track_id, "duration_ms": 180000, "artists": [{"name": "Artist"}], "album": {"name": "Album"}} for track_id in ids]})
+
+        with patch.object(monitor, "TRACK_INFO_CACHE_TTL", 600), patch.object(monitor, "TRACK_INFO_CACHE_SIZE", 512), patch.object(monitor.SESSION, "get", side_effect=batch_response) as get, patch.object(monitor, "spotify_get_track_info_web", side_effect=AssertionError("web backend used")):
+            monitor.lru_cache_put(monitor.SP_TRACK_INFO_CACHE, track_uris[0], {"sp_track_name": "cached", "sp_track_duration": 1}, 600, 512)
+            result = monitor.spotify_get_tracks_info("legacy-token", track_uris + [track_uris[1]], oauth_app=True)
+            self.assertEqual(len(result), 120)
+            self.assertEqual(result[track_uris[0]]["sp_track_name"], "cached")
+            self.assertEqual(result[track_uris[119]]["sp_track_duration"], 180)
+            self.assertEqual([len(ids) for ids in requested_ids], [50, 50, 19])
+            self.assertEqual(get.call_count, 3)
+            self.assertEqual(monitor.spotify_get_track_info("legacy-token", track_uris[60], oauth_app=True)["sp_track_name"], f"{60:022d}")
+        self.assertEqual(get.call_count, 3)
+
+    # Verifies tracks missing from the legacy batch fall back to web-player lookups running in parallel and failures are left out
+    def test_tracks_info_falls_back_to_parallel_web_lookups(self):
+        track_uris = [f"spotify:track:{index:022d}" for index in range(3)]
+        both_started = threading.Barrier(2, timeout=5)
+
+        # Requires two web-player lookups to be in flight at once and fails the last track
+        def web_lookup(uri):
+            if uri == track_uris[2]:
+                raise RuntimeError("web unavailable")
+            both_started.wait()
+            return {"sp_track_name": uri, "sp_track_duration": 200}
+
+        with patch.object(monitor.SESSION, "get", return_value=FakeResponse(json_data={"tracks": [None, None, None]})), patch.object(monitor, "spotify_get_track_info_web", side_effect=web_lookup) as web:
+            result = monitor.spotify_get_tracks_info("legacy-token", track_uris + ["spotify:local:artist:album:track:1"], oauth_app=True)
+        self.assertEqual(sorted(result), track_uris[:2])
+        self.assertEqual(web.call_count, 3)
+
+    # Verifies friend listing resolves every track in one batch call, fills names the buddy list left empty and looks up each playlist once
+    def test_list_friends_resolves_metadata_in_batch(self):
+        friends = {"friends": [{"timestamp": int(time.time() * 1000), "user": {"uri": f"spotify:user:friend{index}", "name": f"Friend {index}"}, "track": {"artist": {"name": "Artist"}, "album": {"name": "Album", "uri": "spotify:album:album"}, "context": {"name": "Mix", "uri": PLAYLIST_URI}, "name": "" if index == 0 else "Song", "uri": f"spotify:track:{index:022d}"}} for index in range(4)]}
+        tracks_info = {f"spotify:track:{index:022d}": {"sp_track_name": "Resolved Song", "sp_track_duration": 125} for index in range(3)}
+        output = io.StringIO()
+        with patch.object(monitor, "spotify_get_tracks_info", return_value=tracks_info) as batch, patch.object(monitor, "spotify_get_track_info", side_effect=AssertionError("single track lookup")), patch.object(monitor, "spotify_get_playlist_owner", return_value="Owner") as owner, redirect_stdout(output):
+            monitor.spotify_list_friends(friends, "token")
+        batch.assert_called_once_with("token", [f"spotify:track:{index:022d}" for index in range(4)])
+        owner.assert_called_once_with("token", PLAYLIST_URI)
+        self.assertEqual(output.getvalue().count("Artist - Resolved Song"), 1)
+        self.assertEqual(output.getvalue().count("Artist - Song"), 3)
+        self.assertNotIn("Duration:", output.getvalue())
+
+    # Verifies concurrent lookups of one track share a single fetch while each caller gets its own copy
+    def test_concurrent_track_lookups_are_coalesced(self):
+        release = threading.Event()
+        results = []
+
+        # Blocks the shared fetch until every other caller has joined it
+        def fetch(token, uri, oauth_app=False):
+            self.assertTrue(release.wait(5))
+            return {"sp_track_name": "My Love"}
+
+        # Releases the shared fetch once the remaining callers are waiting on it
+        def release_when_joined():
+            deadline = time.monotonic() + 5
+            while monitor.SP_SINGLE_FLIGHT_COALESCED.get("track metadata", 0) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+
+        with patch.object(monitor, "SP_SINGLE_FLIGHT_COALESCED", {}), patch.object(monitor, "spotify_fetch_track_info", side_effect=fetch) as fetch_mock:
+            threads = [threading.Thread(target=lambda: results.append(monitor.spotify_get_track_info("token", TRACK_URI))) for _ in range(3)]
+            threads.append(threading.Thread(target=release_when_joined))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            self.assertEqual(monitor.SP_SINGLE_FLIGHT_COALESCED, {"track metadata": 2})
+        self.assertEqual(fetch_mock.call_count, 1)
+        self.assertEqual(results, [{"sp_track_name": "My Love"}] * 3)
+        self.assertEqual(len({id(result) for result in results}), 3)
+
+    # Verifies single-flight shares the leader's exception with joined callers and lets a re-entrant call run directly
+    def test_single_flight_shares_errors_and_allows_reentry(self):
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        # Fails after a second caller has had the chance to join
+        def failing():
+            started.set()
+            self.assertTrue(release.wait(5))
+            raise RuntimeError("backend down")
+
+        # Records the error seen by one caller
+        def call():
+            try:
+                monitor.single_flight(("failing operation",), failing)
+            except RuntimeError as error:
+                errors.append(error)
+
+        with patch.object(monitor, "SP_SINGLE_FLIGHT_COALESCED", {}):
+            leader = threading.Thread(target=call)
+            leader.start()
+            self.assertTrue(started.wait(5))
+            follower = threading.Thread(target=call)
+            follower.start()
+            deadline = time.monotonic() + 5
+            while not monitor.SP_SINGLE_FLIGHT_COALESCED and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+        self.assertEqual(monitor.single_flight(("outer",), lambda: monitor.single_flight(("outer",), lambda: "inner")), "inner")
+
+    # Verifies a second process sharing the SQLite metadata store reuses stored track and playlist metadata
+    def test_metadata_store_is_shared_across_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store_path = os.path.join(directory, "metadata.sqlite")
+            with patch.object(monitor, "METADATA_STORE_FILE", store_path), patch.object(monitor, "METADATA_STORE_TRACK_TTL", 600), patch.object(monitor, "METADATA_STORE_PLAYLIST_TTL", 600), patch.object(monitor, "SP_METADATA_STORE_FAILED", False):
+                with patch.object(monitor, "spotify_fetch_track_info", return_value={"sp_track_name": "My Love"}), patch.object(monitor, "spotify_fetch_playlist_owner_and_image", return_value=("Owner", "https://image.test/cover.jpg")):
+                    monitor.spotify_get_track_info("token", TRACK_URI)
+                    monitor.spotify_get_playlist_owner_and_image("token", PLAYLIST_URI)
+                monitor.SP_METADATA_STORE_CONNECTION.close()
+                monitor.SP_METADATA_STORE_CONNECTION = None
+                with patch.object(monitor, "spotify_fetch_track_info", side_effect=AssertionError("track fetched")), patch.object(monitor, "spotify_fetch_playlist_owner_and_image", side_effect=AssertionError("playlist fetched")):
+                    self.assertEqual(monitor.spotify_get_track_info("token", TRACK_URI), {"sp_track_name": "My Love"})
+                    self.assertEqual(monitor.spotify_get_playlist_owner_and_image("token", PLAYLIST_URI), ("Owner", "https://image.test/cover.jpg"))
+                connection = monitor.SP_METADATA_STORE_CONNECTION
+                assert connection is not None
+                self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+                connection.close()
+                monitor.SP_METADATA_STORE_CONNECTION = None
+
+    # Verifies an unusable metadata store is disabled with a warning instead of breaking metadata lookups
+    def test_metadata_store_failure_falls_back_to_backends(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(monitor, "METADATA_STORE_FILE", directory), patch.object(monitor, "SP_METADATA_STORE_FAILED", False), patch.object(monitor, "SP_METADATA_STORE_CONNECTION", None), patch.object(monitor, "spotify_fetch_track_info", return_value={"sp_track_name": "My Love"}) as fetch, redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(monitor.spotify_get_track_info("token", TRACK_URI), {"sp_track_name": "My Love"})
+                self.assertTrue(monitor.SP_METADATA_STORE_FAILED)
+        fetch.assert_called_once()
+        self.assertIn("Metadata store", output.getvalue())
+
     # Verifies repeated non-restricted legacy playlist failures latch the web backend after the threshold
     def test_playlist_non_restricted_failures_latch_after_threshold(self):
         normalized = monitor.spotify_normalize_web_playlist(web_playlist_fixture())
@@ -391,7 +750,7 @@ class SpotifyWebBackendTests(unittest.TestCase):
         response.json.return_value = {"accessToken": "anonymous-token", "clientId": "web-client"}
         session = Mock()
         session.get.return_value = response
-        with patch.object(monitor.req, "Session", return_value=session), patch.object(monitor, "fetch_server_time", return_value=1700000000):
+        with patch.object(monitor, "SINGLE_SHOT_SESSION", session), patch.object(monitor, "fetch_server_time", return_value=1700000000):
             with self.assertRaises(Exception) as caught:
                 monitor.refresh_access_token_from_sp_dc("")
         self.assertNotIsInstance(caught.exception, KeyError)
@@ -506,6 +865,61 @@ class SpotifyWebBackendTests(unittest.TestCase):
         self.assertEqual(follow_hash, query_hash)
         self.assertEqual(get.call_count, 2)
 
+    # Verifies one bundle download yields every operation hash and a restart reuses them after checking only the web-player HTML
+    def test_query_discovery_persists_all_hashes_for_cold_start(self):
+        html = '<script src="https://open.spotifycdn.com/cdn/build/web-player/web-player.test.js"></script>'
+        bundle = f'new Query("getTrack","query","{"a" * 64}",null),new Query("fetchPlaylistMetadata","query","{"b" * 64}",null),new Query("followUsers","mutation","{"c" * 64}",null),new Query("unrelated","query","{"d" * 64}",null)'
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "hashes.json")
+            with patch.object(monitor, "SP_WEB_QUERY_HASH_CACHE_PATH", cache_path), patch.object(monitor.SESSION, "get", side_effect=[FakeResponse(text=html), FakeResponse(text=bundle)]) as get:
+                self.assertEqual(monitor.spotify_discover_track_query_hash(), "a" * 64)
+                self.assertEqual(monitor.spotify_discover_playlist_query_hash(), "b" * 64)
+                self.assertEqual(monitor.spotify_discover_follow_query_hash("followUsers"), "c" * 64)
+            self.assertEqual(get.call_count, 2)
+
+            monitor.SP_CACHED_PLAYLIST_QUERY_HASH = ""
+            monitor.SP_CACHED_TRACK_QUERY_HASH = ""
+            monitor.SP_CACHED_FOLLOW_QUERY_HASHES.clear()
+            self.assertEqual(set(monitor.load_web_query_hash_cache(cache_path)), {"getTrack", "fetchPlaylistMetadata", "followUsers"})
+            with patch.object(monitor.SESSION, "get", side_effect=[FakeResponse(text=html), AssertionError("bundle downloaded")]) as get:
+                self.assertEqual(monitor.spotify_discover_track_query_hash(), "a" * 64)
+                self.assertEqual(monitor.spotify_discover_playlist_query_hash(), "b" * 64)
+            self.assertEqual(get.call_count, 1)
+
+    # Verifies restored hashes are rediscovered once the web player references a new bundle and unseen operations keep their hashes
+    def test_query_hash_cache_revalidates_bundle_and_merges_hashes(self):
+        new_html = '<script src="https://open.spotifycdn.com/cdn/build/web-player/web-player.new.js"></script>'
+        new_bundle = f'new Query("getTrack","query","{"e" * 64}",null)'
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "hashes.json")
+            with open(cache_path, "w", encoding="utf-8") as file:
+                json.dump({"bundle_url": "https://open.spotifycdn.com/cdn/build/web-player/web-player.old.js", "hashes": {"getTrack": "a" * 64, "followUsers": "c" * 64}}, file)
+            monitor.load_web_query_hash_cache(cache_path)
+            with patch.object(monitor, "SP_WEB_QUERY_HASH_CACHE_PATH", cache_path), patch.object(monitor.SESSION, "get", side_effect=[FakeResponse(text=new_html), FakeResponse(text=new_bundle)]) as get:
+                self.assertEqual(monitor.spotify_discover_track_query_hash(), "e" * 64)
+                self.assertEqual(monitor.spotify_discover_follow_query_hash("followUsers"), "c" * 64)
+            self.assertEqual(get.call_count, 2)
+            with open(cache_path, encoding="utf-8") as file:
+                saved = json.load(file)
+            self.assertEqual(saved["bundle_url"], "https://open.spotifycdn.com/cdn/build/web-player/web-player.new.js")
+            self.assertEqual(saved["hashes"], {"getTrack": "e" * 64, "followUsers": "c" * 64})
+
+    # Verifies hashes split across chunk boundaries are found and streaming stops once every operation is known
+    def test_query_hash_scan_streams_chunks_and_stops_early(self):
+        declarations = f'x;new Query("getTrack","query","{"a" * 64}",null),new Query("fetchPlaylistMetadata","query","{"b" * 64}",null),new Query("isFollowingUsers","query","{"c" * 64}",null),new Query("followUsers","mutation","{"d" * 64}",null);'
+        bundle = (declarations + "padding;" * 1000).encode("ascii")
+        consumed = []
+
+        # Yields seven-byte chunks while recording how many bytes were read
+        def chunks():
+            for offset in range(0, len(bundle), 7):
+                consumed.append(offset)
+                yield bundle[offset:offset + 7]
+
+        hashes = monitor.spotify_extract_web_query_hashes(chunks())
+        self.assertEqual(hashes, {"getTrack": "a" * 64, "fetchPlaylistMetadata": "b" * 64, "isFollowingUsers": "c" * 64, "followUsers": "d" * 64})
+        self.assertLess(consumed[-1], len(declarations) + 7)
+
     # Verifies cookie follow checks send the authenticated client ID and normalize the result
     def test_cookie_follow_check_uses_authenticated_pathfinder_headers(self):
         monitor.SP_CACHED_CLIENT_ID = "cookie-client"
@@ -0,0 +1,294 @@
+"""Regression tests for access-token caching, invalidation and refresh."""
+
+import json
+import os
+import stat
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+import spotify_monitor as monitor
+
+
+# Resets the shared access-token cache around each test
+@pytest.fixture(autouse=True)
+def reset_token_cache(monkeypatch):
+    monkeypatch.setattr(monitor, "TOKEN_SOURCE", "cookie")
+    monkeypatch.setattr(monitor, "SP_DC_COOKIE", "cookie-value")
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", None)
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", 0)
+    monkeypatch.setattr(monitor, "SP_CACHED_CLIENT_ID", "")
+    monkeypatch.setattr(monitor, "TOKEN_MAX_RETRIES", 1)
+    monkeypatch.setattr(monitor, "TOKEN_RETRY_TIMEOUT", 0)
+    monkeypatch.setattr(monitor, "SP_CACHED_CLIENT_TOKEN", None)
+    monkeypatch.setattr(monitor, "SP_CLIENT_TOKEN_EXPIRES_AT", 0)
+    monkeypatch.setattr(monitor, "SP_CACHED_WEB_ACCESS_TOKEN", None)
+    monkeypatch.setattr(monitor, "SP_WEB_ACCESS_TOKEN_EXPIRES_AT", 0)
+    monkeypatch.setattr(monitor, "SP_CACHED_WEB_CLIENT_ID", "")
+    monkeypatch.setattr(monitor, "SP_CACHED_REFRESH_TOKEN", None)
+    monkeypatch.setattr(monitor, "SP_TOKEN_CACHE_PATH", "")
+    monkeypatch.setattr(monitor, "SP_SERVER_CLOCK_OFFSET", None)
+    monkeypatch.setattr(monitor, "SP_SERVER_CLOCK_SAMPLED_AT", 0.0)
+
+
+# Verifies an unexpired cached sp_dc token is reused without a validation request
+def test_cached_cookie_token_trusts_known_expiry(monkeypatch):
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "cached")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", time.time() + 600)
+    with patch.object(monitor, "check_token_validity", side_effect=AssertionError("validation request sent")), patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=AssertionError("token refreshed")):
+        assert monitor.spotify_get_access_token_from_sp_dc("cookie-value") == "cached"
+
+
+# Verifies an unexpired cached client token is reused without a validation request
+def test_cached_client_token_trusts_known_expiry(monkeypatch):
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "cached-client")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", time.time() + 600)
+    with patch.object(monitor, "check_token_validity", side_effect=AssertionError("validation request sent")):
+        assert monitor.spotify_get_access_token_from_client("device", "system", "user", "refresh", "client-token") == "cached-client"
+
+
+# Verifies an HTTP 401 from the real request invalidates the token and retries once with a fresh one
+def test_unauthorized_request_refreshes_token_and_retries_once(monkeypatch):
+    tokens = iter(["stale", "fresh"])
+    seen = []
+
+    # Rejects the stale token and accepts the fresh one
+    def request(access_token):
+        seen.append(access_token)
+        if access_token == "stale":
+            raise monitor.SpotifyUnauthorizedError("401 Unauthorized for url: buddylist")
+        return {"friends": []}
+
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "stale")
+    with patch.object(monitor, "spotify_get_access_token_from_sp_dc", side_effect=lambda cookie: next(tokens)):
+        assert monitor.spotify_request_with_access_token(request) == ("fresh", {"friends": []})
+    assert seen == ["stale", "fresh"]
+    assert monitor.SP_CACHED_ACCESS_TOKEN is None
+
+
+# Verifies a second HTTP 401 is surfaced to the recovery handling instead of looping
+def test_repeated_unauthorized_request_is_raised():
+    with patch.object(monitor, "spotify_get_access_token_from_sp_dc", return_value="token"):
+        with pytest.raises(monitor.SpotifyUnauthorizedError):
+            monitor.spotify_request_with_access_token(lambda access_token: (_ for _ in ()).throw(monitor.SpotifyUnauthorizedError("401 Unauthorized for url: x")))
+
+
+# Verifies a cookie token close to expiry is swapped for a fresh one before the monitoring loop needs it
+def test_background_refresh_renews_cookie_token_ahead_of_expiry(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "expiring")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", now + 60)
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", return_value={"access_token": "renewed", "expires_at": now + 3600, "client_id": "client"}) as refresh:
+        wait = monitor.spotify_refresh_tokens_ahead_of_expiry(300)
+    refresh.assert_called_once_with("cookie-value")
+    assert monitor.SP_CACHED_ACCESS_TOKEN == "renewed"
+    assert monitor.SP_CACHED_CLIENT_ID == "client"
+    assert wait == monitor.TOKEN_REFRESHER_MAX_WAIT
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=AssertionError("token refreshed")):
+        assert monitor.spotify_get_access_token() == "renewed"
+
+
+# Verifies tokens far from expiry, and tokens never obtained, are left untouched
+def test_background_refresh_skips_fresh_and_missing_tokens(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "fresh")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", now + 400)
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=AssertionError("token refreshed")):
+        wait = monitor.spotify_refresh_tokens_ahead_of_expiry(300)
+    assert monitor.SP_CACHED_ACCESS_TOKEN == "fresh"
+    assert monitor.TOKEN_REFRESHER_MIN_WAIT <= wait <= 100
+
+
+# Verifies a failed background refresh keeps the current token instead of clearing it
+def test_background_refresh_failure_keeps_current_token(monkeypatch):
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "expiring")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", time.time() + 60)
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=RuntimeError("network down")):
+        with pytest.raises(RuntimeError):
+            monitor.spotify_refresh_tokens_ahead_of_expiry(300)
+    assert monitor.SP_CACHED_ACCESS_TOKEN == "expiring"
+
+
+# Verifies the client source renews both the client token and the access token through the forced refresh path
+def test_background_refresh_renews_client_tokens(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(monitor, "TOKEN_SOURCE", "client")
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "expiring")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", now + 60)
+    monkeypatch.setattr(monitor, "SP_CACHED_CLIENT_TOKEN", "client-token")
+    monkeypatch.setattr(monitor, "SP_CLIENT_TOKEN_EXPIRES_AT", now + 60)
+    with patch.object(monitor, "spotify_get_client_token") as client_token, patch.object(monitor, "spotify_get_access_token_from_client_auto") as access_token:
+        monitor.spotify_refresh_tokens_ahead_of_expiry(300)
+    assert client_token.call_args.kwargs["force_refresh"] is True
+    assert access_token.call_args.kwargs["force_refresh"] is True
+
+
+# Verifies the refresher thread is not started when the margin disables it
+def test_token_refresher_disabled_by_zero_margin(monkeypatch):
+    monkeypatch.setattr(monitor, "TOKEN_REFRESHER_THREAD", None)
+    with patch.object(monitor.threading, "Thread", side_effect=AssertionError("thread started")):
+        assert monitor.start_token_refresher(0) is None
+
+
+# Verifies tokens are persisted owner-only without the raw credentials and restored while still valid
+def test_token_cache_round_trip_restores_unexpired_tokens(monkeypatch, tmp_path):
+    now = time.time()
+    cache_path = tmp_path / "tokens.json"
+    monkeypatch.setattr(monitor, "SP_TOKEN_CACHE_PATH", str(cache_path))
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "persisted")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", now + 600)
+    monkeypatch.setattr(monitor, "SP_CACHED_CLIENT_ID", "client-id")
+    monkeypatch.setattr(monitor, "SP_CACHED_WEB_ACCESS_TOKEN", "web")
+    monkeypatch.setattr(monitor, "SP_WEB_ACCESS_TOKEN_EXPIRES_AT", now + 600)
+    monkeypatch.setattr(monitor, "SP_CACHED_WEB_CLIENT_ID", "web-client")
+    monitor.save_spotify_token_cache()
+    if os.name != "nt":
+        assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+    assert "cookie-value" not in cache_path.read_text(encoding="utf-8")
+
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", None)
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", 0)
+    monkeypatch.setattr(monitor, "SP_CACHED_WEB_ACCESS_TOKEN", None)
+    assert monitor.load_spotify_token_cache(cache_path, now=now) == ["access token", "web-player token"]
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=AssertionError("token refreshed")):
+        assert monitor.spotify_get_access_token() == "persisted"
+    assert monitor.SP_CACHED_CLIENT_ID == "client-id"
+    assert monitor.SP_CACHED_WEB_CLIENT_ID == "web-client"
+
+
+# Verifies expired entries and tokens saved for other credentials are not restored
+def test_token_cache_ignores_expired_and_foreign_tokens(monkeypatch, tmp_path):
+    now = time.time()
+    cache_path = tmp_path / "tokens.json"
+    cache_path.write_text(json.dumps({"version": monitor.TOKEN_CACHE_VERSION, "fingerprint": "other-credentials", "access_token": {"token": "foreign", "expires_at": now + 600}, "client_token": None, "web_access_token": {"token": "web", "expires_at": now - 1, "client_id": "web-client"}}), encoding="utf-8")
+    assert monitor.load_spotify_token_cache(cache_path, now=now) == []
+    assert monitor.SP_CACHED_ACCESS_TOKEN is None
+    assert monitor.SP_CACHED_WEB_ACCESS_TOKEN is None
+
+    cache_path.write_text("not json", encoding="utf-8")
+    assert monitor.load_spotify_token_cache(cache_path, now=now) == []
+
+
+# Verifies invalidating a rejected token also removes it from the persisted cache
+def test_token_invalidation_updates_persisted_cache(monkeypatch, tmp_path):
+    cache_path = tmp_path / "tokens.json"
+    monkeypatch.setattr(monitor, "SP_TOKEN_CACHE_PATH", str(cache_path))
+    monkeypatch.setattr(monitor, "SP_CACHED_ACCESS_TOKEN", "rejected")
+    monkeypatch.setattr(monitor, "SP_ACCESS_TOKEN_EXPIRES_AT", time.time() + 600)
+    monitor.save_spotify_token_cache()
+    monitor.spotify_invalidate_access_token()
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["access_token"] is None
+
+
+# Verifies the Date header of an ordinary Spotify response replaces the server time HEAD request
+def test_server_time_uses_offset_learned_from_spotify_responses():
+    skewed = time.time() + 120
+    response = Mock(url="https://api.spotify.com/v1/tracks/x", headers={"Date": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(skewed))})
+    monitor.record_spotify_server_clock(response)
+    with patch.object(monitor, "fetch_server_time", side_effect=AssertionError("HEAD request sent")):
+        assert abs(monitor.spotify_server_time(Mock()) - skewed) <= 2
+
+
+# Verifies responses from other hosts are ignored and an unknown offset falls back to one HEAD request
+def test_server_time_measures_when_offset_unknown():
+    monitor.record_spotify_server_clock(Mock(url="https://example.test/", headers={"Date": "Tue, 14 Nov 2023 22:13:20 GMT"}))
+    assert monitor.SP_SERVER_CLOCK_OFFSET is None
+    with patch.object(monitor, "fetch_server_time", return_value=1700000000) as fetch:
+        assert monitor.spotify_server_time(Mock()) == 1700000000
+    fetch.assert_called_once()
+
+
+# Verifies a failed token request forgets the offset so the next refresh re-measures the server clock
+def test_failed_token_request_invalidates_server_clock(monkeypatch):
+    monkeypatch.setattr(monitor, "SP_SERVER_CLOCK_OFFSET", 0.0)
+    monkeypatch.setattr(monitor, "SP_SERVER_CLOCK_SAMPLED_AT", time.monotonic())
+    session = Mock()
+    session.get.side_effect = monitor.req.ConnectionError("offline")
+    with patch.object(monitor, "SINGLE_SHOT_SESSION", session):
+        with pytest.raises(Exception):
+            monitor.refresh_access_token_from_sp_dc("")
+    assert monitor.SP_SERVER_CLOCK_OFFSET is None
+
+
+# Verifies the TOTP object is built once per TOTP version and cipher
+def test_totp_object_is_memoized():
+    first = monitor.generate_totp()
+    assert monitor.generate_totp() is first
+    assert first.at(1700000000) == "371599"
+
+
+# Verifies concurrent callers needing a new sp_dc token share one refresh and are counted as coalesced
+def test_concurrent_token_refreshes_are_coalesced(monkeypatch):
+    monkeypatch.setattr(monitor, "SP_SINGLE_FLIGHT_COALESCED", {})
+    now = time.time()
+
+    # Holds the refresh open until the other callers have joined it
+    def refresh(sp_dc):
+        deadline = time.monotonic() + 5
+        while monitor.SP_SINGLE_FLIGHT_COALESCED.get("sp_dc access token refresh", 0) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return {"access_token": "shared", "expires_at": now + 3600, "client_id": "client", "length": 6}
+
+    results = []
+    with patch.object(monitor, "refresh_access_token_from_sp_dc", side_effect=refresh) as refresh_mock, patch.object(monitor, "check_token_validity", return_value=True):
+        threads = [threading.Thread(target=lambda: results.append(monitor.spotify_get_access_token_from_sp_dc("cookie-value"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+    assert results == ["shared"] * 4
+    assert refresh_mock.call_count == 1
+    assert monitor.SP_SINGLE_FLIGHT_COALESCED == {"sp_dc access token refresh": 3}
+    assert monitor.SP_SINGLE_FLIGHT_CALLS == {}
+
+
+# Verifies nested request budgets only shorten the enclosing deadline and worker threads inherit it
+def test_request_deadlines_nest_and_propagate_to_workers():
+    assert monitor.request_deadline_remaining() is None
+    with monitor.request_deadline(60) as outer:
+        with monitor.request_deadline(600) as inner:
+            assert inner == outer
+        with monitor.request_deadline(1) as inner:
+            assert inner < outer
+        observed = []
+        worker = threading.Thread(target=monitor.deadline_bound(lambda: observed.append(monitor.request_deadline_remaining())))
+        worker.start()
+        worker.join(timeout=5)
+    assert 0 < observed[0] <= 60
+    assert monitor.request_deadline_remaining() is None
+
+
+# Verifies the token refresh retry loop stops once its pause would outlast the request budget
+def test_token_retry_sleep_respects_request_deadline(monkeypatch):
+    monkeypatch.setattr(monitor, "TOKEN_MAX_RETRIES", 3)
+    monkeypatch.setattr(monitor, "TOKEN_RETRY_TIMEOUT", 30)
+    monkeypatch.setattr(monitor, "refresh_access_token_from_sp_dc", Mock(side_effect=monitor.req.ConnectionError("offline")))
+    monkeypatch.setattr(monitor.time, "sleep", Mock(side_effect=AssertionError("slept past the deadline")))
+    with monitor.request_deadline(5):
+        with pytest.raises(monitor.TimeoutException):
+            monitor._spotify_refresh_access_token_from_sp_dc("cookie-value")
+
+
+# Verifies a caller joining an in-flight token refresh gives up when its own request budget runs out
+def test_single_flight_waiter_respects_request_deadline():
+    started = threading.Event()
+    release = threading.Event()
+
+    # Blocks as a slow in-flight refresh until the test releases it
+    def slow_refresh():
+        started.set()
+        release.wait(5)
+        return "token"
+
+    leader = threading.Thread(target=monitor.single_flight, args=(("deadline test refresh",), slow_refresh))
+    leader.start()
+    started.wait(5)
+    try:
+        with monitor.request_deadline(0.05):
+            with pytest.raises(monitor.TimeoutException):
+                monitor.single_flight(("deadline test refresh",), slow_refresh)
+    finally:
+        release.set()
+        leader.join(timeout=5)